@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+
+from paper_arxiv_adapter.storage import SQLiteBackend
+
+from synthetic import make_paper
+
+
+def bench(backend: SQLiteBackend, n: int) -> dict[str, float]:
+    papers = [make_paper(i) for i in range(n)]
+
+    start = time.perf_counter()
+    for paper in papers:
+        backend.save(paper)
+    save_us = (time.perf_counter() - start) / n * 1e6
+
+    start = time.perf_counter()
+    for paper in papers:
+        backend.get(paper.unique_key)
+    get_us = (time.perf_counter() - start) / n * 1e6
+
+    return {"save_us": save_us, "get_us": get_us}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SQLiteBackend get/save latency, per-call vs pooled connections")
+    parser.add_argument("-n", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        results = {}
+        for name, pooled in (("per-call", False), ("pooled", True)):
+            backend = SQLiteBackend(os.path.join(tmpdir, f"{name}.db"), pooled=pooled)
+            results[name] = bench(backend, args.n)
+            backend.close()
+
+    print(f"{'mode':<10}{'save (us/op)':>15}{'get (us/op)':>15}")
+    for name, r in results.items():
+        print(f"{name:<10}{r['save_us']:>15.1f}{r['get_us']:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
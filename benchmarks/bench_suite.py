@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import argparse
+import contextlib
+import itertools
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Iterable
+
+import arxiv
+import feedparser
+
+from paper_arxiv_adapter.adapter import ArxivAdapter
+from paper_arxiv_adapter.atom import parse_papers
+from paper_arxiv_adapter.compliance import RateLimiter
+from paper_arxiv_adapter.enrichment import EnrichmentPipeline
+from paper_arxiv_adapter.sharding import ShardedSQLiteBackend
+from paper_arxiv_adapter.storage import MemoryBackend, SQLiteBackend
+
+from synthetic import iter_papers, make_paper, paper_id
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+BACKENDS = {
+    "sqlite": lambda path: SQLiteBackend(path, pooled=True),
+    "memory": lambda path: MemoryBackend(),
+    "sharded": lambda path: ShardedSQLiteBackend(path + ".shards"),
+}
+
+
+def measure(fn: Callable, args: Iterable) -> dict[str, float]:
+    timings = []
+    for arg in args:
+        start = time.perf_counter()
+        fn(arg)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    n = len(timings)
+    total = sum(timings)
+    return {
+        "ops": n,
+        "mean_us": total / n * 1e6,
+        "p50_us": timings[n // 2] * 1e6,
+        "p95_us": timings[min(n - 1, int(n * 0.95))] * 1e6,
+        "ops_per_sec": n / total if total else 0.0,
+    }
+
+
+def bench_storage(backend_name: str, size: int, ops: int, tmpdir: str) -> dict:
+    backend = BACKENDS[backend_name](os.path.join(tmpdir, f"{backend_name}-{size}.db"))
+    rng = random.Random(size)
+
+    start = time.perf_counter()
+    backend.save_many(iter_papers(size))
+    load_seconds = time.perf_counter() - start
+
+    # iter_papers adds a v2 for every tenth id, so ~size / 1.1 distinct ids exist.
+    sample_ids = [paper_id(rng.randrange(int(size / 1.1))) for _ in range(ops)]
+    sample_keys = [f"{arxiv_id}v1" for arxiv_id in sample_ids]
+    fresh = (make_paper(size * 2 + i) for i in itertools.count())
+    first_page = backend.list(limit=20)
+
+    results = {
+        "backend": backend_name,
+        "rows": size,
+        "load_rows_per_sec": size / load_seconds,
+        "operations": {
+            "save": measure(lambda _: backend.save(next(fresh)), range(ops)),
+            "get": measure(backend.get, sample_keys),
+            "exists": measure(backend.exists, sample_keys),
+            "exists_miss": measure(backend.exists, (f"{k}9" for k in sample_keys)),
+            "list_first_page": measure(lambda _: backend.list(limit=20), range(ops)),
+            "list_cursor_page": measure(
+                lambda _: backend.list(limit=20, cursor=first_page.next_cursor), range(ops)
+            ),
+            "list_deep_offset": measure(
+                lambda _: backend.list(limit=20, offset=size // 2), range(max(1, ops // 10))
+            ),
+            "list_category": measure(
+                lambda _: backend.list(limit=20, category="cs.IR"), range(ops)
+            ),
+            "get_stats": measure(lambda _: backend.get_stats(), range(max(1, ops // 10))),
+            "get_versions": measure(backend.get_versions, sample_ids),
+        },
+    }
+    backend.close()
+    return results
+
+
+def _scaled_feed(raw: bytes, entries: int) -> bytes:
+    first = raw.index(b"<entry>")
+    last = raw.rindex(b"</entry>") + len(b"</entry>")
+    items = re.findall(rb"<entry>.*?</entry>", raw[first:last], re.S)
+    scaled = [items[i % len(items)] for i in range(entries)]
+    return raw[:first] + b"\n".join(scaled) + raw[last:]
+
+
+def bench_parsing(repeat: int, large_entries: int) -> dict:
+    raw = (FIXTURES / "arxiv_feed.xml").read_bytes()
+    adapter = ArxivAdapter(rate_limiter=RateLimiter(min_interval=0))
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        feed = feedparser.parse(raw)
+    parse_seconds = time.perf_counter() - start
+
+    entries = feed.entries
+    results = [arxiv.Result._from_feed_entry(entry) for entry in entries]
+    n = len(entries) * repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for entry in entries:
+            adapter._entry_to_paper(entry)
+    entry_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for result in results:
+            adapter._result_to_paper(result)
+    result_seconds = time.perf_counter() - start
+
+    comparison = {}
+    for label, data in (("fixture", raw), ("large", _scaled_feed(raw, large_entries))):
+        count = len(parse_papers(data))
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            [adapter._entry_to_paper(e) for e in feedparser.parse(data).entries]
+        feedparser_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            parse_papers(data)
+        atom_seconds = time.perf_counter() - start
+
+        comparison[label] = {
+            "entries": count,
+            "bytes": len(data),
+            "feedparser_papers_per_sec": count * repeat / feedparser_seconds,
+            "atom_papers_per_sec": count * repeat / atom_seconds,
+            "speedup": feedparser_seconds / atom_seconds,
+        }
+
+    return {
+        "fixture": "arxiv_feed.xml",
+        "entries": len(entries),
+        "feedparser_entries_per_sec": n / parse_seconds,
+        "entry_to_paper_per_sec": n / entry_seconds,
+        "result_to_paper_per_sec": n / result_seconds,
+        "feed_to_papers": comparison,
+    }
+
+
+def bench_enrichment(size: int, batch_size: int, workers_options: Iterable[int], tmpdir: str) -> list[dict]:
+    results = []
+    for workers in workers_options:
+        backend = SQLiteBackend(os.path.join(tmpdir, f"enrich-{workers}.db"), pooled=True)
+        backend.save_many(iter_papers(size))
+        report = EnrichmentPipeline(backend, batch_size=batch_size, workers=workers).run()
+        results.append({
+            "rows": size,
+            "workers": workers,
+            "batch_size": batch_size,
+            "seconds": report.seconds,
+            "papers_per_sec": report.papers_per_second,
+        })
+        backend.close()
+    return results
+
+
+def bench_web(size: int, ops: int, tmpdir: str) -> dict:
+    sys.path.insert(0, str(ROOT / "web" / "backend"))
+    from fastapi.testclient import TestClient
+    import main
+
+    cwd = os.getcwd()
+    os.chdir(tmpdir)
+    try:
+        with TestClient(main.app) as client:
+            main.adapter.storage.save_many(iter_papers(size))
+            etag = client.get("/api/stats").headers["etag"]
+            key = f"{paper_id(size // 4)}v1"
+            endpoints = {
+                "stats": ("/api/stats", {}),
+                "stats_not_modified": ("/api/stats", {"If-None-Match": etag}),
+                "papers_first_page": ("/api/papers?limit=20", {}),
+                "papers_category": ("/api/papers?limit=20&category=cs.IR", {}),
+                "papers_search": ("/api/papers?limit=20&q=sparse%20transformer", {}),
+                "paper_detail": (f"/api/papers/{key}", {}),
+                "paper_versions": (f"/api/papers/{paper_id(0)}/versions", {}),
+            }
+            return {
+                "rows": size,
+                "endpoints": {
+                    name: measure(lambda _: client.get(url, headers=headers), range(ops))
+                    for name, (url, headers) in endpoints.items()
+                },
+            }
+    finally:
+        os.chdir(cwd)
+
+
+def git_revision() -> str | None:
+    with contextlib.suppress(OSError, subprocess.CalledProcessError):
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Storage, parsing and endpoint benchmarks with JSON output")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)))
+    parser.add_argument("--backends", default=",".join(BACKENDS))
+    parser.add_argument("--ops", type=int, default=1000)
+    parser.add_argument("--parse-repeat", type=int, default=20)
+    parser.add_argument("--large-feed-entries", type=int, default=2000)
+    parser.add_argument("--web-size", type=int, default=10_000)
+    parser.add_argument("--enrich-size", type=int, default=20_000)
+    parser.add_argument("--enrich-batch", type=int, default=256)
+    parser.add_argument("--enrich-workers", default=f"0,{os.cpu_count() or 1}")
+    parser.add_argument("--skip", default="", help="comma-separated sections to skip: storage,parsing,enrichment,web")
+    parser.add_argument("-o", "--output", default="benchmark-results.json")
+    args = parser.parse_args()
+
+    skip = set(filter(None, args.skip.split(",")))
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        if "storage" not in skip:
+            report["storage"] = []
+            for size in map(int, args.sizes.split(",")):
+                for backend_name in args.backends.split(","):
+                    print(f"storage: {backend_name} @ {size} rows", file=sys.stderr)
+                    report["storage"].append(bench_storage(backend_name, size, args.ops, tmpdir))
+        if "parsing" not in skip:
+            print("parsing", file=sys.stderr)
+            report["parsing"] = bench_parsing(args.parse_repeat, args.large_feed_entries)
+        if "enrichment" not in skip:
+            print(f"enrichment: {args.enrich_size} rows", file=sys.stderr)
+            report["enrichment"] = bench_enrichment(
+                args.enrich_size,
+                args.enrich_batch,
+                map(int, args.enrich_workers.split(",")),
+                tmpdir,
+            )
+        if "web" not in skip:
+            print(f"web: {args.web_size} rows", file=sys.stderr)
+            report["web"] = bench_web(args.web_size, args.ops, tmpdir)
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
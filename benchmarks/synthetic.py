@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta
+from typing import Iterator
+
+from paper_arxiv_adapter.models import Paper
+
+CATEGORIES = (
+    "cs.AI", "cs.LG", "cs.CL", "cs.CV", "cs.IR", "cs.RO", "stat.ML",
+    "math.OC", "math.PR", "physics.comp-ph", "quant-ph", "eess.SP",
+)
+WORDS = (
+    "learning", "neural", "graph", "transformer", "optimization", "bayesian",
+    "retrieval", "robust", "sparse", "diffusion", "quantum", "language",
+    "vision", "reinforcement", "causal", "kernel", "stochastic", "adaptive",
+    "federated", "contrastive", "generative", "efficient", "scalable", "model",
+)
+EPOCH = datetime(2019, 1, 1)
+
+
+def paper_id(i: int) -> str:
+    return f"{2301 + i // 100000}.{i % 100000:05d}"
+
+
+def make_paper(i: int, version: int = 1, seed: int = 0) -> Paper:
+    rng = random.Random(seed * 1_000_003 + i)
+    arxiv_id = paper_id(i)
+    published = EPOCH + timedelta(minutes=rng.randrange(6 * 365 * 24 * 60))
+    updated = published + timedelta(days=30 * (version - 1))
+    return Paper(
+        arxiv_id=arxiv_id,
+        version=f"v{version}",
+        title=" ".join(rng.choices(WORDS, k=rng.randint(4, 10))).capitalize(),
+        authors=[f"Author {rng.randrange(50000)}" for _ in range(rng.randint(1, 8))],
+        abstract=" ".join(rng.choices(WORDS, k=rng.randint(80, 200))),
+        categories=rng.sample(CATEGORIES, rng.randint(1, 3)),
+        published=published.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        updated=updated.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        pdf_url=f"https://arxiv.org/pdf/{arxiv_id}v{version}",
+        source_url=f"http://arxiv.org/abs/{arxiv_id}v{version}",
+    )
+
+
+def iter_papers(n: int, seed: int = 0, revised_every: int = 10) -> Iterator[Paper]:
+    # Every revised_every-th paper also gets a v2, so the corpus has
+    # multi-version entries for get_versions.
+    emitted = 0
+    i = 0
+    while emitted < n:
+        yield make_paper(i, 1, seed)
+        emitted += 1
+        if revised_every and i % revised_every == 0 and emitted < n:
+            yield make_paper(i, 2, seed)
+            emitted += 1
+        i += 1
@@ -1,14 +1,31 @@
-from .adapter import ArxivAdapter
-from .models import Paper
+from .adapter import ArxivAdapter, FetchManyResult
+from .models import Paper, PaperPage, SearchHit
 from .storage import SQLiteBackend, MemoryBackend
-from .compliance import RateLimiter, DEFAULT_USER_AGENT
+from .sharding import ShardedSQLiteBackend
+from .caching import CachedStorage
+from .async_storage import AsyncSQLiteBackend, AsyncStorage
+from .http_cache import ResponseCache
+from .enrichment import EnrichmentPipeline
+from .pdfs import PdfStore
+from .compliance import RateLimiter, DEFAULT_USER_AGENT, shared_rate_limiter
 
 __all__ = [
     "ArxivAdapter",
+    "FetchManyResult",
     "Paper",
+    "PaperPage",
+    "SearchHit",
     "SQLiteBackend",
     "MemoryBackend",
+    "ShardedSQLiteBackend",
+    "CachedStorage",
+    "AsyncStorage",
+    "AsyncSQLiteBackend",
+    "ResponseCache",
+    "EnrichmentPipeline",
+    "PdfStore",
     "RateLimiter",
+    "shared_rate_limiter",
     "DEFAULT_USER_AGENT",
 ]
 __version__ = "0.1.0"
@@ -1,33 +1,96 @@
 from __future__ import annotations
 
-import re
-from typing import Callable
+import asyncio
+import json
+import time
+from contextlib import nullcontext
+from typing import Callable, Generator, Iterable
 from dataclasses import dataclass, field
 
 import arxiv
 import feedparser
+import httpx
 
+from .async_storage import AsyncStorage
+from .atom import ID_VERSION_RE, VERSION_SUFFIX_RE, AtomError, parse_papers
 from .models import Paper
+from .http_cache import CachedResponse, ResponseCache
+from .metrics import AdapterMetrics
+from .oai import ListRecordsParser, OAIError
+from .pdfs import DEFAULT_PDF_CONCURRENCY, PDF_EXTRA_KEY, PdfDownload, PdfStore
 from .storage import StorageBackend, MemoryBackend
-from .compliance import RateLimiter, DEFAULT_USER_AGENT
+from .compliance import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    RateLimiter,
+    DEFAULT_USER_AGENT,
+    get_compliant_headers,
+    shared_rate_limiter,
+)
+
+ARXIV_API_URL = "https://export.arxiv.org/api/query"
+OAI_PMH_URL = "https://oaipmh.arxiv.org/oai"
+FETCH_MANY_CHUNK_SIZE = 200
+SUBSCRIBE_MAX_PAGES = 50
+SUBSCRIBE_STATE_PREFIX = "subscribe:"
+SUBSCRIBE_RESUME_PREFIX = "subscribe-resume:"
+HARVEST_STATE_PREFIX = "harvest:"
+HARVEST_METADATA_PREFIX = "arXivRaw"
+HARVEST_MAX_RETRIES = 5
+HARVEST_RETRY_AFTER = 10.0
+
+_UNTRACKED = nullcontext()
+
+
+def _advance(pages: Generator, value):
+    try:
+        return pages.send(value)
+    except StopIteration:
+        return None
+
+
+@dataclass
+class FetchManyResult:
+    papers: list[Paper]
+    missing: list[str]
 
 
 @dataclass
 class ArxivAdapter:
     storage: StorageBackend | None = None
-    rate_limiter: RateLimiter = field(default_factory=RateLimiter)
+    rate_limiter: RateLimiter = field(default_factory=shared_rate_limiter)
     user_agent: str = DEFAULT_USER_AGENT
+    api_url: str = ARXIV_API_URL
+    oai_url: str = OAI_PMH_URL
+    http_limits: httpx.Limits = field(
+        default_factory=lambda: httpx.Limits(max_connections=10, max_keepalive_connections=5)
+    )
+    http_timeout: float = 30.0
+    response_cache: ResponseCache | None = None
+    metrics: AdapterMetrics | None = None
+    pdf_store: PdfStore | None = None
+    # When set (wrapping the same backend as storage), the async methods do
+    # their storage I/O on its threads instead of on the event loop.
+    async_storage: AsyncStorage | None = None
+    _http: httpx.AsyncClient | None = field(default=None, init=False, repr=False)
+    _sync_http: httpx.Client | None = field(default=None, init=False, repr=False)
+
+    def _client(self, page_size: int = 100) -> arxiv.Client:
+        client = arxiv.Client(page_size=page_size)
+        client.query_url_format = f"{self.api_url}?{{}}"
+        client.headers = {"User-Agent": self.user_agent}
+        return client
 
     def fetch(self, arxiv_id: str) -> Paper | None:
         self.rate_limiter.wait_if_needed()
         
         clean_id, version = self._parse_id_with_version(arxiv_id)
         
-        client = arxiv.Client()
-        client.headers = {"User-Agent": self.user_agent}
+        client = self._client()
         
         search = arxiv.Search(id_list=[clean_id])
-        results = list(client.results(search))
+        with self._track("fetch"):
+            results = list(client.results(search))
         
         if not results:
             return None
@@ -37,66 +100,528 @@ class ArxivAdapter:
         
         if self.storage:
             self.storage.save(paper)
+            self._record_ingest("fetch", 1)
         
         return paper
 
+    def fetch_many(
+        self,
+        arxiv_ids: Iterable[str],
+        chunk_size: int = FETCH_MANY_CHUNK_SIZE,
+    ) -> FetchManyResult:
+        arxiv_ids = list(dict.fromkeys(arxiv_ids))
+        requested: dict[str, list[str]] = {}
+        for arxiv_id in arxiv_ids:
+            clean_id, version = self._parse_id_with_version(arxiv_id)
+            versions = requested.setdefault(clean_id, [])
+            if version not in versions:
+                versions.append(version)
+        
+        papers = []
+        found: set[str] = set()
+        clean_ids = list(requested)
+        for start in range(0, len(clean_ids), chunk_size):
+            chunk = clean_ids[start : start + chunk_size]
+            self.rate_limiter.wait_if_needed(PRIORITY_BACKGROUND)
+            
+            client = self._client(page_size=len(chunk))
+            search = arxiv.Search(id_list=chunk, max_results=len(chunk))
+            with self._track("fetch_many"):
+                results = list(client.results(search))
+            for result in results:
+                clean_id = self._parse_id_with_version(result.get_short_id())[0]
+                if clean_id not in requested or clean_id in found:
+                    continue
+                found.add(clean_id)
+                papers.extend(self._result_to_paper(result, v) for v in requested[clean_id])
+        
+        missing = [
+            arxiv_id
+            for arxiv_id in arxiv_ids
+            if self._parse_id_with_version(arxiv_id)[0] not in found
+        ]
+        
+        if self.storage and papers:
+            self.storage.save_many(papers)
+            self._record_ingest("fetch_many", len(papers))
+        
+        return FetchManyResult(papers=papers, missing=missing)
+
     def search(
         self,
         query: str,
         max_results: int = 10,
         categories: list[str] | None = None,
     ) -> list[Paper]:
-        self.rate_limiter.wait_if_needed()
+        feed = self._query("search", self._search_params(query, max_results, categories))
+        papers = [self._entry_to_paper(entry) for entry in feed.entries]
         
-        client = arxiv.Client()
-        client.headers = {"User-Agent": self.user_agent}
+        if self.storage:
+            self.storage.save_many(papers)
+            self._record_ingest("search", len(papers))
         
-        search_query = query
-        if categories:
-            cat_query = " OR ".join(f"cat:{cat}" for cat in categories)
-            search_query = f"({query}) AND ({cat_query})"
+        return papers
+
+    def subscribe(
+        self,
+        category: str,
+        on_new: Callable[[Paper], None],
+        max_results: int = 100,
+        max_pages: int = SUBSCRIBE_MAX_PAGES,
+    ) -> list[Paper]:
+        new_papers: list[Paper] = []
+        pages = self._subscribe_pages(category, max_results, max_pages, new_papers)
+        notified = 0
+        params = _advance(pages, None)
+        while params is not None:
+            params = _advance(pages, self._query_papers("subscribe", params, PRIORITY_BACKGROUND))
+            for paper in new_papers[notified:]:
+                on_new(paper)
+            notified = len(new_papers)
+        return new_papers
+
+    def get_watermark(self, category: str) -> str | None:
+        if not self.storage:
+            return None
+        return self.storage.get_state(f"{SUBSCRIBE_STATE_PREFIX}{category}")
+
+    def _set_watermark(self, category: str, watermark: str | None) -> None:
+        if self.storage and watermark:
+            self.storage.set_state(f"{SUBSCRIBE_STATE_PREFIX}{category}", watermark)
+
+    def _get_resume(self, category: str) -> dict | None:
+        raw = self.storage.get_state(f"{SUBSCRIBE_RESUME_PREFIX}{category}") if self.storage else None
+        return json.loads(raw) if raw else None
+
+    def _set_resume(self, category: str, resume: dict | None) -> None:
+        if self.storage:
+            self.storage.set_state(f"{SUBSCRIBE_RESUME_PREFIX}{category}", json.dumps(resume) if resume else "")
+
+    def _subscribe_pages(
+        self,
+        category: str,
+        max_results: int,
+        max_pages: int,
+        new_papers: list[Paper],
+    ) -> Generator[dict[str, str], list[Paper], None]:
+        # Yields the params of each page to fetch and is sent the parsed
+        # page back, so subscribe and asubscribe share the paging logic;
+        # new papers are appended to new_papers as each page is saved.
+        # The watermark only moves once a poll reaches it; a poll that runs
+        # out of pages first records where it stopped (resume["start"]) and
+        # the newest date it saw, and the next poll skips straight over the
+        # pages it already ingested, however far new arrivals pushed them.
+        watermark = self.get_watermark(category)
+        resume = self._get_resume(category)
+        newest = resume["newest"] if resume else watermark
+        boundary = newest if resume else None
         
-        search = arxiv.Search(
-            query=search_query,
-            max_results=max_results,
-            sort_by=arxiv.SortCriterion.SubmittedDate,
-        )
+        start = 0
+        done = False
+        for _ in range(max_pages):
+            papers = yield self._subscribe_params(category, start, max_results)
+            
+            page_new, newest, caught_up = self._ingest_page(
+                papers, watermark, newest, stop_on_known=resume is None
+            )
+            new_papers.extend(page_new)
+            if caught_up or watermark is None or len(papers) < max_results:
+                done = True
+                break
+            
+            next_start = start + len(papers)
+            if boundary is not None:
+                for i, paper in enumerate(papers):
+                    if paper.published and paper.published <= boundary:
+                        next_start = start + i + resume["start"]
+                        boundary = None
+                        break
+            start = next_start
+        
+        if done:
+            self._set_watermark(category, newest)
+            if resume:
+                self._set_resume(category, None)
+        else:
+            self._set_resume(category, {"start": start, "newest": newest})
+
+    def harvest(
+        self,
+        set_spec: str | None = None,
+        from_date: str | None = None,
+        until_date: str | None = None,
+        on_page: Callable[[list[Paper]], None] | None = None,
+    ) -> int:
+        state_key = f"{HARVEST_STATE_PREFIX}{set_spec or '*'}:{from_date or ''}:{until_date or ''}"
+        token = self.storage.get_state(state_key) if self.storage else None
+        
+        total = 0
+        while True:
+            if token:
+                params = {"verb": "ListRecords", "resumptionToken": token}
+            else:
+                params = {"verb": "ListRecords", "metadataPrefix": HARVEST_METADATA_PREFIX}
+                if set_spec:
+                    params["set"] = set_spec
+                if from_date:
+                    params["from"] = from_date
+                if until_date:
+                    params["until"] = until_date
+            
+            papers, token = self._harvest_page(params)
+            if self.storage and papers:
+                self.storage.save_many(papers)
+                self._record_ingest("harvest", len(papers))
+            if self.storage:
+                self.storage.set_state(state_key, token or "")
+            total += len(papers)
+            if on_page and papers:
+                on_page(papers)
+            if not token:
+                return total
+
+    def _harvest_page(self, params: dict[str, str]) -> tuple[list[Paper], str | None]:
+        for _ in range(HARVEST_MAX_RETRIES):
+            self.rate_limiter.wait_if_needed(PRIORITY_BACKGROUND)
+            parser = ListRecordsParser()
+            papers = []
+            with self._track("harvest"), self._sync_http_client().stream(
+                "GET", self.oai_url, params=params
+            ) as response:
+                if response.status_code == 503:
+                    retry_after = response.headers.get("Retry-After", "")
+                    time.sleep(float(retry_after) if retry_after.isdigit() else HARVEST_RETRY_AFTER)
+                    continue
+                response.raise_for_status()
+                for chunk in response.iter_bytes():
+                    papers.extend(parser.feed(chunk))
+                papers.extend(parser.close())
+            
+            if parser.error is not None:
+                if parser.error.code == "noRecordsMatch":
+                    return [], None
+                raise parser.error
+            return papers, parser.resumption_token
+        
+        raise OAIError("retryLimit", f"gave up after {HARVEST_MAX_RETRIES} attempts")
+
+    async def afetch(self, arxiv_id: str) -> Paper | None:
+        clean_id, version = self._parse_id_with_version(arxiv_id)
+        
+        feed = await self._aquery("fetch", {"id_list": clean_id, "max_results": "1"})
+        if not feed.entries:
+            return None
+        
+        paper = self._entry_to_paper(feed.entries[0], version)
+        
+        if self.storage:
+            await self._astore("save", paper)
+            self._record_ingest("fetch", 1)
         
-        results = list(client.results(search))
-        papers = [self._result_to_paper(r) for r in results]
+        return paper
+
+    async def asearch(
+        self,
+        query: str,
+        max_results: int = 10,
+        categories: list[str] | None = None,
+    ) -> list[Paper]:
+        feed = await self._aquery("search", self._search_params(query, max_results, categories))
+        papers = [self._entry_to_paper(entry) for entry in feed.entries]
         
         if self.storage:
-            for paper in papers:
-                self.storage.save(paper)
+            await self._astore("save_many", papers)
+            self._record_ingest("search", len(papers))
         
         return papers
 
-    def subscribe(
+    async def asubscribe(
         self,
         category: str,
         on_new: Callable[[Paper], None],
         max_results: int = 100,
+        max_pages: int = SUBSCRIBE_MAX_PAGES,
     ) -> list[Paper]:
-        self.rate_limiter.wait_if_needed()
-        
-        feed_url = f"http://export.arxiv.org/api/query?search_query=cat:{category}&max_results={max_results}&sortBy=submittedDate&sortOrder=descending"
+        new_papers: list[Paper] = []
+        pages = self._subscribe_pages(category, max_results, max_pages, new_papers)
+        notified = 0
+        params = await self._astep(pages, None)
+        while params is not None:
+            papers = await self._aquery_papers("subscribe", params, PRIORITY_BACKGROUND)
+            params = await self._astep(pages, papers)
+            for paper in new_papers[notified:]:
+                on_new(paper)
+            notified = len(new_papers)
+        return new_papers
+
+    async def _astep(self, pages: Generator, papers: list[Paper] | None) -> dict[str, str] | None:
+        # Each step reads state, checks which papers exist and saves the new
+        # ones; on the writer thread that happens in one serialized block.
+        if self.async_storage is not None:
+            return await self.async_storage.run_write(_advance, pages, papers)
+        return _advance(pages, papers)
+
+    async def _astore(self, name: str, *args, **kwargs):
+        if self.async_storage is not None:
+            return await getattr(self.async_storage, name)(*args, **kwargs)
+        return getattr(self.storage, name)(*args, **kwargs)
+
+    def download_pdfs(
+        self,
+        papers: Iterable[Paper],
+        store: PdfStore | None = None,
+        concurrency: int = DEFAULT_PDF_CONCURRENCY,
+    ) -> list[PdfDownload]:
+        async def run() -> list[PdfDownload]:
+            async with httpx.AsyncClient(**self._http_kwargs()) as client:
+                return await self._download_pdfs(papers, store, concurrency, client)
+
+        return asyncio.run(run())
+
+    async def adownload_pdfs(
+        self,
+        papers: Iterable[Paper],
+        store: PdfStore | None = None,
+        concurrency: int = DEFAULT_PDF_CONCURRENCY,
+    ) -> list[PdfDownload]:
+        return await self._download_pdfs(papers, store, concurrency, self._http_client())
+
+    async def _download_pdfs(
+        self,
+        papers: Iterable[Paper],
+        store: PdfStore | None,
+        concurrency: int,
+        client: httpx.AsyncClient,
+    ) -> list[PdfDownload]:
+        store = store or self.pdf_store
+        if store is None:
+            raise ValueError("No PdfStore configured")
+        updates = []
+
+        def on_done(paper: Paper, result: PdfDownload) -> None:
+            if result.record is None:
+                return
+            info = {"path": result.record.path, "size": result.record.size, "sha256": result.record.sha256}
+            if paper.extra.get(PDF_EXTRA_KEY) != info:
+                paper.extra = {**paper.extra, PDF_EXTRA_KEY: info}
+                updates.append((paper.unique_key, {"extra": paper.extra}))
+
+        results = await store.adownload(papers, client, self.rate_limiter, concurrency, on_done)
+        if self.storage and updates:
+            await self._astore("update_many", updates)
+        self._record_ingest(
+            "pdf",
+            sum(r.status == "downloaded" for r in results),
+            sum(r.status in ("duplicate", "cached") for r in results),
+        )
+        return results
+
+    def close(self) -> None:
+        if self._sync_http is not None:
+            self._sync_http.close()
+            self._sync_http = None
+
+    async def aclose(self) -> None:
+        self.close()
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    def _http_kwargs(self) -> dict:
+        return {
+            "headers": get_compliant_headers(self.user_agent),
+            "limits": self.http_limits,
+            "timeout": self.http_timeout,
+            "follow_redirects": True,
+        }
+
+    def _http_client(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = httpx.AsyncClient(**self._http_kwargs())
+        return self._http
+
+    def _sync_http_client(self) -> httpx.Client:
+        if self._sync_http is None:
+            self._sync_http = httpx.Client(**self._http_kwargs())
+        return self._sync_http
+
+    def _query(
+        self,
+        operation: str,
+        params: dict[str, str],
+        priority: int = PRIORITY_INTERACTIVE,
+    ) -> feedparser.FeedParserDict:
+        return self._parse_feed(operation, self._get_body(operation, params, priority))
+
+    async def _aquery(
+        self,
+        operation: str,
+        params: dict[str, str],
+        priority: int = PRIORITY_INTERACTIVE,
+    ) -> feedparser.FeedParserDict:
+        return self._parse_feed(operation, await self._aget_body(operation, params, priority))
+
+    def _query_papers(
+        self,
+        operation: str,
+        params: dict[str, str],
+        priority: int = PRIORITY_INTERACTIVE,
+    ) -> list[Paper]:
+        return self._parse_papers(operation, self._get_body(operation, params, priority))
+
+    async def _aquery_papers(
+        self,
+        operation: str,
+        params: dict[str, str],
+        priority: int = PRIORITY_INTERACTIVE,
+    ) -> list[Paper]:
+        return self._parse_papers(operation, await self._aget_body(operation, params, priority))
+
+    def _get_body(self, operation: str, params: dict[str, str], priority: int) -> bytes:
+        key, cached = self._cache_lookup(operation, params)
+        if cached and cached.fresh:
+            return cached.body
         
-        feed = feedparser.parse(feed_url)
+        self.rate_limiter.wait_if_needed(priority)
+        with self._track(operation):
+            response = self._sync_http_client().get(
+                self.api_url, params=params, headers=cached.validators() if cached else None
+            )
+            return self._cache_store(operation, key, cached, response)
+
+    async def _aget_body(self, operation: str, params: dict[str, str], priority: int) -> bytes:
+        key, cached = self._cache_lookup(operation, params)
+        if cached and cached.fresh:
+            return cached.body
         
+        await self.rate_limiter.async_wait_if_needed(priority)
+        with self._track(operation):
+            response = await self._http_client().get(
+                self.api_url, params=params, headers=cached.validators() if cached else None
+            )
+            return self._cache_store(operation, key, cached, response)
+
+    def _parse_feed(self, operation: str, body: bytes) -> feedparser.FeedParserDict:
+        if self.metrics is None:
+            return feedparser.parse(body)
+        with self.metrics.parse(operation):
+            return feedparser.parse(body)
+
+    def _parse_papers(self, operation: str, body: bytes) -> list[Paper]:
+        # An empty or HTML body from a misbehaving proxy is an error, not an
+        # empty page: treating it as empty would let subscribe move its
+        # watermark past papers it never saw.
+        if self.metrics is None:
+            return parse_papers(body)
+        try:
+            with self.metrics.parse(operation):
+                return parse_papers(body)
+        except AtomError:
+            self.metrics.errors.inc(operation)
+            raise
+
+    def _track(self, operation: str):
+        if self.metrics is None:
+            return _UNTRACKED
+        return self.metrics.request(operation)
+
+    def _record_ingest(self, operation: str, ingested: int, deduplicated: int = 0) -> None:
+        if self.metrics is None:
+            return
+        if ingested:
+            self.metrics.ingested.inc(operation, amount=ingested)
+        if deduplicated:
+            self.metrics.deduplicated.inc(operation, amount=deduplicated)
+
+    def _cache_lookup(
+        self, operation: str, params: dict[str, str]
+    ) -> tuple[str | None, CachedResponse | None]:
+        if self.response_cache is None:
+            return None, None
+        key = self.response_cache.make_key(operation, params)
+        return key, self.response_cache.get(key, operation)
+
+    def _cache_store(
+        self,
+        operation: str,
+        key: str | None,
+        cached: CachedResponse | None,
+        response: httpx.Response,
+    ) -> bytes:
+        if response.status_code == 304 and cached is not None:
+            self.response_cache.touch(key)
+            return cached.body
+        response.raise_for_status()
+        if key is not None:
+            self.response_cache.put(
+                key,
+                operation,
+                response.content,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+            )
+        return response.content
+
+    def _search_params(
+        self, query: str, max_results: int, categories: list[str] | None
+    ) -> dict[str, str]:
+        return {
+            "search_query": self._build_search_query(query, categories),
+            "max_results": str(max_results),
+            "sortBy": "submittedDate",
+            "sortOrder": "descending",
+        }
+
+    def _subscribe_params(self, category: str, start: int, max_results: int) -> dict[str, str]:
+        return {
+            "search_query": f"cat:{category}",
+            "start": str(start),
+            "max_results": str(max_results),
+            "sortBy": "submittedDate",
+            "sortOrder": "descending",
+        }
+
+    def _ingest_page(
+        self,
+        papers: list[Paper],
+        watermark: str | None,
+        newest: str | None,
+        stop_on_known: bool = True,
+    ) -> tuple[list[Paper], str | None, bool]:
         new_papers = []
-        for entry in feed.entries:
-            paper = self._entry_to_paper(entry)
+        known = 0
+        caught_up = False
+        existing = self.storage.exists_many(p.unique_key for p in papers) if self.storage else set()
+        for paper in papers:
+            published = paper.published or ""
+            if watermark and published and published < watermark:
+                caught_up = True
+                break
+            if published and (newest is None or published > newest):
+                newest = published
             
-            if self.storage and self.storage.exists(paper.unique_key):
+            if paper.unique_key in existing:
+                known += 1
+                if watermark and published <= watermark:
+                    caught_up = True
                 continue
             
-            if self.storage:
-                self.storage.save(paper)
-            
             new_papers.append(paper)
-            on_new(paper)
         
-        return new_papers
+        if stop_on_known and papers and known == len(papers):
+            caught_up = True
+        
+        if self.storage and new_papers:
+            self.storage.save_many(new_papers)
+        self._record_ingest("subscribe", len(new_papers) if self.storage else 0, known)
+        
+        return new_papers, newest, caught_up
+
+    def _build_search_query(self, query: str, categories: list[str] | None) -> str:
+        if not categories:
+            return query
+        cat_query = " OR ".join(f"cat:{cat}" for cat in sorted(set(categories)))
+        return f"({query}) AND ({cat_query})"
 
     def get_versions(self, arxiv_id: str) -> list[Paper]:
         if self.storage:
@@ -104,7 +629,7 @@ class ArxivAdapter:
         return []
 
     def _parse_id_with_version(self, arxiv_id: str) -> tuple[str, str]:
-        match = re.match(r"^(.+?)(v\d+)?$", arxiv_id)
+        match = ID_VERSION_RE.match(arxiv_id)
         if match:
             clean_id = match.group(1)
             version = match.group(2) or "v1"
@@ -115,7 +640,7 @@ class ArxivAdapter:
         self, result: arxiv.Result, version: str = "v1"
     ) -> Paper:
         arxiv_id = result.entry_id.split("/")[-1]
-        arxiv_id = re.sub(r"v\d+$", "", arxiv_id)
+        arxiv_id = VERSION_SUFFIX_RE.sub("", arxiv_id)
         
         return Paper(
             arxiv_id=arxiv_id,
@@ -130,15 +655,16 @@ class ArxivAdapter:
             source_url=result.entry_id,
         )
 
-    def _entry_to_paper(self, entry) -> Paper:
+    def _entry_to_paper(self, entry, version: str | None = None) -> Paper:
         arxiv_url = entry.get("id", "")
         arxiv_id = arxiv_url.split("/")[-1]
         
-        version = "v1"
-        match = re.search(r"v(\d+)$", arxiv_id)
+        entry_version = "v1"
+        match = VERSION_SUFFIX_RE.search(arxiv_id)
         if match:
-            version = f"v{match.group(1)}"
-            arxiv_id = re.sub(r"v\d+$", "", arxiv_id)
+            entry_version = match.group(0)
+            arxiv_id = arxiv_id[: match.start()]
+        version = version or entry_version
         
         return Paper(
             arxiv_id=arxiv_id,
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Iterable, Protocol, Sequence
+
+from .models import Paper, PaperPage, SearchHit
+from .storage import SQLiteBackend, StorageBackend
+
+DEFAULT_READERS = 4
+
+
+class AsyncStorageBackend(Protocol):
+    async def save(self, paper: Paper) -> None: ...
+    async def save_many(self, papers: Iterable[Paper]) -> int: ...
+    async def get(self, unique_key: str, fields: Iterable[str] | None = None) -> Paper | None: ...
+    async def list(self, limit: int = 100, offset: int = 0, sort_by: str = "created_at", order: str = "desc", category: str | None = None, cursor: str | None = None, fields: Iterable[str] | None = None) -> PaperPage: ...
+    async def query(self, categories: Iterable[str] | None = None, published_from: datetime | str | int | None = None, published_to: datetime | str | int | None = None, author: str | None = None, sort: str = "published", order: str = "desc", limit: int = 100, offset: int = 0, cursor: str | None = None, fields: Iterable[str] | None = None) -> PaperPage: ...
+    async def update_many(self, updates: Iterable[tuple[str, dict[str, Any]]]) -> int: ...
+    async def delete(self, unique_key: str) -> bool: ...
+    async def exists(self, unique_key: str) -> bool: ...
+    async def get_many(self, unique_keys: Iterable[str]) -> dict[str, Paper]: ...
+    async def get_versions(self, arxiv_id: str) -> list[Paper]: ...
+    async def count(self, category: str | None = None) -> int: ...
+    async def get_stats(self) -> dict: ...
+    async def get_category_stats(self) -> dict[str, int]: ...
+    async def search_local(self, query: str, limit: int = 20, categories: list[str] | None = None, offset: int = 0) -> list[SearchHit]: ...
+    async def count_local(self, query: str, categories: list[str] | None = None) -> int: ...
+    async def count_query(self, categories: Iterable[str] | None = None, published_from: datetime | str | int | None = None, published_to: datetime | str | int | None = None, author: str | None = None) -> int: ...
+    async def similar(self, unique_key: str, k: int = 10) -> list[SearchHit]: ...
+    async def search_by_vector(self, embedding: Sequence[float], k: int = 10) -> list[SearchHit]: ...
+    async def get_change_state(self) -> tuple[int, int]: ...
+    async def get_state(self, key: str) -> str | None: ...
+    async def set_state(self, key: str, value: str) -> None: ...
+    async def close(self) -> None: ...
+
+
+class AsyncStorage:
+    # Reads fan out over a small thread pool; writes go through a single
+    # thread so they are applied in submission order and never contend
+    # with each other for the database lock.
+    def __init__(self, backend: StorageBackend, readers: int = DEFAULT_READERS):
+        self.backend = backend
+        self._readers = ThreadPoolExecutor(readers, thread_name_prefix="storage-read")
+        self._writer = ThreadPoolExecutor(1, thread_name_prefix="storage-write")
+
+    async def _run(self, executor: ThreadPoolExecutor, fn: Callable, *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, functools.partial(fn, *args, **kwargs))
+
+    def _read(self, name: str, *args, **kwargs):
+        return self._run(self._readers, getattr(self.backend, name), *args, **kwargs)
+
+    def _write(self, name: str, *args, **kwargs):
+        return self._run(self._writer, getattr(self.backend, name), *args, **kwargs)
+
+    async def run_write(self, fn: Callable, *args, **kwargs) -> Any:
+        # For callers whose read-then-write steps must not interleave with
+        # other writes, e.g. an ingest that checks exists_many then saves.
+        return await self._run(self._writer, fn, *args, **kwargs)
+
+    async def save(self, paper: Paper) -> None:
+        await self._write("save", paper)
+
+    async def save_many(self, papers: Iterable[Paper], **kwargs) -> int:
+        return await self._write("save_many", list(papers), **kwargs)
+
+    async def update_many(self, updates: Iterable[tuple[str, dict[str, Any]]]) -> int:
+        return await self._write("update_many", list(updates))
+
+    async def delete(self, unique_key: str) -> bool:
+        return await self._write("delete", unique_key)
+
+    async def set_state(self, key: str, value: str) -> None:
+        await self._write("set_state", key, value)
+
+    async def get(self, unique_key: str, fields: Iterable[str] | None = None) -> Paper | None:
+        return await self._read("get", unique_key, fields=fields)
+
+    async def list(self, **kwargs) -> PaperPage:
+        return await self._read("list", **kwargs)
+
+    async def query(self, **kwargs) -> PaperPage:
+        return await self._read("query", **kwargs)
+
+    async def exists(self, unique_key: str) -> bool:
+        return await self._read("exists", unique_key)
+
+    async def get_many(self, unique_keys: Iterable[str]) -> dict[str, Paper]:
+        return await self._read("get_many", list(unique_keys))
+
+    async def get_versions(self, arxiv_id: str) -> list[Paper]:
+        return await self._read("get_versions", arxiv_id)
+
+    async def count(self, category: str | None = None) -> int:
+        return await self._read("count", category=category)
+
+    async def get_stats(self) -> dict:
+        return await self._read("get_stats")
+
+    async def get_category_stats(self) -> dict[str, int]:
+        return await self._read("get_category_stats")
+
+    async def search_local(self, query: str, **kwargs) -> list[SearchHit]:
+        return await self._read("search_local", query, **kwargs)
+
+    async def count_local(self, query: str, categories: list[str] | None = None) -> int:
+        return await self._read("count_local", query, categories=categories)
+
+    async def count_query(self, **kwargs) -> int:
+        return await self._read("count_query", **kwargs)
+
+    async def similar(self, unique_key: str, k: int = 10) -> list[SearchHit]:
+        return await self._read("similar", unique_key, k=k)
+
+    async def search_by_vector(self, embedding: Sequence[float], k: int = 10) -> list[SearchHit]:
+        return await self._read("search_by_vector", embedding, k=k)
+
+    async def get_change_state(self) -> tuple[int, int]:
+        return await self._read("get_change_state")
+
+    async def get_state(self, key: str) -> str | None:
+        return await self._read("get_state", key)
+
+    async def close(self) -> None:
+        # Let queued writes land before the connections go away.
+        await self._run(self._writer, lambda: None)
+        self._readers.shutdown(wait=True)
+        self._writer.shutdown(wait=True)
+        self.backend.close()
+
+
+class AsyncSQLiteBackend(AsyncStorage):
+    # Pooled SQLiteBackend connections are thread-local, so each reader
+    # thread holds its own connection and the writer thread holds one more;
+    # under WAL the readers keep going while a write is in progress.
+    def __init__(self, db_path: str, readers: int = DEFAULT_READERS, **kwargs):
+        super().__init__(SQLiteBackend(db_path, pooled=True, **kwargs), readers)
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import re
+from typing import Iterable, Iterator
+from xml.etree.ElementTree import Element, ParseError, XMLPullParser
+
+from .models import Paper
+
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+OPENSEARCH_NS = "{http://a9.com/-/spec/opensearch/1.1/}"
+ID_VERSION_RE = re.compile(r"^(.+?)(v\d+)?$")
+VERSION_SUFFIX_RE = re.compile(r"v(\d+)$")
+
+_ENTRY = f"{ATOM_NS}entry"
+_ID = f"{ATOM_NS}id"
+_TITLE = f"{ATOM_NS}title"
+_SUMMARY = f"{ATOM_NS}summary"
+_PUBLISHED = f"{ATOM_NS}published"
+_UPDATED = f"{ATOM_NS}updated"
+_AUTHOR_NAME = f"{ATOM_NS}author/{ATOM_NS}name"
+_CATEGORY = f"{ATOM_NS}category"
+_TOTAL_RESULTS = f"{OPENSEARCH_NS}totalResults"
+
+
+class AtomError(RuntimeError):
+    pass
+
+
+class AtomFeedParser:
+    def __init__(self):
+        self.total_results: int | None = None
+        self._parser = XMLPullParser(events=("start", "end"))
+        self._feed: Element | None = None
+
+    def feed(self, data: bytes) -> list[Paper]:
+        try:
+            self._parser.feed(data)
+            return self._drain()
+        except ParseError as e:
+            raise AtomError(f"response is not an Atom feed: {e}") from e
+
+    def close(self) -> list[Paper]:
+        try:
+            self._parser.close()
+            return self._drain()
+        except ParseError as e:
+            raise AtomError(f"response is not an Atom feed: {e}") from e
+
+    def _drain(self) -> list[Paper]:
+        papers = []
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                if self._feed is None:
+                    self._feed = elem
+                continue
+            if elem.tag == _ENTRY:
+                papers.append(entry_to_paper(elem))
+                self._feed.remove(elem)
+            elif elem.tag == _TOTAL_RESULTS and elem.text:
+                self.total_results = int(elem.text)
+        return papers
+
+
+def iter_papers(chunks: Iterable[bytes]) -> Iterator[Paper]:
+    parser = AtomFeedParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+def parse_papers(data: bytes) -> list[Paper]:
+    parser = AtomFeedParser()
+    return parser.feed(data) + parser.close()
+
+
+def entry_to_paper(entry: Element, version: str | None = None) -> Paper:
+    arxiv_url = (entry.findtext(_ID) or "").strip()
+    arxiv_id = arxiv_url.rsplit("/", 1)[-1]
+
+    entry_version = "v1"
+    match = VERSION_SUFFIX_RE.search(arxiv_id)
+    if match:
+        entry_version = match.group(0)
+        arxiv_id = arxiv_id[: match.start()]
+    version = version or entry_version
+
+    return Paper(
+        arxiv_id=arxiv_id,
+        version=version,
+        title=(entry.findtext(_TITLE) or "").strip(),
+        authors=[(name.text or "").strip() for name in entry.iterfind(_AUTHOR_NAME)],
+        abstract=(entry.findtext(_SUMMARY) or "").strip(),
+        categories=[c.get("term", "") for c in entry.iterfind(_CATEGORY)],
+        published=_stripped(entry.findtext(_PUBLISHED)),
+        updated=_stripped(entry.findtext(_UPDATED)),
+        pdf_url=f"https://arxiv.org/pdf/{arxiv_id}{version}",
+        source_url=arxiv_url,
+    )
+
+
+def _stripped(value: str | None) -> str | None:
+    return value.strip() if value is not None else None
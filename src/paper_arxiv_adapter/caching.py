@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import threading
+from datetime import datetime
+from typing import Any, Iterable
+
+from .models import Paper
+from .storage import StorageBackend
+
+
+class CachedStorage:
+    def __init__(self, backend: StorageBackend):
+        self.backend = backend
+        self._cache: dict[tuple, tuple[int, Any]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.backend, name)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def _cached(self, key: tuple, compute) -> Any:
+        counter = self.backend.get_change_state()[0]
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] == counter:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        value = compute()
+        with self._lock:
+            self._cache[key] = (counter, value)
+        return value
+
+    def count(self, category: str | None = None) -> int:
+        return self._cached(("count", category), lambda: self.backend.count(category=category))
+
+    def count_local(self, query: str, categories: list[str] | None = None) -> int:
+        return self._cached(
+            ("count_local", query, tuple(categories or ())),
+            lambda: self.backend.count_local(query, categories=categories),
+        )
+
+    def count_query(
+        self,
+        categories: Iterable[str] | None = None,
+        published_from: datetime | str | int | None = None,
+        published_to: datetime | str | int | None = None,
+        author: str | None = None,
+    ) -> int:
+        categories = tuple(categories or ())
+        return self._cached(
+            ("count_query", categories, published_from, published_to, author),
+            lambda: self.backend.count_query(categories, published_from, published_to, author),
+        )
+
+    def get_stats(self) -> dict:
+        return dict(self._cached(("get_stats",), self.backend.get_stats))
+
+    def get_category_stats(self) -> dict[str, int]:
+        return dict(self._cached(("get_category_stats",), self.backend.get_category_stats))
+
+    def save(self, paper: Paper) -> None:
+        self.backend.save(paper)
+        self.invalidate()
+
+    def save_many(self, papers: Iterable[Paper], **kwargs) -> int:
+        saved = self.backend.save_many(papers, **kwargs)
+        self.invalidate()
+        return saved
+
+    def update_many(self, updates: Iterable[tuple[str, dict[str, Any]]]) -> int:
+        updated = self.backend.update_many(updates)
+        if updated:
+            self.invalidate()
+        return updated
+
+    def delete(self, unique_key: str) -> bool:
+        deleted = self.backend.delete(unique_key)
+        if deleted:
+            self.invalidate()
+        return deleted
@@ -1,19 +1,186 @@
 from __future__ import annotations
 
+import asyncio
+import heapq
+import itertools
+import sqlite3
+import threading
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    event: threading.Event | asyncio.Event = field(compare=False)
+    loop: asyncio.AbstractEventLoop | None = field(default=None, compare=False)
+
+    def wake(self) -> None:
+        if self.loop is None:
+            self.event.set()
+            return
+        try:
+            self.loop.call_soon_threadsafe(self.event.set)
+        except RuntimeError:
+            pass
 
 
 @dataclass
 class RateLimiter:
     min_interval: float = 3.0
-    _last_request: float = 0.0
+    burst: int = 1
+    shared_path: str | None = None
+    name: str = "arxiv"
+    total_wait_time: float = field(default=0.0, init=False)
+    total_requests: int = field(default=0, init=False)
+    _tokens: float = field(default=-1.0, init=False, repr=False)
+    _updated: float = field(default=0.0, init=False, repr=False)
+    _queue: list[_Waiter] = field(default_factory=list, init=False, repr=False)
+    _seq: itertools.count = field(default_factory=itertools.count, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False, compare=False)
+    _conn: sqlite3.Connection | None = field(default=None, init=False, repr=False)
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    def wait_if_needed(self, priority: int = PRIORITY_INTERACTIVE) -> None:
+        waiter = _Waiter(priority, next(self._seq), threading.Event())
+        start = time.monotonic()
+        granted = False
+        self._enqueue(waiter)
+        try:
+            while True:
+                delay = self._poll(waiter)
+                if delay == 0:
+                    granted = True
+                    return
+                waiter.event.wait(delay)
+                waiter.event.clear()
+        finally:
+            self._finish(waiter, granted, time.monotonic() - start)
+
+    async def async_wait_if_needed(self, priority: int = PRIORITY_INTERACTIVE) -> None:
+        waiter = _Waiter(priority, next(self._seq), asyncio.Event(), asyncio.get_running_loop())
+        start = time.monotonic()
+        granted = False
+        self._enqueue(waiter)
+        try:
+            while True:
+                # The shared bucket is a SQLite transaction that can wait on
+                # other processes, so it runs off the event loop.
+                if self.shared_path:
+                    delay = await asyncio.to_thread(self._poll, waiter)
+                else:
+                    delay = self._poll(waiter)
+                if delay == 0:
+                    granted = True
+                    return
+                try:
+                    await asyncio.wait_for(waiter.event.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                waiter.event.clear()
+        finally:
+            self._finish(waiter, granted, time.monotonic() - start)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _enqueue(self, waiter: _Waiter) -> None:
+        with self._lock:
+            heapq.heappush(self._queue, waiter)
+
+    def _poll(self, waiter: _Waiter) -> float | None:
+        with self._lock:
+            if self._queue[0] is not waiter:
+                return None
+            delay = self._take()
+            if delay == 0:
+                heapq.heappop(self._queue)
+            return delay
+
+    def _finish(self, waiter: _Waiter, granted: bool, waited: float) -> None:
+        with self._lock:
+            if granted:
+                self.total_wait_time += waited
+                self.total_requests += 1
+            elif waiter in self._queue:
+                self._queue.remove(waiter)
+                heapq.heapify(self._queue)
+            head = self._queue[0] if self._queue else None
+        if head is not None:
+            head.wake()
+
+    def _take(self) -> float:
+        if self.min_interval <= 0:
+            return 0
+        if self.shared_path:
+            return self._take_shared()
+
+        now = time.time()
+        if self._tokens < 0:
+            self._tokens, self._updated = float(self.burst), now
+        self._tokens, delay = self._refill(self._tokens, self._updated, now)
+        self._updated = now
+        return delay
+
+    def _refill(self, tokens: float, updated: float, now: float) -> tuple[float, float]:
+        tokens = min(float(self.burst), tokens + max(0.0, now - updated) / self.min_interval)
+        if tokens >= 1:
+            return tokens - 1, 0
+        return tokens, (1 - tokens) * self.min_interval
+
+    def _take_shared(self) -> float:
+        if self._conn is None:
+            self._conn = sqlite3.connect(
+                self.shared_path, timeout=30, isolation_level=None, check_same_thread=False
+            )
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS rate_limits (
+                    name TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated REAL NOT NULL
+                )
+            """)
+
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            row = conn.execute(
+                "SELECT tokens, updated FROM rate_limits WHERE name = ?", (self.name,)
+            ).fetchone()
+            tokens, updated = row if row else (float(self.burst), now)
+            tokens, delay = self._refill(tokens, updated, now)
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limits (name, tokens, updated) VALUES (?, ?, ?)",
+                (self.name, tokens, now),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return delay
+
+
+_shared_limiters: dict[str, RateLimiter] = {}
+_shared_limiters_lock = threading.Lock()
+
 
-    def wait_if_needed(self) -> None:
-        elapsed = time.time() - self._last_request
-        if elapsed < self.min_interval:
-            time.sleep(self.min_interval - elapsed)
-        self._last_request = time.time()
+def shared_rate_limiter(name: str = "arxiv", **kwargs) -> RateLimiter:
+    with _shared_limiters_lock:
+        limiter = _shared_limiters.get(name)
+        if limiter is None:
+            limiter = _shared_limiters[name] = RateLimiter(name=name, **kwargs)
+        return limiter
 
 
 DEFAULT_USER_AGENT = "paper-arxiv-adapter/0.1.0 (https://github.com/user/paper-arxiv-adapter)"
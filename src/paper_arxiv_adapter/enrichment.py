@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import os
+import re
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, Protocol, Sequence
+
+import numpy as np
+
+from .models import Paper
+from .storage import StorageBackend, _chunked
+
+ENRICHMENT_STATE_PREFIX = "enrichment:"
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_KEYWORDS = 8
+DEFAULT_EMBEDDING_DIM = 256
+DEFAULT_SUMMARY_CHARS = 280
+
+_WORD_RE = re.compile(r"[a-z][a-z0-9]+(?:-[a-z0-9]+)*")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z])")
+STOPWORDS = frozenset("""
+    a about above after again against all also among an and any are as at be because been
+    before being below between both but by can could did do does doing down during each
+    either et etc few for from further had has have having here how however i if in into is
+    it its itself just may more most much must no nor not of off on once only or other our
+    out over own paper per propose proposed same should show shows so some such than that
+    the their them then there these they this those through thus to too under until up upon
+    us use used using very via was we well were what when where whether which while who why
+    will with within without would yet
+""".split())
+
+Document = tuple[str, str, str]
+
+
+class Enricher(Protocol):
+    name: str
+    fields: tuple[str, ...]
+
+    def __call__(self, documents: Sequence[Document]) -> list[dict[str, Any]]: ...
+
+
+def _tokens(text: str) -> list[str]:
+    return [t for t in _WORD_RE.findall(text.lower()) if len(t) > 2 and t not in STOPWORDS]
+
+
+def _term_counts(token_lists: list[list[str]]) -> tuple[np.ndarray, ...]:
+    # One sparse (doc, term, count) triple per distinct term in each document,
+    # built with a single np.unique over the batch instead of per-doc Counters.
+    lengths = np.fromiter((len(t) for t in token_lists), dtype=np.int64, count=len(token_lists))
+    flat = [token for tokens in token_lists for token in tokens]
+    if not flat:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty, np.zeros(0, dtype=str), lengths
+    vocab, term_ids = np.unique(np.array(flat, dtype=str), return_inverse=True)
+    doc_ids = np.repeat(np.arange(len(token_lists)), lengths)
+    pairs, counts = np.unique(doc_ids * len(vocab) + term_ids, return_counts=True)
+    return pairs // len(vocab), pairs % len(vocab), counts, vocab, lengths
+
+
+class TfidfKeywordEnricher:
+    name = "tfidf-keywords"
+    fields = ("keywords",)
+
+    def __init__(self, top_k: int = DEFAULT_KEYWORDS, title_weight: int = 2):
+        self.top_k = top_k
+        self.title_weight = title_weight
+
+    def __call__(self, documents: Sequence[Document]) -> list[dict[str, Any]]:
+        # IDF comes from the batch itself, so batches should be large enough
+        # (hundreds of abstracts) for document frequencies to mean something.
+        token_lists = [_tokens(title) * self.title_weight + _tokens(abstract) for _, title, abstract in documents]
+        docs, terms, counts, vocab, lengths = _term_counts(token_lists)
+        n = len(documents)
+        keywords: list[list[str]] = [[] for _ in range(n)]
+        if not len(docs):
+            return [{"keywords": kw} for kw in keywords]
+
+        df = np.bincount(terms, minlength=len(vocab))
+        idf = np.log((1 + n) / (1 + df)) + 1.0
+        scores = counts / lengths[docs] * idf[terms]
+
+        order = np.lexsort((terms, -scores, docs))
+        ranked_docs = docs[order]
+        rank = np.arange(order.size) - np.searchsorted(ranked_docs, ranked_docs)
+        keep = order[rank < self.top_k]
+        for doc, term in zip(docs[keep].tolist(), terms[keep].tolist()):
+            keywords[doc].append(str(vocab[term]))
+        return [{"keywords": kw} for kw in keywords]
+
+
+class HashingEmbeddingEnricher:
+    name = "hashing-embedding"
+    fields = ("embedding",)
+
+    def __init__(self, dim: int = DEFAULT_EMBEDDING_DIM, bigrams: bool = True):
+        self.dim = dim
+        self.bigrams = bigrams
+
+    def _features(self, title: str, abstract: str) -> list[str]:
+        tokens = _tokens(f"{title} {abstract}")
+        if self.bigrams:
+            tokens += [f"{a}_{b}" for a, b in zip(tokens, tokens[1:])]
+        return tokens
+
+    def __call__(self, documents: Sequence[Document]) -> list[dict[str, Any]]:
+        docs, terms, counts, vocab, _ = _term_counts([self._features(t, a) for _, t, a in documents])
+        matrix = np.zeros((len(documents), self.dim), dtype=np.float32)
+        if len(docs):
+            # crc32 is stable across processes, unlike hash() on str.
+            hashes = np.fromiter(
+                (zlib.crc32(term.encode()) for term in vocab.tolist()), dtype=np.uint32, count=len(vocab)
+            )
+            buckets = (hashes % self.dim).astype(np.int64)
+            signs = np.where(hashes & 0x80000000, -1.0, 1.0)
+            np.add.at(matrix, (docs, buckets[terms]), (signs[terms] * np.log1p(counts)).astype(np.float32))
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix /= np.where(norms == 0, 1.0, norms)
+        return [{"embedding": row} for row in matrix.tolist()]
+
+
+class LeadSummaryEnricher:
+    name = "lead-summary"
+    fields = ("summary",)
+
+    def __init__(self, max_chars: int = DEFAULT_SUMMARY_CHARS):
+        self.max_chars = max_chars
+
+    def __call__(self, documents: Sequence[Document]) -> list[dict[str, Any]]:
+        results = []
+        for _, _, abstract in documents:
+            summary = ""
+            for sentence in _SENTENCE_RE.split(" ".join(abstract.split())):
+                if summary and len(summary) + len(sentence) + 1 > self.max_chars:
+                    break
+                summary = f"{summary} {sentence}".lstrip()
+            if len(summary) > self.max_chars:
+                summary = summary[: self.max_chars - 1].rsplit(" ", 1)[0] + "…"
+            results.append({"summary": summary})
+        return results
+
+
+def default_enrichers() -> list[Enricher]:
+    return [TfidfKeywordEnricher(), LeadSummaryEnricher(), HashingEmbeddingEnricher()]
+
+
+def _missing(value: Any) -> bool:
+    return value is None or (hasattr(value, "__len__") and len(value) == 0)
+
+
+def enrich_batch(
+    enrichers: Sequence[Enricher],
+    documents: Sequence[Document],
+    needs: Sequence[frozenset[int]],
+) -> list[dict[str, Any]]:
+    results: list[dict[str, Any]] = [{} for _ in documents]
+    for i, enricher in enumerate(enrichers):
+        rows = [j for j, need in enumerate(needs) if i in need]
+        if not rows:
+            continue
+        for j, values in zip(rows, enricher([documents[j] for j in rows])):
+            results[j].update(values)
+    return results
+
+
+@dataclass
+class EnrichmentReport:
+    scanned: int = 0
+    enriched: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+    resumed_from: str = ""
+    completed: bool = False
+
+    @property
+    def papers_per_second(self) -> float:
+        return self.enriched / self.seconds if self.seconds else 0.0
+
+
+class EnrichmentPipeline:
+    # Papers are scanned in unique_key order and every written batch moves a
+    # checkpoint in sync_state, so an interrupted run resumes where it stopped.
+    # Fields that are already filled are never recomputed unless force=True,
+    # so a finished run can be repeated safely to pick up new papers.
+    def __init__(
+        self,
+        storage: StorageBackend,
+        enrichers: Sequence[Enricher] | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        workers: int | None = None,
+        force: bool = False,
+    ):
+        self.storage = storage
+        self.enrichers = list(enrichers) if enrichers is not None else default_enrichers()
+        self.batch_size = batch_size
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        self.force = force
+
+    @property
+    def state_key(self) -> str:
+        return ENRICHMENT_STATE_PREFIX + ",".join(e.name for e in self.enrichers)
+
+    def reset(self) -> None:
+        self.storage.set_state(self.state_key, "")
+
+    def _needs(self, paper: Paper) -> frozenset[int]:
+        return frozenset(
+            i for i, enricher in enumerate(self.enrichers)
+            if self.force or any(_missing(getattr(paper, name)) for name in enricher.fields)
+        )
+
+    def _pending(self, start_after: str, report: EnrichmentReport) -> Iterator[tuple[Paper, frozenset[int]]]:
+        for paper in self.storage.iter_all(self.batch_size, start_after=start_after):
+            report.scanned += 1
+            needs = self._needs(paper)
+            if needs:
+                yield paper, needs
+
+    def run(
+        self,
+        limit: int | None = None,
+        on_batch: Callable[[EnrichmentReport], None] | None = None,
+    ) -> EnrichmentReport:
+        start_after = self.storage.get_state(self.state_key) or ""
+        report = EnrichmentReport(resumed_from=start_after)
+        started = time.perf_counter()
+        executor = ProcessPoolExecutor(self.workers) if self.workers > 1 else None
+        in_flight: deque[tuple[list[str], Future]] = deque()
+
+        def drain(keep: int) -> None:
+            while len(in_flight) > keep:
+                keys, future = in_flight.popleft()
+                updates = [(key, values) for key, values in zip(keys, future.result()) if values]
+                self.storage.update_many(updates)
+                self.storage.set_state(self.state_key, keys[-1])
+                report.enriched += len(keys)
+                report.batches += 1
+                report.seconds = time.perf_counter() - started
+                if on_batch:
+                    on_batch(report)
+
+        try:
+            pending = self._pending(start_after, report)
+            if limit is not None:
+                pending = (item for _, item in zip(range(limit), pending))
+            for batch in _chunked(pending, self.batch_size):
+                keys = [paper.unique_key for paper, _ in batch]
+                documents = [(paper.unique_key, paper.title, paper.abstract) for paper, _ in batch]
+                needs = [need for _, need in batch]
+                if executor is None:
+                    future: Future = Future()
+                    future.set_result(enrich_batch(self.enrichers, documents, needs))
+                else:
+                    future = executor.submit(enrich_batch, self.enrichers, documents, needs)
+                in_flight.append((keys, future))
+                drain(keep=2 * self.workers)
+            drain(keep=0)
+            if limit is None or report.enriched < limit:
+                report.completed = True
+                self.reset()
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+            report.seconds = time.perf_counter() - started
+        return report
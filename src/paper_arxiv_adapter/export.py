@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import json
+from datetime import datetime
+from typing import IO, Iterable, Iterator
+
+from .models import PAPER_FIELDS, Paper
+from .storage import ITER_BATCH_SIZE, SAVE_MANY_CHUNK_SIZE, StorageBackend, _chunked
+
+
+def paper_to_record(paper: Paper) -> dict:
+    record = {name: getattr(paper, name) for name in PAPER_FIELDS}
+    for name in ("published", "updated"):
+        if isinstance(record[name], datetime):
+            record[name] = record[name].isoformat()
+    return record
+
+
+def record_to_paper(record: dict) -> Paper:
+    return Paper(**{name: record[name] for name in PAPER_FIELDS if name in record})
+
+
+def iter_ndjson(storage: StorageBackend, batch_size: int = ITER_BATCH_SIZE) -> Iterator[bytes]:
+    for batch in _chunked(storage.iter_all(batch_size), batch_size):
+        lines = [json.dumps(paper_to_record(p), ensure_ascii=False) for p in batch]
+        yield ("\n".join(lines) + "\n").encode()
+
+
+def export_ndjson(storage: StorageBackend, fp: IO[bytes], batch_size: int = ITER_BATCH_SIZE) -> int:
+    exported = 0
+    for chunk in iter_ndjson(storage, batch_size):
+        fp.write(chunk)
+        exported += chunk.count(b"\n")
+    return exported
+
+
+def import_ndjson(
+    storage: StorageBackend,
+    lines: Iterable[str | bytes],
+    batch_size: int = SAVE_MANY_CHUNK_SIZE,
+) -> int:
+    papers = (record_to_paper(json.loads(line)) for line in lines if line.strip())
+    imported = 0
+    for batch in _chunked(papers, batch_size):
+        imported += storage.save_many(batch)
+    return imported
+
+
+def export_parquet(
+    storage: StorageBackend,
+    path: str,
+    batch_size: int = ITER_BATCH_SIZE,
+) -> int:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet export requires pyarrow: pip install pyarrow") from e
+
+    schema = pa.schema([
+        ("arxiv_id", pa.string()),
+        ("version", pa.string()),
+        ("title", pa.string()),
+        ("authors", pa.list_(pa.string())),
+        ("abstract", pa.string()),
+        ("categories", pa.list_(pa.string())),
+        ("published", pa.string()),
+        ("updated", pa.string()),
+        ("pdf_url", pa.string()),
+        ("source_url", pa.string()),
+        ("keywords", pa.list_(pa.string())),
+        ("summary", pa.string()),
+        ("embedding", pa.list_(pa.float32())),
+        ("extra", pa.string()),
+    ])
+
+    exported = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for batch in _chunked(storage.iter_all(batch_size), batch_size):
+            records = [paper_to_record(p) for p in batch]
+            for record in records:
+                record["extra"] = json.dumps(record["extra"]) if record["extra"] else None
+            writer.write_batch(pa.RecordBatch.from_pylist(records, schema=schema))
+            exported += len(records)
+    return exported
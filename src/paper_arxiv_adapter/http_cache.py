@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from urllib.parse import urlencode
+
+DEFAULT_CACHE_TTLS = {"search": 3600.0, "fetch": 86400.0, "subscribe": 300.0}
+DEFAULT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str | None = None
+    last_modified: str | None = None
+    fresh: bool = True
+
+    def validators(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        db_path: str = "http_cache.db",
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        ttls: dict[str, float] | None = None,
+    ):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self.ttls = {**DEFAULT_CACHE_TTLS, **(ttls or {})}
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                operation TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_lru ON responses(accessed_at)")
+        self._size = self._conn.execute("SELECT IFNULL(SUM(size), 0) FROM responses").fetchone()[0]
+
+    @staticmethod
+    def make_key(operation: str, params: dict[str, str]) -> str:
+        normalized = sorted((k, " ".join(str(v).split())) for k, v in params.items())
+        return f"{operation}?{urlencode(normalized)}"
+
+    def get(self, key: str, operation: str) -> CachedResponse | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, stored_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            body, etag, last_modified, stored_at = row
+            fresh = now - stored_at < self.ttls.get(operation, 0)
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return CachedResponse(bytes(body), etag, last_modified, fresh)
+
+    def put(
+        self,
+        key: str,
+        operation: str,
+        body: bytes,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        if len(body) > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                old = conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+                conn.execute(
+                    """
+                    INSERT OR REPLACE INTO responses
+                    (key, operation, body, size, etag, last_modified, stored_at, accessed_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (key, operation, body, len(body), etag, last_modified, now, now),
+                )
+                self._size += len(body) - (old[0] if old else 0)
+                self._evict()
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                self._size = conn.execute("SELECT IFNULL(SUM(size), 0) FROM responses").fetchone()[0]
+                raise
+
+    def touch(self, key: str) -> None:
+        self.revalidations += 1
+        with self._lock:
+            self._conn.execute("UPDATE responses SET stored_at = ? WHERE key = ?", (time.time(), key))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._size = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def _evict(self) -> None:
+        while self._size > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at LIMIT 32"
+            ).fetchall()
+            if not rows:
+                break
+            for key, size in rows:
+                if self._size <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._size -= size
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import bisect
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+DEFAULT_BUCKETS = (
+    0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+UNTIMED_STORAGE_METHODS = frozenset({"close", "iter_all", "iter_embeddings"})
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+
+    def _labels(self, values: tuple[str, ...]) -> dict[str, str]:
+        return dict(zip(self.labelnames, values))
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.kind}"
+        yield from self._samples()
+
+    def _samples(self) -> Iterator[str]:
+        return iter(())
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        return self._values.get(labelvalues, 0.0)
+
+    def _samples(self) -> Iterator[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        for labelvalues, value in items:
+            yield f"{self.name}{_format_labels(self._labels(labelvalues))} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, *labelvalues: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labelvalues)
+
+    def count(self, *labelvalues: str) -> int:
+        series = self._series.get(labelvalues)
+        return series[2] if series else 0
+
+    def _samples(self) -> Iterator[str]:
+        with self._lock:
+            items = sorted((k, ([*v[0]], v[1], v[2])) for k, v in self._series.items())
+        for labelvalues, (counts, total, n) in items:
+            labels = self._labels(labelvalues)
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                bucket_labels = _format_labels({**labels, "le": _format_value(bound)})
+                yield f"{self.name}_bucket{bucket_labels} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(labels)} {n}"
+
+
+class CallbackMetric(_Metric):
+    def __init__(self, name: str, help: str, fn: Callable[[], float], kind: str = "gauge"):
+        super().__init__(name, help)
+        self.kind = kind
+        self._fn = fn
+
+    def _samples(self) -> Iterator[str]:
+        yield f"{self.name} {_format_value(self._fn())}"
+
+
+class MetricsRegistry:
+    def __init__(self, prefix: str = "paper_adapter_"):
+        self.prefix = prefix
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(self.prefix + name, help, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(self.prefix + name, help, labelnames, buckets))
+
+    def gauge(self, name: str, help: str, fn: Callable[[], float], kind: str = "gauge") -> CallbackMetric:
+        return self._register(CallbackMetric(self.prefix + name, help, fn, kind))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(line for metric in metrics for line in metric.render()) + "\n"
+
+
+class InstrumentedStorage:
+    def __init__(self, backend, registry: MetricsRegistry):
+        self._backend = backend
+        self._latency = registry.histogram(
+            "storage_operation_seconds", "Storage backend call latency", ("method",)
+        )
+        self._errors = registry.counter(
+            "storage_operation_errors_total", "Storage backend calls that raised", ("method",)
+        )
+        self._wrapped: dict[str, Callable] = {}
+
+    def __getattr__(self, name: str):
+        attr = getattr(self._backend, name)
+        if name.startswith("_") or name in UNTIMED_STORAGE_METHODS or not callable(attr):
+            return attr
+        wrapped = self._wrapped.get(name)
+        if wrapped is None:
+            wrapped = self._wrapped[name] = self._wrap(name)
+        return wrapped
+
+    def _wrap(self, name: str) -> Callable:
+        method = getattr(self._backend, name)
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            except Exception:
+                self._errors.inc(name)
+                raise
+            finally:
+                self._latency.observe(time.perf_counter() - start, name)
+
+        return timed
+
+
+class AdapterMetrics:
+    def __init__(self, registry: MetricsRegistry):
+        self.requests = registry.counter(
+            "arxiv_requests_total", "Upstream arXiv requests", ("operation",)
+        )
+        self.errors = registry.counter(
+            "arxiv_request_errors_total", "Upstream arXiv requests that failed", ("operation",)
+        )
+        self.latency = registry.histogram(
+            "arxiv_request_seconds", "Upstream arXiv request latency", ("operation",)
+        )
+        self.parse_latency = registry.histogram(
+            "arxiv_parse_seconds", "Feed parsing time per response", ("operation",)
+        )
+        self.ingested = registry.counter(
+            "papers_ingested_total", "Papers written to storage by the adapter", ("operation",)
+        )
+        self.deduplicated = registry.counter(
+            "papers_deduplicated_total", "Fetched papers skipped as already stored", ("operation",)
+        )
+
+    @contextmanager
+    def request(self, operation: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.errors.inc(operation)
+            raise
+        finally:
+            self.requests.inc(operation)
+            self.latency.observe(time.perf_counter() - start, operation)
+
+    def parse(self, operation: str):
+        return self.parse_latency.time(operation)
+
+
+def instrument_rate_limiter(registry: MetricsRegistry, limiter) -> None:
+    registry.gauge(
+        "rate_limiter_queue_depth", "Callers waiting for a rate-limit slot", lambda: limiter.queue_depth
+    )
+    registry.gauge(
+        "rate_limiter_wait_seconds_total",
+        "Time callers spent waiting on the rate limiter",
+        lambda: limiter.total_wait_time,
+        kind="counter",
+    )
+    registry.gauge(
+        "rate_limiter_grants_total",
+        "Rate-limit slots granted",
+        lambda: limiter.total_requests,
+        kind="counter",
+    )
+
+
+def instrument_response_cache(registry: MetricsRegistry, cache) -> None:
+    registry.gauge("response_cache_hits_total", "Fresh response cache hits", lambda: cache.hits, kind="counter")
+    registry.gauge("response_cache_misses_total", "Response cache misses", lambda: cache.misses, kind="counter")
+    registry.gauge("response_cache_bytes", "Bytes stored in the response cache", lambda: cache.size)
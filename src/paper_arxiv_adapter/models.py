@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from datetime import datetime
-from typing import Any
+from typing import Any, Callable
 
 
-@dataclass
+@dataclass(slots=True)
 class Paper:
     arxiv_id: str
     version: str
@@ -25,3 +25,78 @@ class Paper:
     @property
     def unique_key(self) -> str:
         return f"{self.arxiv_id}{self.version}"
+
+
+PAPER_FIELDS = tuple(f.name for f in fields(Paper))
+
+
+def _lazy_field(name: str) -> property:
+    slot = Paper.__dict__[name]
+
+    def get(self):
+        pending = getattr(self, "_pending", None)
+        if pending:
+            item = pending.pop(name, None)
+            if item is not None:
+                decode, raw = item
+                slot.__set__(self, decode(raw))
+        return slot.__get__(self)
+
+    def set(self, value):
+        pending = getattr(self, "_pending", None)
+        if pending:
+            pending.pop(name, None)
+        slot.__set__(self, value)
+
+    return property(get, set)
+
+
+class LazyPaper(Paper):
+    # Heavy columns are kept raw until first access, and fields left out of
+    # a projection stay unset (reading them raises AttributeError).
+    __slots__ = ("_pending",)
+
+    keywords = _lazy_field("keywords")
+    embedding = _lazy_field("embedding")
+    extra = _lazy_field("extra")
+
+    @classmethod
+    def from_columns(
+        cls,
+        values: dict[str, Any],
+        pending: dict[str, tuple[Callable[[Any], Any], Any]] | None = None,
+    ) -> LazyPaper:
+        paper = cls.__new__(cls)
+        paper._pending = pending or {}
+        for name, value in values.items():
+            setattr(paper, name, value)
+        return paper
+
+    def __eq__(self, other):
+        if not isinstance(other, Paper):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in PAPER_FIELDS)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        loaded = []
+        for name in PAPER_FIELDS:
+            try:
+                loaded.append(f"{name}={getattr(self, name)!r}")
+            except AttributeError:
+                pass
+        return f"Paper({', '.join(loaded)})"
+
+
+@dataclass
+class SearchHit:
+    paper: Paper
+    score: float
+    snippet: str
+
+
+class PaperPage(list[Paper]):
+    def __init__(self, papers: list[Paper] = (), next_cursor: str | None = None):
+        super().__init__(papers)
+        self.next_cursor = next_cursor
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import re
+from email.utils import parsedate_to_datetime
+from xml.etree.ElementTree import Element, XMLPullParser
+
+from .models import Paper
+
+OAI_NS = "{http://www.openarchives.org/OAI/2.0/}"
+RAW_NS = "{http://arxiv.org/OAI/arXivRaw/}"
+_AUTHOR_SPLIT_RE = re.compile(r"\s*,\s*(?:and\s+)?|\s+and\s+")
+
+
+class OAIError(RuntimeError):
+    def __init__(self, code: str, message: str = ""):
+        super().__init__(f"{code}: {message}" if message else code)
+        self.code = code
+
+
+class ListRecordsParser:
+    def __init__(self):
+        self.resumption_token: str | None = None
+        self.complete_list_size: int | None = None
+        self.error: OAIError | None = None
+        self._parser = XMLPullParser(events=("start", "end"))
+        self._list_records: Element | None = None
+
+    def feed(self, data: bytes) -> list[Paper]:
+        self._parser.feed(data)
+        return self._drain()
+
+    def close(self) -> list[Paper]:
+        self._parser.close()
+        return self._drain()
+
+    def _drain(self) -> list[Paper]:
+        papers = []
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                if elem.tag == f"{OAI_NS}ListRecords":
+                    self._list_records = elem
+                continue
+            if elem.tag == f"{OAI_NS}record":
+                paper = record_to_paper(elem)
+                if paper is not None:
+                    papers.append(paper)
+                if self._list_records is not None:
+                    self._list_records.remove(elem)
+            elif elem.tag == f"{OAI_NS}resumptionToken":
+                self.resumption_token = (elem.text or "").strip() or None
+                size = elem.get("completeListSize")
+                self.complete_list_size = int(size) if size else None
+            elif elem.tag == f"{OAI_NS}error":
+                self.error = OAIError(elem.get("code", "unknown"), (elem.text or "").strip())
+        return papers
+
+
+def record_to_paper(record: Element) -> Paper | None:
+    header = record.find(f"{OAI_NS}header")
+    if header is not None and header.get("status") == "deleted":
+        return None
+    meta = record.find(f"{OAI_NS}metadata/{RAW_NS}arXivRaw")
+    if meta is None:
+        return None
+
+    arxiv_id = _text(meta, "id")
+    versions = meta.findall(f"{RAW_NS}version")
+    version = versions[-1].get("version", "v1") if versions else "v1"
+    published = _raw_date(versions[0]) if versions else ""
+    updated = _raw_date(versions[-1]) if versions else published
+
+    return Paper(
+        arxiv_id=arxiv_id,
+        version=version,
+        title=_text(meta, "title"),
+        authors=[a for a in _AUTHOR_SPLIT_RE.split(_text(meta, "authors")) if a],
+        abstract=_text(meta, "abstract"),
+        categories=_text(meta, "categories").split(),
+        published=published,
+        updated=updated,
+        pdf_url=f"https://arxiv.org/pdf/{arxiv_id}{version}",
+        source_url=f"http://arxiv.org/abs/{arxiv_id}{version}",
+    )
+
+
+def _text(elem: Element, tag: str) -> str:
+    return " ".join((elem.findtext(f"{RAW_NS}{tag}") or "").split())
+
+
+def _raw_date(version: Element) -> str:
+    value = version.findtext(f"{RAW_NS}date")
+    if not value:
+        return ""
+    try:
+        return parsedate_to_datetime(value).strftime("%Y-%m-%dT%H:%M:%SZ")
+    except (TypeError, ValueError):
+        return value
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+import httpx
+
+from .compliance import PRIORITY_BACKGROUND, RateLimiter
+from .models import Paper
+
+PDF_CHUNK_SIZE = 64 * 1024
+DEFAULT_PDF_CONCURRENCY = 4
+PDF_EXTRA_KEY = "pdf"
+_CONTENT_RANGE_RE = re.compile(r"bytes (\d+)-\d+/(\d+|\*)")
+
+
+@dataclass
+class PdfRecord:
+    unique_key: str
+    sha256: str
+    size: int
+    path: str
+
+
+@dataclass
+class PdfDownload:
+    unique_key: str
+    status: str
+    record: PdfRecord | None = None
+    resumed_from: int = 0
+    error: str | None = None
+
+
+def pdf_url(paper: Paper) -> str:
+    return paper.pdf_url or f"https://arxiv.org/pdf/{paper.unique_key}"
+
+
+class PdfStore:
+    # Files live under objects/<sha[:2]>/<sha>.pdf so identical PDFs are
+    # stored once; index.db maps each unique_key to its content hash.
+    # In-progress downloads sit in partial/ and are resumed with Range.
+    def __init__(self, root: str = "pdfs", chunk_size: int = PDF_CHUNK_SIZE):
+        self.root = root
+        self.chunk_size = chunk_size
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+        os.makedirs(os.path.join(root, "partial"), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            os.path.join(root, "index.db"), check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS pdfs (
+                unique_key TEXT PRIMARY KEY,
+                sha256 TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                downloaded_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_pdfs_sha256 ON pdfs(sha256)")
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def object_path(self, sha256: str) -> str:
+        return os.path.join(self.root, "objects", sha256[:2], f"{sha256}.pdf")
+
+    def partial_path(self, unique_key: str) -> str:
+        return os.path.join(self.root, "partial", unique_key.replace("/", "_") + ".part")
+
+    def get(self, unique_key: str) -> PdfRecord | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sha256, size FROM pdfs WHERE unique_key = ?", (unique_key,)
+            ).fetchone()
+        if row is None:
+            return None
+        path = self.object_path(row[0])
+        if not os.path.exists(path):
+            return None
+        return PdfRecord(unique_key, row[0], row[1], path)
+
+    def __contains__(self, unique_key: str) -> bool:
+        return self.get(unique_key) is not None
+
+    def _record(self, unique_key: str, sha256: str, size: int) -> PdfRecord:
+        with self._lock:
+            self._conn.execute("""
+                INSERT INTO pdfs (unique_key, sha256, size, downloaded_at) VALUES (?, ?, ?, ?)
+                ON CONFLICT(unique_key) DO UPDATE SET
+                    sha256 = excluded.sha256, size = excluded.size, downloaded_at = excluded.downloaded_at
+            """, (unique_key, sha256, size, time.time()))
+        return PdfRecord(unique_key, sha256, size, self.object_path(sha256))
+
+    def _commit(self, unique_key: str, partial: str, digest: hashlib._Hash, size: int) -> tuple[str, PdfRecord]:
+        sha256 = digest.hexdigest()
+        target = self.object_path(sha256)
+        if os.path.exists(target):
+            os.remove(partial)
+            status = "duplicate"
+        else:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(partial, target)
+            status = "downloaded"
+        return status, self._record(unique_key, sha256, size)
+
+    async def adownload(
+        self,
+        papers: Iterable[Paper],
+        client: httpx.AsyncClient,
+        rate_limiter: RateLimiter | None = None,
+        concurrency: int = DEFAULT_PDF_CONCURRENCY,
+        on_done: Callable[[Paper, PdfDownload], None] | None = None,
+    ) -> list[PdfDownload]:
+        unique = {paper.unique_key: paper for paper in papers}
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(paper: Paper) -> PdfDownload:
+            record = self.get(paper.unique_key)
+            if record is not None:
+                result = PdfDownload(paper.unique_key, "cached", record)
+            else:
+                async with semaphore:
+                    result = await self._download(paper, client, rate_limiter)
+            if on_done:
+                on_done(paper, result)
+            return result
+
+        return list(await asyncio.gather(*(run(paper) for paper in unique.values())))
+
+    async def _download(
+        self,
+        paper: Paper,
+        client: httpx.AsyncClient,
+        rate_limiter: RateLimiter | None,
+    ) -> PdfDownload:
+        key = paper.unique_key
+        partial = self.partial_path(key)
+        offset = os.path.getsize(partial) if os.path.exists(partial) else 0
+        digest = hashlib.sha256()
+        if offset:
+            with open(partial, "rb") as f:
+                while chunk := f.read(self.chunk_size):
+                    digest.update(chunk)
+
+        if rate_limiter is not None:
+            await rate_limiter.async_wait_if_needed(PRIORITY_BACKGROUND)
+        headers = {"Range": f"bytes={offset}-"} if offset else None
+        try:
+            async with client.stream("GET", pdf_url(paper), headers=headers) as response:
+                if response.status_code == 416 and offset:
+                    status, record = self._commit(key, partial, digest, offset)
+                    return PdfDownload(key, status, record, resumed_from=offset)
+                response.raise_for_status()
+
+                match = _CONTENT_RANGE_RE.match(response.headers.get("Content-Range", ""))
+                if response.status_code != 206 or match is None or int(match.group(1)) != offset:
+                    # The server sent the whole file; start over.
+                    offset = 0
+                    digest = hashlib.sha256()
+                size = offset
+                with open(partial, "ab" if offset else "wb") as f:
+                    async for chunk in response.aiter_bytes():
+                        f.write(chunk)
+                        digest.update(chunk)
+                        size += len(chunk)
+        except (httpx.HTTPError, OSError) as e:
+            return PdfDownload(key, "failed", resumed_from=offset, error=str(e) or type(e).__name__)
+
+        status, record = self._commit(key, partial, digest, size)
+        return PdfDownload(key, status, record, resumed_from=offset)
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import random
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+
+from .adapter import ArxivAdapter
+
+SUBSCRIPTIONS_STATE_KEY = "scheduler:subscriptions"
+DEFAULT_POLL_INTERVAL = 3600.0
+DEFAULT_RETRY_DELAY = 60.0
+DEFAULT_MAX_BACKOFF = 6 * 3600.0
+JOB_HISTORY = 100
+
+
+@dataclass
+class Subscription:
+    category: str
+    interval: float = DEFAULT_POLL_INTERVAL
+    last_run: float | None = None
+    next_run: float = 0.0
+    failures: int = 0
+    last_error: str | None = None
+
+
+@dataclass
+class Job:
+    id: str
+    category: str
+    status: str = "queued"
+    queued_at: float = 0.0
+    started_at: float | None = None
+    finished_at: float | None = None
+    new_papers: int = 0
+    error: str | None = None
+
+
+class IngestionScheduler:
+    def __init__(
+        self,
+        adapter: ArxivAdapter,
+        default_interval: float = DEFAULT_POLL_INTERVAL,
+        jitter: float = 0.1,
+        retry_delay: float = DEFAULT_RETRY_DELAY,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+        workers: int = 1,
+        max_results: int = 100,
+    ):
+        self.adapter = adapter
+        self.default_interval = default_interval
+        self.jitter = jitter
+        self.retry_delay = retry_delay
+        self.max_backoff = max_backoff
+        self.workers = workers
+        self.max_results = max_results
+        self.subscriptions: dict[str, Subscription] = {}
+        self._jobs: dict[str, Job] = {}
+        self._history: deque[str] = deque()
+        self._active: dict[str, Job] = {}
+        self._ids = itertools.count(1)
+        self._queue: asyncio.Queue[Job] | None = None
+        self._wake: asyncio.Event | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        await self._load()
+        self._queue = asyncio.Queue()
+        self._wake = asyncio.Event()
+        for job in self._active.values():
+            self._queue.put_nowait(job)
+        self._tasks = [asyncio.create_task(self._dispatch())]
+        self._tasks += [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for job in self._active.values():
+            if job.status == "queued":
+                job.status = "cancelled"
+        self._active.clear()
+
+    async def subscribe(self, category: str, interval: float | None = None) -> Job:
+        sub = self.subscriptions.get(category)
+        if sub is None:
+            sub = self.subscriptions[category] = Subscription(category)
+        sub.interval = interval or self.default_interval
+        await self._save()
+        return self.trigger(category)
+
+    async def unsubscribe(self, category: str) -> bool:
+        if self.subscriptions.pop(category, None) is None:
+            return False
+        await self._save()
+        return True
+
+    def trigger(self, category: str) -> Job:
+        job = self._active.get(category)
+        if job is not None:
+            return job
+        sub = self.subscriptions[category]
+        sub.next_run = time.time()
+        return self._enqueue(sub)
+
+    def job(self, job_id: str) -> Job | None:
+        return self._jobs.get(job_id)
+
+    def jobs(self) -> list[Job]:
+        return [self._jobs[job_id] for job_id in reversed(self._history)]
+
+    def _enqueue(self, sub: Subscription) -> Job:
+        job = Job(id=str(next(self._ids)), category=sub.category, queued_at=time.time())
+        self._jobs[job.id] = job
+        self._history.append(job.id)
+        while len(self._history) > JOB_HISTORY:
+            self._jobs.pop(self._history.popleft(), None)
+        self._active[sub.category] = job
+        if self._queue is not None:
+            self._queue.put_nowait(job)
+            self._wake.set()
+        return job
+
+    async def _dispatch(self) -> None:
+        while True:
+            now = time.time()
+            delay = None
+            for sub in list(self.subscriptions.values()):
+                if sub.category in self._active:
+                    continue
+                if sub.next_run <= now:
+                    self._enqueue(sub)
+                else:
+                    wait = sub.next_run - now
+                    delay = wait if delay is None else min(delay, wait)
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _work(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        sub = self.subscriptions.get(job.category)
+        if sub is None:
+            job.status = "cancelled"
+            self._active.pop(job.category, None)
+            return
+
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            papers = await self.adapter.asubscribe(
+                job.category, on_new=lambda p: None, max_results=self.max_results
+            )
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            raise
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e) or type(e).__name__
+            sub.failures += 1
+            sub.last_error = job.error
+            delay = min(self.max_backoff, self.retry_delay * 2 ** (sub.failures - 1))
+        else:
+            job.status = "succeeded"
+            job.new_papers = len(papers)
+            sub.failures = 0
+            sub.last_error = None
+            delay = sub.interval
+        finally:
+            job.finished_at = time.time()
+            self._active.pop(job.category, None)
+
+        sub.last_run = job.finished_at
+        sub.next_run = job.finished_at + self._jittered(delay)
+        await self._save()
+        self._wake.set()
+
+    def _jittered(self, delay: float) -> float:
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+    # State goes through the adapter's async storage when it has one, so
+    # it is read and written off the event loop like the ingested papers.
+    async def _load(self) -> None:
+        raw = await self.adapter._astore("get_state", SUBSCRIPTIONS_STATE_KEY)
+        if not raw:
+            return
+        for data in json.loads(raw):
+            sub = Subscription(**data)
+            self.subscriptions.setdefault(sub.category, sub)
+
+    async def _save(self) -> None:
+        data = [asdict(sub) for sub in self.subscriptions.values()]
+        await self.adapter._astore("set_state", SUBSCRIPTIONS_STATE_KEY, json.dumps(data))
@@ -0,0 +1,332 @@
+from __future__ import annotations
+
+import glob
+import heapq
+import itertools
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Iterable, Iterator, TypeVar
+
+from .models import Paper, PaperPage, SearchHit
+from .storage import (
+    ITER_BATCH_SIZE,
+    SAVE_MANY_CHUNK_SIZE,
+    SQLiteBackend,
+    _VectorSearch,
+    _chunked,
+    _entries_page,
+    _normalize_query_sort,
+    _normalize_sort,
+    _projection,
+)
+
+SHARD_FILE_PREFIX = "papers-"
+SHARD_FILE_SUFFIX = ".db"
+STATE_FILE = "state.db"
+DEFAULT_SHARD_WORKERS = 8
+# New-style ids are YYMM.NNNNN; old-style ones are archive/YYMMNNN.
+_SHARD_RE = re.compile(r"^(?:(\d{4})\.|[^/]+/(\d{4}))")
+
+T = TypeVar("T")
+
+
+def shard_for(arxiv_id: str) -> str:
+    match = _SHARD_RE.match(arxiv_id)
+    if match is None:
+        return "misc"
+    return match.group(1) or match.group(2)
+
+
+class ShardedSQLiteBackend(_VectorSearch):
+    # Each YYMM shard is a separate SQLite file with its own write lock, so
+    # writes to different months never wait on each other. Keyset cursors
+    # encode the sort value and unique_key only, which means the same cursor
+    # is valid against every shard and pages can be merged without state.
+    def __init__(self, directory: str, max_workers: int = DEFAULT_SHARD_WORKERS, **sqlite_kwargs):
+        self.directory = directory
+        self.sqlite_kwargs = {"pooled": True, **sqlite_kwargs}
+        os.makedirs(directory, exist_ok=True)
+        self._shards: dict[str, SQLiteBackend] = {}
+        self._shards_lock = threading.Lock()
+        self._vectors_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="shard")
+        self._state = SQLiteBackend(os.path.join(directory, STATE_FILE), **self.sqlite_kwargs)
+        pattern = os.path.join(directory, f"{SHARD_FILE_PREFIX}*{SHARD_FILE_SUFFIX}")
+        for path in sorted(glob.glob(pattern)):
+            name = os.path.basename(path)[len(SHARD_FILE_PREFIX) : -len(SHARD_FILE_SUFFIX)]
+            self._shards[name] = SQLiteBackend(path, **self.sqlite_kwargs)
+
+    @property
+    def shard_names(self) -> list[str]:
+        return sorted(self._shards)
+
+    def _shard_path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{SHARD_FILE_PREFIX}{name}{SHARD_FILE_SUFFIX}")
+
+    def _shard(self, key: str, create: bool = False) -> SQLiteBackend | None:
+        name = shard_for(key)
+        shard = self._shards.get(name)
+        if shard is None and create:
+            with self._shards_lock:
+                shard = self._shards.get(name)
+                if shard is None:
+                    shard = self._shards[name] = SQLiteBackend(self._shard_path(name), **self.sqlite_kwargs)
+        return shard
+
+    def _fan_out(self, fn: Callable[[SQLiteBackend], T]) -> list[T]:
+        shards = list(self._shards.values())
+        if len(shards) <= 1:
+            return [fn(shard) for shard in shards]
+        return list(self._executor.map(fn, shards))
+
+    def _grouped(self, keys: Iterable[str], create: bool = False) -> dict[SQLiteBackend, list[str]]:
+        groups: dict[SQLiteBackend, list[str]] = {}
+        for key in dict.fromkeys(keys):
+            shard = self._shard(key, create)
+            if shard is not None:
+                groups.setdefault(shard, []).append(key)
+        return groups
+
+    def _map_groups(self, groups: dict, fn: Callable) -> list:
+        if len(groups) <= 1:
+            return [fn(shard, items) for shard, items in groups.items()]
+        futures = [self._executor.submit(fn, shard, items) for shard, items in groups.items()]
+        return [future.result() for future in futures]
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        for shard in self._shards.values():
+            shard.close()
+        self._state.close()
+
+    def save(self, paper: Paper) -> None:
+        self._check_embeddings([(paper.unique_key, paper.embedding)])
+        self._shard(paper.arxiv_id, create=True).save(paper)
+        self._update_vectors([paper])
+
+    def save_many(self, papers: Iterable[Paper], chunk_size: int = SAVE_MANY_CHUNK_SIZE) -> int:
+        saved = 0
+        dim = None
+        for chunk in _chunked(papers, chunk_size * DEFAULT_SHARD_WORKERS):
+            dim = self._check_embeddings(((p.unique_key, p.embedding) for p in chunk), dim)
+            groups: dict[SQLiteBackend, list[Paper]] = {}
+            for paper in chunk:
+                groups.setdefault(self._shard(paper.arxiv_id, create=True), []).append(paper)
+            saved += sum(self._map_groups(groups, lambda shard, items: shard.save_many(items, chunk_size)))
+            self._update_vectors(chunk)
+        return saved
+
+    def get(self, unique_key: str, fields: Iterable[str] | None = None) -> Paper | None:
+        shard = self._shard(unique_key)
+        if shard is None:
+            _projection(fields)
+            return None
+        return shard.get(unique_key, fields=fields)
+
+    def delete(self, unique_key: str) -> bool:
+        shard = self._shard(unique_key)
+        if shard is None or not shard.delete(unique_key):
+            return False
+        self._remove_vector(unique_key)
+        return True
+
+    def exists(self, unique_key: str) -> bool:
+        shard = self._shard(unique_key)
+        return shard is not None and shard.exists(unique_key)
+
+    def exists_many(self, unique_keys: Iterable[str]) -> set[str]:
+        results = self._map_groups(self._grouped(unique_keys), lambda shard, keys: shard.exists_many(keys))
+        return set().union(*results)
+
+    def get_many(self, unique_keys: Iterable[str]) -> dict[str, Paper]:
+        papers: dict[str, Paper] = {}
+        for found in self._map_groups(self._grouped(unique_keys), lambda shard, keys: shard.get_many(keys)):
+            papers.update(found)
+        return papers
+
+    def get_versions(self, arxiv_id: str) -> list[Paper]:
+        shard = self._shard(arxiv_id)
+        return shard.get_versions(arxiv_id) if shard is not None else []
+
+    def iter_all(self, batch_size: int = ITER_BATCH_SIZE, start_after: str = "") -> Iterator[Paper]:
+        # Merged so the stream is in global unique_key order, which keeps
+        # start_after checkpoints valid whatever the shard layout.
+        yield from heapq.merge(
+            *(self._shards[name].iter_all(batch_size, start_after) for name in self.shard_names),
+            key=lambda paper: paper.unique_key,
+        )
+
+    def update_many(self, updates: Iterable[tuple[str, dict[str, Any]]]) -> int:
+        updated = 0
+        dim = None
+        for chunk in _chunked(updates, SAVE_MANY_CHUNK_SIZE * DEFAULT_SHARD_WORKERS):
+            dim = self._check_embeddings(
+                ((key, values["embedding"]) for key, values in chunk if "embedding" in values), dim
+            )
+            groups: dict[SQLiteBackend, list] = {}
+            for unique_key, values in chunk:
+                shard = self._shard(unique_key)
+                if shard is not None:
+                    groups.setdefault(shard, []).append((unique_key, values))
+            updated += sum(self._map_groups(groups, lambda shard, items: shard.update_many(items)))
+            self._update_vector_values(
+                (key, values["embedding"]) for key, values in chunk if "embedding" in values
+            )
+        return updated
+
+    def iter_embeddings(self) -> Iterator[tuple[str, list[float]]]:
+        for name in self.shard_names:
+            yield from self._shards[name].iter_embeddings()
+
+    def _merge_entries(
+        self,
+        fetch: Callable,
+        order_dir: str,
+        limit: int,
+        offset: int,
+        fields: Iterable[str] | None,
+    ) -> list[tuple]:
+        if len(self._shards) == 1:
+            return fetch(next(iter(self._shards.values())), limit, offset, fields)
+        # Every shard returns its first offset + limit entries; the global
+        # page is the same window over their sorted merge. Deep offsets only
+        # merge keys and load the winning rows afterwards.
+        window_fields = fields if not offset else ()
+        per_shard = self._fan_out(lambda shard: fetch(shard, offset + limit, 0, window_fields))
+        merged = heapq.merge(
+            *per_shard, key=lambda entry: (entry[0], entry[1]), reverse=order_dir == "desc"
+        )
+        entries = list(itertools.islice(merged, offset, offset + limit))
+        if offset and entries:
+            groups = self._grouped(key for _, key, _ in entries)
+            papers: dict[str, Paper] = {}
+            for shard, keys in groups.items():
+                papers.update((p.unique_key, p) for p in self._project_many(shard, keys, fields))
+            entries = [(value, key, papers[key]) for value, key, _ in entries]
+        return entries
+
+    def _project_many(self, shard: SQLiteBackend, keys: list[str], fields: Iterable[str] | None) -> list[Paper]:
+        if fields is None:
+            return list(shard.get_many(keys).values())
+        return [paper for paper in (shard.get(key, fields=fields) for key in keys) if paper is not None]
+
+    def list(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        sort_by: str = "created_at",
+        order: str = "desc",
+        category: str | None = None,
+        cursor: str | None = None,
+        fields: Iterable[str] | None = None,
+    ) -> PaperPage:
+        _projection(fields)
+        sort_field, order_dir = _normalize_sort(sort_by, order)
+        if cursor:
+            offset = 0
+        entries = self._merge_entries(
+            lambda shard, n, skip, columns: shard._list_entries(
+                sort_field, order_dir, n, skip, category, cursor, columns
+            ),
+            order_dir, limit, offset, fields,
+        )
+        return _entries_page(entries, sort_field, order_dir, limit)
+
+    def query(
+        self,
+        categories: Iterable[str] | None = None,
+        published_from: datetime | str | int | None = None,
+        published_to: datetime | str | int | None = None,
+        author: str | None = None,
+        sort: str = "published",
+        order: str = "desc",
+        limit: int = 100,
+        offset: int = 0,
+        cursor: str | None = None,
+        fields: Iterable[str] | None = None,
+    ) -> PaperPage:
+        _projection(fields)
+        sort_field, order_dir = _normalize_query_sort(sort, order)
+        categories = list(categories or ())
+        if cursor:
+            offset = 0
+        entries = self._merge_entries(
+            lambda shard, n, skip, columns: shard._query_entries(
+                sort_field, order_dir, n, skip, cursor, columns,
+                categories, published_from, published_to, author,
+            ),
+            order_dir, limit, offset, fields,
+        )
+        return _entries_page(entries, f"query:{sort_field}", order_dir, limit)
+
+    def search_local(
+        self,
+        query: str,
+        limit: int = 20,
+        categories: list[str] | None = None,
+        offset: int = 0,
+    ) -> list[SearchHit]:
+        # bm25 statistics are per shard, so cross-shard scores are close to
+        # but not exactly what a single database would report.
+        per_shard = self._fan_out(
+            lambda shard: shard.search_local(query, limit=offset + limit, categories=categories)
+        )
+        merged = heapq.merge(*per_shard, key=lambda hit: -hit.score)
+        return list(itertools.islice(merged, offset, offset + limit))
+
+    def count_local(self, query: str, categories: list[str] | None = None) -> int:
+        return sum(self._fan_out(lambda shard: shard.count_local(query, categories=categories)))
+
+    def count_query(
+        self,
+        categories: Iterable[str] | None = None,
+        published_from: datetime | str | int | None = None,
+        published_to: datetime | str | int | None = None,
+        author: str | None = None,
+    ) -> int:
+        categories = list(categories or ())
+        return sum(self._fan_out(
+            lambda shard: shard.count_query(categories, published_from, published_to, author)
+        ))
+
+    def count(self, category: str | None = None) -> int:
+        return sum(self._fan_out(lambda shard: shard.count(category=category)))
+
+    def get_category_stats(self) -> dict[str, int]:
+        totals: dict[str, int] = {}
+        for stats in self._fan_out(lambda shard: shard.get_category_stats()):
+            for category, count in stats.items():
+                totals[category] = totals.get(category, 0) + count
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+    def get_stats(self) -> dict:
+        per_shard = self._fan_out(lambda shard: (shard.count(), shard.get_category_stats()))
+        totals: dict[str, int] = {}
+        for _, stats in per_shard:
+            for category, count in stats.items():
+                totals[category] = totals.get(category, 0) + count
+        db_size = sum(
+            os.path.getsize(shard.db_path) for shard in self._shards.values() if os.path.exists(shard.db_path)
+        )
+        return {
+            "total_papers": sum(count for count, _ in per_shard),
+            "db_size_bytes": db_size,
+            "db_size_mb": round(db_size / (1024 * 1024), 2),
+            "categories": dict(heapq.nlargest(10, totals.items(), key=lambda x: x[1])),
+            "shards": len(per_shard),
+        }
+
+    def get_change_state(self) -> tuple[int, int]:
+        states = self._fan_out(lambda shard: shard.get_change_state())
+        if not states:
+            return self._state.get_change_state()
+        return sum(counter for counter, _ in states), max(modified for _, modified in states)
+
+    def get_state(self, key: str) -> str | None:
+        return self._state.get_state(key)
+
+    def set_state(self, key: str, value: str) -> None:
+        self._state.set_state(key, value)
@@ -1,33 +1,384 @@
 from __future__ import annotations
 
+import base64
+import bisect
+import heapq
+import itertools
 import sqlite3
 import json
+import math
+import re
+import threading
+import time
+import weakref
+from collections import Counter
+from contextlib import contextmanager
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Protocol
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, Iterable, Iterator, Protocol, Sequence
 
-from .models import Paper
+import numpy as np
+
+from .models import PAPER_FIELDS, LazyPaper, Paper, PaperPage, SearchHit
+from .vectors import EMBEDDING_DTYPE, VectorIndex, decode_embedding, encode_embedding
+
+SAVE_MANY_CHUNK_SIZE = 500
+LOOKUP_CHUNK_SIZE = 500
+ITER_BATCH_SIZE = 1000
+BULK_SORT_THRESHOLD = 64
+SCHEMA_VERSION = 4
+
+SNIPPET_TOKENS = 24
+SNIPPET_OPEN = "<mark>"
+SNIPPET_CLOSE = "</mark>"
+# bm25 column weights for (title, abstract, authors)
+SEARCH_WEIGHTS = (10.0, 1.0, 5.0)
+
+_TOKEN_RE = re.compile(r"\w+")
+_DATE_ONLY_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+SORT_FIELDS = ("created_at", "title", "published", "updated", "arxiv_id")
+_SORT_EXPRESSIONS = {
+    "created_at": "IFNULL(created_at, '')",
+    "title": "title",
+    "published": "IFNULL(published, '')",
+    "updated": "IFNULL(updated, '')",
+    "arxiv_id": "arxiv_id",
+}
+# Missing or unparseable dates are stored as NULL and sort as -1, below
+# every real timestamp, so keyset cursors always compare integers.
+QUERY_SORT_FIELDS = ("published", "updated")
+_TIMESTAMP_EXPRESSIONS = {
+    "published": "IFNULL(published_ts, -1)",
+    "updated": "IFNULL(updated_ts, -1)",
+}
+_NO_TIMESTAMP = -1
+_MAX_TIMESTAMP = 2**62
+
+
+def _chunked(items: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def to_epoch(value: datetime | str | int | float | None) -> int | None:
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.strip())
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def _stored_epoch(value: datetime | str | None) -> int | None:
+    try:
+        return to_epoch(value)
+    except ValueError:
+        return None
+
+
+def _epoch_range(date_from, date_to) -> tuple[int, int] | None:
+    if date_from in (None, "") and date_to in (None, ""):
+        return None
+    low = to_epoch(date_from)
+    high = to_epoch(date_to)
+    # A bare date as the upper bound means "through the end of that day".
+    if isinstance(date_to, str) and _DATE_ONLY_RE.match(date_to.strip()):
+        high += 86400 - 1
+    return (0 if low is None else low, _MAX_TIMESTAMP if high is None else high)
+
+
+def _author_phrase(author: str | None) -> list[str]:
+    return _tokenize(author) if author else []
+
+
+def _contains_phrase(authors: list[str], tokens: list[str]) -> bool:
+    haystack = _author_phrase(" ".join(authors))
+    n = len(tokens)
+    return any(haystack[i : i + n] == tokens for i in range(len(haystack) - n + 1))
+
+
+def _projection(fields: Iterable[str] | None) -> str:
+    if fields is None:
+        return "*"
+    fields = list(fields)
+    unknown = set(fields) - set(PAPER_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return ", ".join(dict.fromkeys(("unique_key", "arxiv_id", "version", *fields)))
+
+
+def _decode_embedding_column(value: bytes | str) -> list[float]:
+    if isinstance(value, str):
+        return json.loads(value)
+    return decode_embedding(value)
+
+
+UPDATABLE_FIELDS = ("keywords", "summary", "embedding", "extra")
+_UPDATE_ENCODERS = {
+    "keywords": lambda v: json.dumps(v) if v else None,
+    "summary": lambda v: v,
+    "embedding": lambda v: encode_embedding(v) if v is not None and len(v) else None,
+    "extra": lambda v: json.dumps(v) if v else None,
+}
+
+
+def _update_groups(updates: Iterable[tuple[str, dict[str, Any]]]) -> dict[tuple[str, ...], list]:
+    groups: dict[tuple[str, ...], list] = {}
+    for unique_key, values in updates:
+        names = tuple(sorted(values))
+        unknown = set(names) - set(UPDATABLE_FIELDS)
+        if unknown:
+            raise ValueError(f"Fields cannot be updated: {', '.join(sorted(unknown))}")
+        groups.setdefault(names, []).append((unique_key, values))
+    return groups
+
+
+_PAPER_COLUMNS = frozenset(PAPER_FIELDS)
+_LAZY_COLUMNS = {
+    "keywords": json.loads,
+    "embedding": _decode_embedding_column,
+    "extra": json.loads,
+}
+
+
+def _normalize_sort(sort_by: str, order: str) -> tuple[str, str]:
+    sort_field = sort_by if sort_by in SORT_FIELDS else "created_at"
+    order_dir = order if order in ("asc", "desc") else "desc"
+    return sort_field, order_dir
+
+
+def _normalize_query_sort(sort: str, order: str) -> tuple[str, str]:
+    if sort not in QUERY_SORT_FIELDS:
+        raise ValueError(f"sort must be one of: {', '.join(QUERY_SORT_FIELDS)}")
+    return sort, order if order in ("asc", "desc") else "desc"
+
+
+def encode_cursor(sort_by: str, order: str, value, unique_key: str) -> str:
+    payload = json.dumps([sort_by, order, value, unique_key], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _entries_page(entries: list[tuple], cursor_sort: str, order: str, limit: int) -> PaperPage:
+    next_cursor = None
+    if entries and len(entries) == limit:
+        value, unique_key, _ = entries[-1]
+        next_cursor = encode_cursor(cursor_sort, order, value, unique_key)
+    return PaperPage([paper for _, _, paper in entries], next_cursor)
+
+
+def decode_cursor(cursor: str, sort_by: str, order: str) -> tuple:
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_sort, cursor_order, value, unique_key = json.loads(payload)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if (cursor_sort, cursor_order) != (sort_by, order):
+        raise ValueError("Cursor does not match sort_by/order")
+    return value, unique_key
 
 
 class StorageBackend(Protocol):
     def save(self, paper: Paper) -> None: ...
-    def get(self, unique_key: str) -> Paper | None: ...
-    def list(self, limit: int = 100, offset: int = 0, sort_by: str = "created_at", order: str = "desc") -> list[Paper]: ...
+    def save_many(self, papers: Iterable[Paper]) -> int: ...
+    def get(self, unique_key: str, fields: Iterable[str] | None = None) -> Paper | None: ...
+    def iter_all(self, batch_size: int = ITER_BATCH_SIZE, start_after: str = "") -> Iterator[Paper]: ...
+    def update_many(self, updates: Iterable[tuple[str, dict[str, Any]]]) -> int: ...
+    def list(self, limit: int = 100, offset: int = 0, sort_by: str = "created_at", order: str = "desc", category: str | None = None, cursor: str | None = None, fields: Iterable[str] | None = None) -> PaperPage: ...
+    def query(self, categories: Iterable[str] | None = None, published_from: datetime | str | int | None = None, published_to: datetime | str | int | None = None, author: str | None = None, sort: str = "published", order: str = "desc", limit: int = 100, offset: int = 0, cursor: str | None = None, fields: Iterable[str] | None = None) -> PaperPage: ...
     def delete(self, unique_key: str) -> bool: ...
     def exists(self, unique_key: str) -> bool: ...
+    def exists_many(self, unique_keys: Iterable[str]) -> set[str]: ...
+    def get_many(self, unique_keys: Iterable[str]) -> dict[str, Paper]: ...
     def get_versions(self, arxiv_id: str) -> list[Paper]: ...
-    def count(self) -> int: ...
+    def count(self, category: str | None = None) -> int: ...
     def get_stats(self) -> dict: ...
     def get_category_stats(self) -> dict[str, int]: ...
+    def search_local(self, query: str, limit: int = 20, categories: list[str] | None = None, offset: int = 0) -> list[SearchHit]: ...
+    def count_local(self, query: str, categories: list[str] | None = None) -> int: ...
+    def count_query(self, categories: Iterable[str] | None = None, published_from: datetime | str | int | None = None, published_to: datetime | str | int | None = None, author: str | None = None) -> int: ...
+    def iter_embeddings(self) -> Iterator[tuple[str, Sequence[float]]]: ...
+    def similar(self, unique_key: str, k: int = 10) -> list[SearchHit]: ...
+    def search_by_vector(self, embedding: Sequence[float], k: int = 10) -> list[SearchHit]: ...
+    def get_change_state(self) -> tuple[int, int]: ...
+    def get_state(self, key: str) -> str | None: ...
+    def set_state(self, key: str, value: str) -> None: ...
+    def close(self) -> None: ...
+
+
+class _VectorSearch:
+    _vectors: VectorIndex | None = None
+    _vectors_lock: threading.Lock
+
+    def _vector_index(self) -> VectorIndex:
+        if self._vectors is None:
+            with self._vectors_lock:
+                if self._vectors is None:
+                    index = VectorIndex()
+                    index.add_many(self.iter_embeddings(), skip_mismatched=True)
+                    self._vectors = index
+        return self._vectors
+
+    def _embedding_dim(self) -> int | None:
+        if self._vectors is not None:
+            return self._vectors.dim if len(self._vectors) else None
+        for _, embedding in self.iter_embeddings():
+            return len(embedding)
+        return None
+
+    def _check_embeddings(self, embeddings: Iterable[tuple[str, Any]], dim: int | None = None) -> int | None:
+        # Runs before a write so a mismatched vector rejects the whole batch
+        # instead of leaving a row the index cannot load.
+        for unique_key, embedding in embeddings:
+            if embedding is None or not len(embedding):
+                continue
+            if dim is None:
+                dim = self._embedding_dim() or len(embedding)
+            if len(embedding) != dim:
+                raise ValueError(f"expected {dim}-dim vectors, got {len(embedding)} for {unique_key}")
+        return dim
 
+    def _update_vectors(self, papers: Iterable[Paper]) -> None:
+        if self._vectors is None:
+            return
+        for paper in papers:
+            if paper.embedding:
+                self._vectors.add(paper.unique_key, paper.embedding)
+            else:
+                self._vectors.remove(paper.unique_key)
 
-class SQLiteBackend:
-    def __init__(self, db_path: str):
+    def _update_vector_values(self, embeddings: Iterable[tuple[str, Any]]) -> None:
+        if self._vectors is None:
+            return
+        for unique_key, embedding in embeddings:
+            if embedding is not None and len(embedding):
+                self._vectors.add(unique_key, embedding)
+            else:
+                self._vectors.remove(unique_key)
+
+    def _remove_vector(self, unique_key: str) -> None:
+        if self._vectors is not None:
+            self._vectors.remove(unique_key)
+
+    def similar(self, unique_key: str, k: int = 10) -> list[SearchHit]:
+        index = self._vector_index()
+        embedding = index.get(unique_key)
+        if embedding is None:
+            return []
+        return self._vector_hits(index.search(embedding, k, exclude={unique_key}))
+
+    def search_by_vector(self, embedding: Sequence[float], k: int = 10) -> list[SearchHit]:
+        return self._vector_hits(self._vector_index().search(embedding, k))
+
+    def _vector_hits(self, matches: list[tuple[str, float]]) -> list[SearchHit]:
+        papers = self.get_many(key for key, _ in matches)
+        return [
+            SearchHit(paper=papers[key], score=score, snippet="")
+            for key, score in matches
+            if key in papers
+        ]
+
+
+class _PooledConnection:
+    __slots__ = ("conn", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+
+def _release_connection(pool: set, lock: threading.Lock, conn: sqlite3.Connection) -> None:
+    with lock:
+        pool.discard(conn)
+    conn.close()
+
+
+class SQLiteBackend(_VectorSearch):
+    def __init__(
+        self,
+        db_path: str,
+        pooled: bool = False,
+        journal_mode: str = "WAL",
+        synchronous: str = "NORMAL",
+        cache_size: int = -64000,
+        cached_statements: int = 256,
+    ):
         self.db_path = db_path
+        self.pooled = pooled
+        self.journal_mode = journal_mode
+        self.synchronous = synchronous
+        self.cache_size = cache_size
+        self.cached_statements = cached_statements
+        self._local = threading.local()
+        self._pool: set[sqlite3.Connection] = set()
+        self._pool_lock = threading.Lock()
+        self._vectors_lock = threading.Lock()
         self._init_db()
 
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+        conn.row_factory = sqlite3.Row
+        if self.pooled:
+            conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+            conn.execute(f"PRAGMA cache_size = {int(self.cache_size)}")
+        return conn
+
+    def _pooled_connection(self) -> sqlite3.Connection:
+        pooled = getattr(self._local, "pooled", None)
+        if pooled is None:
+            conn = self._open()
+            # The wrapper only lives in this thread's locals, so it is
+            # collected when the thread exits and the connection is closed
+            # with it instead of lingering until close().
+            pooled = self._local.pooled = _PooledConnection(conn)
+            weakref.finalize(pooled, _release_connection, self._pool, self._pool_lock, conn)
+            with self._pool_lock:
+                self._pool.add(conn)
+        return pooled.conn
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        if self.pooled:
+            conn = self._pooled_connection()
+            with conn:
+                yield conn
+            return
+        conn = self._open()
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @property
+    def open_connections(self) -> int:
+        with self._pool_lock:
+            return len(self._pool)
+
+    def close(self) -> None:
+        with self._pool_lock:
+            pool = list(self._pool)
+            self._pool.clear()
+        for conn in pool:
+            conn.close()
+        self._local = threading.local()
+
     def _init_db(self) -> None:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
+            if self.pooled:
+                conn.execute(f"PRAGMA journal_mode = {self.journal_mode}")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS papers (
                     unique_key TEXT PRIMARY KEY,
@@ -43,123 +394,598 @@ class SQLiteBackend:
                     source_url TEXT,
                     keywords TEXT,
                     summary TEXT,
-                    embedding TEXT,
+                    embedding BLOB,
                     extra TEXT,
-                    created_at TEXT DEFAULT CURRENT_TIMESTAMP
+                    created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+                    published_ts INTEGER,
+                    updated_ts INTEGER
                 )
             """)
+            self._add_timestamp_columns(conn)
             conn.execute("""
                 CREATE INDEX IF NOT EXISTS idx_arxiv_id ON papers(arxiv_id)
             """)
+            for field, expression in _SORT_EXPRESSIONS.items():
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_papers_sort_{field} ON papers({expression}, unique_key)"
+                )
+            for field, expression in _TIMESTAMP_EXPRESSIONS.items():
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_papers_{field}_ts ON papers({expression}, unique_key)"
+                )
+            self._init_categories(conn)
+            self._init_fts(conn)
+            self._init_change_tracking(conn)
+            
+            schema_version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if schema_version < 1:
+                self._migrate_categories(conn)
+            if schema_version < 2:
+                conn.execute("INSERT INTO papers_fts(papers_fts) VALUES ('rebuild')")
+            if schema_version < 3:
+                self._migrate_embeddings(conn)
+            if schema_version < 4:
+                self._migrate_timestamps(conn)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _init_categories(self, conn: sqlite3.Connection) -> None:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS paper_categories (
+                unique_key TEXT NOT NULL,
+                category TEXT NOT NULL,
+                PRIMARY KEY (unique_key, category)
+            ) WITHOUT ROWID
+        """)
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_paper_categories_category
+            ON paper_categories(category, unique_key)
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS category_counts (
+                category TEXT PRIMARY KEY,
+                count INTEGER NOT NULL
+            )
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_papers_categories_insert
+            AFTER INSERT ON papers BEGIN
+                DELETE FROM paper_categories WHERE unique_key = NEW.unique_key;
+                INSERT INTO paper_categories (unique_key, category)
+                SELECT DISTINCT NEW.unique_key, value FROM json_each(NEW.categories);
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_papers_categories_update
+            AFTER UPDATE OF categories ON papers BEGIN
+                DELETE FROM paper_categories WHERE unique_key = OLD.unique_key;
+                INSERT INTO paper_categories (unique_key, category)
+                SELECT DISTINCT NEW.unique_key, value FROM json_each(NEW.categories);
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_papers_categories_delete
+            AFTER DELETE ON papers BEGIN
+                DELETE FROM paper_categories WHERE unique_key = OLD.unique_key;
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_category_counts_insert
+            AFTER INSERT ON paper_categories BEGIN
+                INSERT INTO category_counts (category, count) VALUES (NEW.category, 1)
+                ON CONFLICT(category) DO UPDATE SET count = count + 1;
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_category_counts_delete
+            AFTER DELETE ON paper_categories BEGIN
+                UPDATE category_counts SET count = count - 1 WHERE category = OLD.category;
+                DELETE FROM category_counts WHERE category = OLD.category AND count <= 0;
+            END
+        """)
+
+    def _init_change_tracking(self, conn: sqlite3.Connection) -> None:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS sync_state (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS storage_meta (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                change_counter INTEGER NOT NULL,
+                last_modified INTEGER NOT NULL
+            )
+        """)
+        conn.execute("""
+            INSERT OR IGNORE INTO storage_meta (id, change_counter, last_modified)
+            VALUES (1, 0, CAST(strftime('%s', 'now') AS INTEGER))
+        """)
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_papers_change_{event.lower()}
+                AFTER {event} ON papers BEGIN
+                    UPDATE storage_meta
+                    SET change_counter = change_counter + 1,
+                        last_modified = CAST(strftime('%s', 'now') AS INTEGER)
+                    WHERE id = 1;
+                END
+            """)
+
+    def _init_fts(self, conn: sqlite3.Connection) -> None:
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+                title, abstract, authors,
+                content='papers', content_rowid='rowid',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_papers_fts_insert
+            AFTER INSERT ON papers BEGIN
+                INSERT INTO papers_fts (rowid, title, abstract, authors)
+                VALUES (NEW.rowid, NEW.title, NEW.abstract, NEW.authors);
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_papers_fts_delete
+            AFTER DELETE ON papers BEGIN
+                INSERT INTO papers_fts (papers_fts, rowid, title, abstract, authors)
+                VALUES ('delete', OLD.rowid, OLD.title, OLD.abstract, OLD.authors);
+            END
+        """)
+        conn.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_papers_fts_update
+            AFTER UPDATE OF title, abstract, authors ON papers BEGIN
+                INSERT INTO papers_fts (papers_fts, rowid, title, abstract, authors)
+                VALUES ('delete', OLD.rowid, OLD.title, OLD.abstract, OLD.authors);
+                INSERT INTO papers_fts (rowid, title, abstract, authors)
+                VALUES (NEW.rowid, NEW.title, NEW.abstract, NEW.authors);
+            END
+        """)
+
+    def _migrate_embeddings(self, conn: sqlite3.Connection) -> None:
+        rows = conn.execute(
+            "SELECT unique_key, embedding FROM papers WHERE typeof(embedding) = 'text'"
+        ).fetchall()
+        for chunk in _chunked(rows, SAVE_MANY_CHUNK_SIZE):
+            conn.executemany(
+                "UPDATE papers SET embedding = ? WHERE unique_key = ?",
+                [(encode_embedding(json.loads(row["embedding"])), row["unique_key"]) for row in chunk],
+            )
+
+    def _add_timestamp_columns(self, conn: sqlite3.Connection) -> None:
+        columns = {row["name"] for row in conn.execute("PRAGMA table_info(papers)")}
+        for name in ("published_ts", "updated_ts"):
+            if name not in columns:
+                conn.execute(f"ALTER TABLE papers ADD COLUMN {name} INTEGER")
+
+    def _migrate_timestamps(self, conn: sqlite3.Connection) -> None:
+        rows = conn.execute("SELECT unique_key, published, updated FROM papers").fetchall()
+        for chunk in _chunked(rows, SAVE_MANY_CHUNK_SIZE):
+            conn.executemany(
+                "UPDATE papers SET published_ts = ?, updated_ts = ? WHERE unique_key = ?",
+                [
+                    (_stored_epoch(row["published"]), _stored_epoch(row["updated"]), row["unique_key"])
+                    for row in chunk
+                ],
+            )
+
+    def _migrate_categories(self, conn: sqlite3.Connection) -> None:
+        conn.execute("DELETE FROM paper_categories")
+        conn.execute("DELETE FROM category_counts")
+        conn.execute("""
+            INSERT INTO paper_categories (unique_key, category)
+            SELECT DISTINCT p.unique_key, c.value
+            FROM papers p, json_each(p.categories) c
+        """)
+
+    _INSERT_SQL = """
+        INSERT INTO papers 
+        (unique_key, arxiv_id, version, title, authors, abstract, 
+         categories, published, updated, pdf_url, source_url, 
+         keywords, summary, embedding, extra, published_ts, updated_ts)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(unique_key) DO UPDATE SET
+            arxiv_id = excluded.arxiv_id,
+            version = excluded.version,
+            title = excluded.title,
+            authors = excluded.authors,
+            abstract = excluded.abstract,
+            categories = excluded.categories,
+            published = excluded.published,
+            updated = excluded.updated,
+            pdf_url = excluded.pdf_url,
+            source_url = excluded.source_url,
+            keywords = excluded.keywords,
+            summary = excluded.summary,
+            embedding = excluded.embedding,
+            extra = excluded.extra,
+            published_ts = excluded.published_ts,
+            updated_ts = excluded.updated_ts,
+            created_at = excluded.created_at
+    """
 
     def save(self, paper: Paper) -> None:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                INSERT OR REPLACE INTO papers 
-                (unique_key, arxiv_id, version, title, authors, abstract, 
-                 categories, published, updated, pdf_url, source_url, 
-                 keywords, summary, embedding, extra)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                paper.unique_key,
-                paper.arxiv_id,
-                paper.version,
-                paper.title,
-                json.dumps(paper.authors),
-                paper.abstract,
-                json.dumps(paper.categories),
-                self._serialize_datetime(paper.published),
-                self._serialize_datetime(paper.updated),
-                paper.pdf_url,
-                paper.source_url,
-                json.dumps(paper.keywords) if paper.keywords else None,
-                paper.summary,
-                json.dumps(paper.embedding) if paper.embedding else None,
-                json.dumps(paper.extra) if paper.extra else None,
-            ))
-
-    def get(self, unique_key: str) -> Paper | None:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        self._check_embeddings([(paper.unique_key, paper.embedding)])
+        with self._connect() as conn:
+            conn.execute(self._INSERT_SQL, self._paper_to_row(paper))
+        self._update_vectors([paper])
+
+    def save_many(self, papers: Iterable[Paper], chunk_size: int = SAVE_MANY_CHUNK_SIZE) -> int:
+        saved = 0
+        written: list[Paper] = []
+        dim = None
+        with self._connect() as conn:
+            for chunk in _chunked(papers, chunk_size):
+                dim = self._check_embeddings(((p.unique_key, p.embedding) for p in chunk), dim)
+                conn.executemany(self._INSERT_SQL, [self._paper_to_row(p) for p in chunk])
+                if self._vectors is not None:
+                    written.extend(chunk)
+                saved += len(chunk)
+        self._update_vectors(written)
+        return saved
+
+    def update_many(self, updates: Iterable[tuple[str, dict[str, Any]]]) -> int:
+        updated = 0
+        embeddings: list[tuple[str, Any]] = []
+        groups = _update_groups(updates)
+        self._check_embeddings(
+            (key, values["embedding"]) for names, items in groups.items() if "embedding" in names
+            for key, values in items
+        )
+        with self._connect() as conn:
+            for names, items in groups.items():
+                assignments = ", ".join(f"{name} = ?" for name in names)
+                cursor = conn.executemany(
+                    f"UPDATE papers SET {assignments} WHERE unique_key = ?",
+                    [(*(_UPDATE_ENCODERS[n](values[n]) for n in names), key) for key, values in items],
+                )
+                updated += cursor.rowcount
+                if "embedding" in names and self._vectors is not None:
+                    embeddings.extend((key, values["embedding"]) for key, values in items)
+        self._update_vector_values(embeddings)
+        return updated
+
+    def iter_all(self, batch_size: int = ITER_BATCH_SIZE, start_after: str = "") -> Iterator[Paper]:
+        # Keyset batches keep memory flat and avoid holding a read
+        # transaction (or a thread's pooled connection) across yields.
+        last_key = start_after
+        while True:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    "SELECT * FROM papers WHERE unique_key > ? ORDER BY unique_key LIMIT ?",
+                    (last_key, batch_size),
+                ).fetchall()
+            yield from (self._row_to_paper(row) for row in rows)
+            if len(rows) < batch_size:
+                return
+            last_key = rows[-1]["unique_key"]
+
+    def iter_embeddings(self) -> Iterator[tuple[str, np.ndarray]]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT unique_key, embedding FROM papers WHERE embedding IS NOT NULL ORDER BY rowid"
+            )
+            for row in rows:
+                yield row["unique_key"], np.frombuffer(row["embedding"], dtype=EMBEDDING_DTYPE)
+
+    def _paper_to_row(self, paper: Paper) -> tuple:
+        return (
+            paper.unique_key,
+            paper.arxiv_id,
+            paper.version,
+            paper.title,
+            json.dumps(paper.authors),
+            paper.abstract,
+            json.dumps(paper.categories),
+            self._serialize_datetime(paper.published),
+            self._serialize_datetime(paper.updated),
+            paper.pdf_url,
+            paper.source_url,
+            json.dumps(paper.keywords) if paper.keywords else None,
+            paper.summary,
+            encode_embedding(paper.embedding) if paper.embedding else None,
+            json.dumps(paper.extra) if paper.extra else None,
+            _stored_epoch(paper.published),
+            _stored_epoch(paper.updated),
+        )
+
+    def get(self, unique_key: str, fields: Iterable[str] | None = None) -> Paper | None:
+        with self._connect() as conn:
             row = conn.execute(
-                "SELECT * FROM papers WHERE unique_key = ?", (unique_key,)
+                f"SELECT {_projection(fields)} FROM papers WHERE unique_key = ?", (unique_key,)
             ).fetchone()
             if row:
                 return self._row_to_paper(row)
             return None
 
-    def list(self, limit: int = 100, offset: int = 0, sort_by: str = "created_at", order: str = "desc") -> list[Paper]:
-        valid_sort_fields = {"created_at", "title", "published", "updated", "arxiv_id"}
-        valid_orders = {"asc", "desc"}
-        
-        sort_field = sort_by if sort_by in valid_sort_fields else "created_at"
-        order_dir = order.upper() if order in valid_orders else "DESC"
+    def list(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        sort_by: str = "created_at",
+        order: str = "desc",
+        category: str | None = None,
+        cursor: str | None = None,
+        fields: Iterable[str] | None = None,
+    ) -> PaperPage:
+        sort_field, order_dir = _normalize_sort(sort_by, order)
+        entries = self._list_entries(sort_field, order_dir, limit, offset, category, cursor, fields)
+        return _entries_page(entries, sort_field, order_dir, limit)
+
+    def _list_entries(
+        self,
+        sort_field: str,
+        order_dir: str,
+        limit: int,
+        offset: int,
+        category: str | None,
+        cursor: str | None,
+        fields: Iterable[str] | None,
+    ) -> list[tuple]:
+        conditions = []
+        params: list = []
+        if category:
+            conditions.append("unique_key IN (SELECT unique_key FROM paper_categories WHERE category = ?)")
+            params.append(category)
+        return self._keyset_entries(
+            _SORT_EXPRESSIONS[sort_field], sort_field, order_dir,
+            conditions, params, limit, offset, cursor, fields,
+        )
+
+    def query(
+        self,
+        categories: Iterable[str] | None = None,
+        published_from: datetime | str | int | None = None,
+        published_to: datetime | str | int | None = None,
+        author: str | None = None,
+        sort: str = "published",
+        order: str = "desc",
+        limit: int = 100,
+        offset: int = 0,
+        cursor: str | None = None,
+        fields: Iterable[str] | None = None,
+    ) -> PaperPage:
+        sort_field, order_dir = _normalize_query_sort(sort, order)
+        entries = self._query_entries(
+            sort_field, order_dir, limit, offset, cursor, fields,
+            categories, published_from, published_to, author,
+        )
+        return _entries_page(entries, f"query:{sort_field}", order_dir, limit)
+
+    def _query_entries(
+        self,
+        sort_field: str,
+        order_dir: str,
+        limit: int,
+        offset: int,
+        cursor: str | None,
+        fields: Iterable[str] | None,
+        categories: Iterable[str] | None,
+        published_from: datetime | str | int | None,
+        published_to: datetime | str | int | None,
+        author: str | None,
+    ) -> list[tuple]:
+        conditions, params = self._query_where(categories, published_from, published_to, author)
+        return self._keyset_entries(
+            _TIMESTAMP_EXPRESSIONS[sort_field], f"query:{sort_field}", order_dir,
+            conditions, params, limit, offset, cursor, fields,
+        )
+
+    def count_query(
+        self,
+        categories: Iterable[str] | None = None,
+        published_from: datetime | str | int | None = None,
+        published_to: datetime | str | int | None = None,
+        author: str | None = None,
+    ) -> int:
+        conditions, params = self._query_where(categories, published_from, published_to, author)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._connect() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM papers {where}", params).fetchone()[0]
+
+    def _query_where(
+        self,
+        categories: Iterable[str] | None,
+        published_from: datetime | str | int | None,
+        published_to: datetime | str | int | None,
+        author: str | None,
+    ) -> tuple[list[str], list]:
+        conditions = []
+        params: list = []
+        categories = list(dict.fromkeys(categories or ()))
+        if categories:
+            placeholders = ", ".join("?" * len(categories))
+            conditions.append(
+                f"unique_key IN (SELECT unique_key FROM paper_categories WHERE category IN ({placeholders}))"
+            )
+            params.extend(categories)
+        published = _epoch_range(published_from, published_to)
+        if published:
+            conditions.append(f"{_TIMESTAMP_EXPRESSIONS['published']} BETWEEN ? AND ?")
+            params.extend(published)
+        tokens = _author_phrase(author)
+        if tokens:
+            conditions.append("rowid IN (SELECT rowid FROM papers_fts WHERE papers_fts MATCH ?)")
+            params.append(f'authors : "{" ".join(tokens)}"')
+        return conditions, params
+
+    def _keyset_entries(
+        self,
+        expression: str,
+        cursor_sort: str,
+        order_dir: str,
+        conditions: list[str],
+        params: list,
+        limit: int,
+        offset: int,
+        cursor: str | None,
+        fields: Iterable[str] | None,
+    ) -> list[tuple]:
+        columns = _projection(fields)
+        if cursor:
+            value, unique_key = decode_cursor(cursor, cursor_sort, order_dir)
+            op = "<" if order_dir == "desc" else ">"
+            conditions.append(f"{expression} {op}= ? AND ({expression} {op} ? OR unique_key {op} ?)")
+            params.extend([value, value, unique_key])
+            offset = 0
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        params.extend([limit, offset])
         
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            query = f"SELECT * FROM papers ORDER BY {sort_field} {order_dir} LIMIT ? OFFSET ?"
-            rows = conn.execute(query, (limit, offset)).fetchall()
-            return [self._row_to_paper(row) for row in rows]
+        with self._connect() as conn:
+            rows = conn.execute(f"""
+                SELECT {columns}, {expression} AS sort_value FROM papers {where}
+                ORDER BY {expression} {order_dir.upper()}, unique_key {order_dir.upper()}
+                LIMIT ? OFFSET ?
+            """, params).fetchall()
+        return [(row["sort_value"], row["unique_key"], self._row_to_paper(row)) for row in rows]
 
-    def count(self) -> int:
-        with sqlite3.connect(self.db_path) as conn:
-            row = conn.execute("SELECT COUNT(*) FROM papers").fetchone()
+    def count(self, category: str | None = None) -> int:
+        with self._connect() as conn:
+            if category:
+                row = conn.execute(
+                    "SELECT count FROM category_counts WHERE category = ?", (category,)
+                ).fetchone()
+            else:
+                row = conn.execute("SELECT COUNT(*) FROM papers").fetchone()
             return row[0] if row else 0
 
+    def get_change_state(self) -> tuple[int, int]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT change_counter, last_modified FROM storage_meta WHERE id = 1"
+            ).fetchone()
+            return row[0], row[1]
+
+    def get_state(self, key: str) -> str | None:
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+            return row[0] if row else None
+
+    def set_state(self, key: str, value: str) -> None:
+        with self._connect() as conn:
+            conn.execute("""
+                INSERT INTO sync_state (key, value) VALUES (?, ?)
+                ON CONFLICT(key) DO UPDATE SET value = excluded.value, updated_at = CURRENT_TIMESTAMP
+            """, (key, value))
+
     def get_stats(self) -> dict:
         import os
         db_size = 0
         if os.path.exists(self.db_path):
             db_size = os.path.getsize(self.db_path)
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             total = conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
-            categories_row = conn.execute("SELECT categories FROM papers").fetchall()
-            
-            category_counts: dict[str, int] = {}
-            for (cats_json,) in categories_row:
-                if cats_json:
-                    cats = json.loads(cats_json)
-                    for cat in cats:
-                        category_counts[cat] = category_counts.get(cat, 0) + 1
+            top_categories = conn.execute(
+                "SELECT category, count FROM category_counts ORDER BY count DESC LIMIT 10"
+            ).fetchall()
             
             return {
                 "total_papers": total,
                 "db_size_bytes": db_size,
                 "db_size_mb": round(db_size / (1024 * 1024), 2),
-                "categories": dict(sorted(category_counts.items(), key=lambda x: x[1], reverse=True)[:10]),
+                "categories": {row["category"]: row["count"] for row in top_categories},
             }
 
     def get_category_stats(self) -> dict[str, int]:
-        with sqlite3.connect(self.db_path) as conn:
-            categories_row = conn.execute("SELECT categories FROM papers").fetchall()
-            
-            category_counts: dict[str, int] = {}
-            for (cats_json,) in categories_row:
-                if cats_json:
-                    cats = json.loads(cats_json)
-                    for cat in cats:
-                        category_counts[cat] = category_counts.get(cat, 0) + 1
-            
-            return category_counts
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT category, count FROM category_counts ORDER BY count DESC"
+            ).fetchall()
+            return {row["category"]: row["count"] for row in rows}
+
+    def search_local(
+        self,
+        query: str,
+        limit: int = 20,
+        categories: list[str] | None = None,
+        offset: int = 0,
+    ) -> list[SearchHit]:
+        tokens = _tokenize(query)
+        if not tokens:
+            return []
+        
+        weights = ", ".join(str(w) for w in SEARCH_WEIGHTS)
+        where, params = self._search_where(tokens, categories)
+        params.extend([limit, offset])
+        
+        with self._connect() as conn:
+            rows = conn.execute(f"""
+                SELECT papers.*,
+                       bm25(papers_fts, {weights}) AS score,
+                       snippet(papers_fts, -1, ?, ?, '…', {SNIPPET_TOKENS}) AS snippet
+                FROM papers_fts JOIN papers ON papers.rowid = papers_fts.rowid
+                WHERE {where}
+                ORDER BY score
+                LIMIT ? OFFSET ?
+            """, [SNIPPET_OPEN, SNIPPET_CLOSE, *params]).fetchall()
+            return [
+                SearchHit(paper=self._row_to_paper(row), score=-row["score"], snippet=row["snippet"])
+                for row in rows
+            ]
+
+    def count_local(self, query: str, categories: list[str] | None = None) -> int:
+        tokens = _tokenize(query)
+        if not tokens:
+            return 0
+        where, params = self._search_where(tokens, categories)
+        with self._connect() as conn:
+            return conn.execute(f"""
+                SELECT COUNT(*) FROM papers_fts JOIN papers ON papers.rowid = papers_fts.rowid
+                WHERE {where}
+            """, params).fetchone()[0]
+
+    def _search_where(self, tokens: list[str], categories: list[str] | None) -> tuple[str, list]:
+        where = "papers_fts MATCH ?"
+        params: list = [" ".join(f'"{token}"' for token in tokens)]
+        if categories:
+            placeholders = ", ".join("?" for _ in categories)
+            where += f" AND papers.unique_key IN (SELECT unique_key FROM paper_categories WHERE category IN ({placeholders}))"
+            params.extend(categories)
+        return where, params
 
     def delete(self, unique_key: str) -> bool:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             cursor = conn.execute(
                 "DELETE FROM papers WHERE unique_key = ?", (unique_key,)
             )
-            return cursor.rowcount > 0
+        self._remove_vector(unique_key)
+        return cursor.rowcount > 0
 
     def exists(self, unique_key: str) -> bool:
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connect() as conn:
             row = conn.execute(
                 "SELECT 1 FROM papers WHERE unique_key = ?", (unique_key,)
             ).fetchone()
             return row is not None
 
+    def exists_many(self, unique_keys: Iterable[str], chunk_size: int = LOOKUP_CHUNK_SIZE) -> set[str]:
+        found: set[str] = set()
+        with self._connect() as conn:
+            for chunk in _chunked(dict.fromkeys(unique_keys), chunk_size):
+                placeholders = ", ".join("?" for _ in chunk)
+                rows = conn.execute(
+                    f"SELECT unique_key FROM papers WHERE unique_key IN ({placeholders})", chunk
+                )
+                found.update(row[0] for row in rows)
+        return found
+
+    def get_many(self, unique_keys: Iterable[str], chunk_size: int = LOOKUP_CHUNK_SIZE) -> dict[str, Paper]:
+        papers: dict[str, Paper] = {}
+        with self._connect() as conn:
+            for chunk in _chunked(dict.fromkeys(unique_keys), chunk_size):
+                placeholders = ", ".join("?" for _ in chunk)
+                rows = conn.execute(
+                    f"SELECT * FROM papers WHERE unique_key IN ({placeholders})", chunk
+                )
+                papers.update((row["unique_key"], self._row_to_paper(row)) for row in rows)
+        return papers
+
     def get_versions(self, arxiv_id: str) -> list[Paper]:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._connect() as conn:
             rows = conn.execute(
                 "SELECT * FROM papers WHERE arxiv_id = ? ORDER BY version",
                 (arxiv_id,),
@@ -174,78 +1000,468 @@ class SQLiteBackend:
         return dt.isoformat()
 
     def _row_to_paper(self, row: sqlite3.Row) -> Paper:
-        return Paper(
-            arxiv_id=row["arxiv_id"],
-            version=row["version"],
-            title=row["title"],
-            authors=json.loads(row["authors"]),
-            abstract=row["abstract"] or "",
-            categories=json.loads(row["categories"]),
-            published=row["published"],
-            updated=row["updated"],
-            pdf_url=row["pdf_url"] or "",
-            source_url=row["source_url"] or "",
-            keywords=json.loads(row["keywords"]) if row["keywords"] else None,
-            summary=row["summary"],
-            embedding=json.loads(row["embedding"]) if row["embedding"] else None,
-            extra=json.loads(row["extra"]) if row["extra"] else {},
-        )
+        values = {}
+        pending = {}
+        for name in row.keys():
+            if name not in _PAPER_COLUMNS:
+                continue
+            raw = row[name]
+            if name in _LAZY_COLUMNS:
+                if raw:
+                    pending[name] = (_LAZY_COLUMNS[name], raw)
+                else:
+                    values[name] = {} if name == "extra" else None
+            elif name in ("authors", "categories"):
+                values[name] = json.loads(raw)
+            elif name in ("abstract", "pdf_url", "source_url"):
+                values[name] = raw or ""
+            else:
+                values[name] = raw
+        return LazyPaper.from_columns(values, pending)
+
+
+@dataclass(frozen=True)
+class _IndexedEntry:
+    arxiv_id: str
+    sort_values: dict[str, Any]
+    categories: frozenset[str]
+    author_tokens: frozenset[str]
 
 
-class MemoryBackend:
+class MemoryBackend(_VectorSearch):
     def __init__(self):
         self._papers: dict[str, Paper] = {}
+        self._vectors_lock = threading.Lock()
+        self._created_at: dict[str, int] = {}
+        self._sequence = itertools.count()
+        self._versions: dict[str, set[str]] = {}
+        self._sort_indexes: dict[str, list[tuple]] = {
+            field: [] for field in (*SORT_FIELDS, *(f"{f}_ts" for f in QUERY_SORT_FIELDS))
+        }
+        self._category_keys: dict[str, set[str]] = {}
+        self._author_keys: dict[str, set[str]] = {}
+        self._category_counts: dict[str, int] = {}
+        # What each key was indexed under, so removal does not depend on a
+        # Paper the caller may have mutated since it was saved.
+        self._indexed: dict[str, _IndexedEntry] = {}
+        self._change_counter = 0
+        self._last_modified = int(time.time())
+        self._state: dict[str, str] = {}
+        self._postings: dict[str, dict[str, float]] = {}
+        self._doc_terms: dict[str, dict[str, float]] = {}
+        self._doc_len: dict[str, int] = {}
+        self._total_len = 0
+
+    def close(self) -> None:
+        pass
 
     def save(self, paper: Paper) -> None:
-        self._papers[paper.unique_key] = paper
+        self._check_embeddings([(paper.unique_key, paper.embedding)])
+        self._insert(paper)
+        self._update_vectors([paper])
+        self._touch()
+
+    def save_many(self, papers: Iterable[Paper], chunk_size: int = SAVE_MANY_CHUNK_SIZE) -> int:
+        saved = 0
+        pending: dict[str, Paper] = {}
+        for chunk in _chunked(papers, chunk_size):
+            pending.update((p.unique_key, p) for p in chunk)
+            saved += len(chunk)
+        
+        # Appending and re-sorting once lets timsort merge the new run into
+        # the sorted indexes, instead of one O(n) insort per paper. Old
+        # entries go first, while bisect can still find them.
+        self._check_embeddings((key, p.embedding) for key, p in pending.items())
+        bulk = len(pending) > BULK_SORT_THRESHOLD
+        for key in pending:
+            self._remove(key)
+        for paper in pending.values():
+            self._insert(paper, defer_sort=bulk)
+        if bulk:
+            for index in self._sort_indexes.values():
+                index.sort()
+        
+        self._update_vectors(pending.values())
+        self._touch(saved)
+        return saved
 
-    def get(self, unique_key: str) -> Paper | None:
+    def update_many(self, updates: Iterable[tuple[str, dict[str, Any]]]) -> int:
+        updated = 0
+        embeddings: list[tuple[str, Any]] = []
+        groups = _update_groups(updates)
+        self._check_embeddings(
+            (key, values["embedding"]) for names, items in groups.items() if "embedding" in names
+            for key, values in items
+        )
+        for names, items in groups.items():
+            for unique_key, values in items:
+                paper = self._papers.get(unique_key)
+                if paper is None:
+                    continue
+                for name in names:
+                    setattr(paper, name, values[name])
+                if "embedding" in names:
+                    embeddings.append((unique_key, values["embedding"]))
+                updated += 1
+        self._update_vector_values(embeddings)
+        if updated:
+            self._touch(updated)
+        return updated
+
+    def _insert(self, paper: Paper, defer_sort: bool = False) -> None:
+        key = paper.unique_key
+        self._remove(key)
+        
+        self._papers[key] = paper
+        self._created_at[key] = next(self._sequence)
+        indexed = self._indexed[key] = _IndexedEntry(
+            arxiv_id=paper.arxiv_id,
+            sort_values={field: self._sort_value(paper, field) for field in self._sort_indexes},
+            categories=frozenset(paper.categories),
+            author_tokens=frozenset(_author_phrase(" ".join(paper.authors))),
+        )
+        self._versions.setdefault(indexed.arxiv_id, set()).add(key)
+        for category in indexed.categories:
+            self._category_keys.setdefault(category, set()).add(key)
+            self._category_counts[category] = self._category_counts.get(category, 0) + 1
+        for token in indexed.author_tokens:
+            self._author_keys.setdefault(token, set()).add(key)
+        for field, index in self._sort_indexes.items():
+            entry = (indexed.sort_values[field], key)
+            if defer_sort:
+                index.append(entry)
+            else:
+                bisect.insort(index, entry)
+        self._index_paper(paper)
+
+    def _remove(self, unique_key: str) -> Paper | None:
+        paper = self._papers.pop(unique_key, None)
+        if paper is None:
+            return None
+        indexed = self._indexed.pop(unique_key)
+        
+        for field, index in self._sort_indexes.items():
+            entry = (indexed.sort_values[field], unique_key)
+            i = bisect.bisect_left(index, entry)
+            if i < len(index) and index[i] == entry:
+                del index[i]
+        del self._created_at[unique_key]
+        
+        versions = self._versions.get(indexed.arxiv_id, set())
+        versions.discard(unique_key)
+        if not versions:
+            self._versions.pop(indexed.arxiv_id, None)
+        for category in indexed.categories:
+            keys = self._category_keys.get(category)
+            if keys is None or unique_key not in keys:
+                continue
+            keys.discard(unique_key)
+            self._category_counts[category] -= 1
+            if not keys:
+                del self._category_keys[category]
+                del self._category_counts[category]
+        for token in indexed.author_tokens:
+            keys = self._author_keys.get(token)
+            if keys is None:
+                continue
+            keys.discard(unique_key)
+            if not keys:
+                del self._author_keys[token]
+        self._unindex_paper(unique_key)
+        return paper
+
+    def _touch(self, changes: int = 1) -> None:
+        self._change_counter += changes
+        self._last_modified = int(time.time())
+
+    def get_change_state(self) -> tuple[int, int]:
+        return self._change_counter, self._last_modified
+
+    def get_state(self, key: str) -> str | None:
+        return self._state.get(key)
+
+    def set_state(self, key: str, value: str) -> None:
+        self._state[key] = value
+
+    def _index_paper(self, paper: Paper) -> None:
+        key = paper.unique_key
+        self._unindex_paper(key)
+        
+        terms: dict[str, float] = {}
+        length = 0
+        fields = (paper.title, paper.abstract, " ".join(paper.authors))
+        for text, weight in zip(fields, SEARCH_WEIGHTS):
+            tokens = _tokenize(text or "")
+            length += len(tokens)
+            for token, n in Counter(tokens).items():
+                terms[token] = terms.get(token, 0.0) + n * weight
+        
+        self._doc_terms[key] = terms
+        self._doc_len[key] = length
+        self._total_len += length
+        for token, tf in terms.items():
+            self._postings.setdefault(token, {})[key] = tf
+
+    def _unindex_paper(self, unique_key: str) -> None:
+        terms = self._doc_terms.pop(unique_key, None)
+        if terms is None:
+            return
+        self._total_len -= self._doc_len.pop(unique_key)
+        for token in terms:
+            postings = self._postings[token]
+            del postings[unique_key]
+            if not postings:
+                del self._postings[token]
+
+    def search_local(
+        self,
+        query: str,
+        limit: int = 20,
+        categories: list[str] | None = None,
+        offset: int = 0,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ) -> list[SearchHit]:
+        tokens = list(dict.fromkeys(_tokenize(query)))
+        postings = [self._postings.get(token) for token in tokens]
+        candidates = self._search_candidates(postings, categories)
+        if not candidates:
+            return []
+        
+        n = len(self._papers)
+        avg_len = self._total_len / n or 1.0
+        idf = [math.log((n - len(p) + 0.5) / (len(p) + 0.5) + 1) for p in postings]
+        
+        scored = []
+        for key in candidates:
+            norm = k1 * (1 - b + b * self._doc_len[key] / avg_len)
+            score = sum(w * p[key] * (k1 + 1) / (p[key] + norm) for w, p in zip(idf, postings))
+            scored.append((score, key))
+        scored.sort(key=lambda x: (-x[0], x[1]))
+        
+        return [
+            SearchHit(paper=self._papers[key], score=score, snippet=self._snippet(self._papers[key], tokens))
+            for score, key in scored[offset : offset + limit]
+        ]
+
+    def count_local(self, query: str, categories: list[str] | None = None) -> int:
+        postings = [self._postings.get(token) for token in dict.fromkeys(_tokenize(query))]
+        return len(self._search_candidates(postings, categories))
+
+    def _search_candidates(self, postings: list, categories: list[str] | None) -> set[str]:
+        if not postings or not all(postings):
+            return set()
+        candidates = set.intersection(*(set(p) for p in sorted(postings, key=len)))
+        if categories:
+            candidates &= set().union(*(self._category_keys.get(c, ()) for c in categories))
+        return candidates
+
+    def _snippet(self, paper: Paper, tokens: list[str]) -> str:
+        terms = set(tokens)
+        for text in (paper.abstract, paper.title):
+            words = (text or "").split()
+            hits = [i for i, w in enumerate(words) if terms.intersection(_tokenize(w))]
+            if not hits:
+                continue
+            start = max(0, min(hits[0] - SNIPPET_TOKENS // 4, len(words) - SNIPPET_TOKENS))
+            window = words[start : start + SNIPPET_TOKENS]
+            marked = [
+                f"{SNIPPET_OPEN}{w}{SNIPPET_CLOSE}" if terms.intersection(_tokenize(w)) else w
+                for w in window
+            ]
+            prefix = "…" if start > 0 else ""
+            suffix = "…" if start + SNIPPET_TOKENS < len(words) else ""
+            return prefix + " ".join(marked) + suffix
+        return ""
+
+    def get(self, unique_key: str, fields: Iterable[str] | None = None) -> Paper | None:
+        _projection(fields)
         return self._papers.get(unique_key)
 
-    def list(self, limit: int = 100, offset: int = 0, sort_by: str = "created_at", order: str = "desc") -> list[Paper]:
-        papers = list(self._papers.values())
-        reverse = order == "desc"
+    def iter_all(self, batch_size: int = ITER_BATCH_SIZE, start_after: str = "") -> Iterator[Paper]:
+        for key in sorted(k for k in self._papers if k > start_after):
+            paper = self._papers.get(key)
+            if paper is not None:
+                yield paper
+
+    def iter_embeddings(self) -> Iterator[tuple[str, list[float]]]:
+        for key, paper in list(self._papers.items()):
+            if paper.embedding:
+                yield key, paper.embedding
+
+    def list(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        sort_by: str = "created_at",
+        order: str = "desc",
+        category: str | None = None,
+        cursor: str | None = None,
+        fields: Iterable[str] | None = None,
+    ) -> PaperPage:
+        # Papers are held decoded, so a projection is only validated here.
+        _projection(fields)
+        sort_field, order_dir = _normalize_sort(sort_by, order)
+        descending = order_dir == "desc"
+        
+        entries = self._sort_indexes[sort_field]
+        members = None
+        if category:
+            members = self._category_keys.get(category, set())
+            # Sorting a small category beats walking the whole index.
+            if len(members) * 16 < len(entries):
+                entries = sorted((self._indexed[k].sort_values[sort_field], k) for k in members)
+                members = None
         
-        if sort_by == "title":
-            papers.sort(key=lambda p: p.title, reverse=reverse)
-        elif sort_by == "arxiv_id":
-            papers.sort(key=lambda p: p.arxiv_id, reverse=reverse)
+        if cursor:
+            value, unique_key = decode_cursor(cursor, sort_field, order_dir)
+            if descending:
+                positions = range(bisect.bisect_left(entries, (value, unique_key)) - 1, -1, -1)
+            else:
+                positions = range(bisect.bisect_right(entries, (value, unique_key)), len(entries))
+            offset = 0
         else:
-            papers.sort(key=lambda p: p.arxiv_id, reverse=reverse)
+            positions = range(len(entries) - 1, -1, -1) if descending else range(len(entries))
         
-        return papers[offset : offset + limit]
+        if members is None:
+            page = [entries[i] for i in positions[offset : offset + limit]]
+        else:
+            matching = (entries[i] for i in positions if entries[i][1] in members)
+            page = list(itertools.islice(matching, offset, offset + limit))
+        
+        next_cursor = None
+        if page and len(page) == limit:
+            next_cursor = encode_cursor(sort_field, order_dir, page[-1][0], page[-1][1])
+        return PaperPage([self._papers[key] for _, key in page], next_cursor)
+
+    def query(
+        self,
+        categories: Iterable[str] | None = None,
+        published_from: datetime | str | int | None = None,
+        published_to: datetime | str | int | None = None,
+        author: str | None = None,
+        sort: str = "published",
+        order: str = "desc",
+        limit: int = 100,
+        offset: int = 0,
+        cursor: str | None = None,
+        fields: Iterable[str] | None = None,
+    ) -> PaperPage:
+        _projection(fields)
+        sort_field, order_dir = _normalize_query_sort(sort, order)
+        descending = order_dir == "desc"
+        entries = self._sort_indexes[f"{sort_field}_ts"]
+        members = self._query_members(categories, author)
+        
+        low, high = _NO_TIMESTAMP, _MAX_TIMESTAMP
+        published = _epoch_range(published_from, published_to)
+        if published and sort_field == "published":
+            low, high = published
+        elif published:
+            in_range = self._published_keys(published)
+            members = in_range if members is None else members & in_range
+        
+        if members is not None and len(members) * 16 < len(entries):
+            entries = sorted((self._indexed[k].sort_values[f"{sort_field}_ts"], k) for k in members)
+            members = None
+        
+        start = bisect.bisect_left(entries, (low,))
+        stop = bisect.bisect_left(entries, (high + 1,))
+        if cursor:
+            value, unique_key = decode_cursor(cursor, f"query:{sort_field}", order_dir)
+            if descending:
+                stop = min(stop, bisect.bisect_left(entries, (value, unique_key)))
+            else:
+                start = max(start, bisect.bisect_right(entries, (value, unique_key)))
+            offset = 0
+        positions = range(stop - 1, start - 1, -1) if descending else range(start, stop)
+        
+        if members is None:
+            page = [entries[i] for i in positions[offset : offset + limit]]
+        else:
+            matching = (entries[i] for i in positions if entries[i][1] in members)
+            page = list(itertools.islice(matching, offset, offset + limit))
+        
+        next_cursor = None
+        if page and len(page) == limit:
+            next_cursor = encode_cursor(f"query:{sort_field}", order_dir, page[-1][0], page[-1][1])
+        return PaperPage([self._papers[key] for _, key in page], next_cursor)
+
+    def count_query(
+        self,
+        categories: Iterable[str] | None = None,
+        published_from: datetime | str | int | None = None,
+        published_to: datetime | str | int | None = None,
+        author: str | None = None,
+    ) -> int:
+        members = self._query_members(categories, author)
+        published = _epoch_range(published_from, published_to)
+        if published:
+            in_range = self._published_keys(published)
+            members = in_range if members is None else members & in_range
+        return len(self._papers) if members is None else len(members)
+
+    def _query_members(self, categories: Iterable[str] | None, author: str | None) -> set[str] | None:
+        members: set[str] | None = None
+        if categories:
+            members = set().union(*(self._category_keys.get(c, ()) for c in categories))
+        tokens = _author_phrase(author)
+        if tokens:
+            matching = set.intersection(*(self._author_keys.get(t, set()) for t in tokens))
+            matching = {k for k in matching if _contains_phrase(self._papers[k].authors, tokens)}
+            members = matching if members is None else members & matching
+        return members
+
+    def _published_keys(self, published: tuple[int, int]) -> set[str]:
+        by_date = self._sort_indexes["published_ts"]
+        in_range = by_date[
+            bisect.bisect_left(by_date, (published[0],)) : bisect.bisect_left(by_date, (published[1] + 1,))
+        ]
+        return {key for _, key in in_range}
+
+    def _sort_value(self, paper: Paper, sort_field: str):
+        if sort_field == "created_at":
+            return self._created_at[paper.unique_key]
+        if sort_field.endswith("_ts"):
+            value = _stored_epoch(getattr(paper, sort_field[:-3]))
+            return _NO_TIMESTAMP if value is None else value
+        value = getattr(paper, sort_field)
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return value or ""
 
     def delete(self, unique_key: str) -> bool:
-        if unique_key in self._papers:
-            del self._papers[unique_key]
-            return True
-        return False
+        if self._remove(unique_key) is None:
+            return False
+        self._remove_vector(unique_key)
+        self._touch()
+        return True
 
     def exists(self, unique_key: str) -> bool:
         return unique_key in self._papers
 
+    def exists_many(self, unique_keys: Iterable[str]) -> set[str]:
+        return self._papers.keys() & set(unique_keys)
+
+    def get_many(self, unique_keys: Iterable[str]) -> dict[str, Paper]:
+        return {key: self._papers[key] for key in self._papers.keys() & set(unique_keys)}
+
     def get_versions(self, arxiv_id: str) -> list[Paper]:
-        return [p for p in self._papers.values() if p.arxiv_id == arxiv_id]
+        keys = self._versions.get(arxiv_id, ())
+        return sorted((self._papers[k] for k in keys), key=lambda p: p.version)
 
-    def count(self) -> int:
+    def count(self, category: str | None = None) -> int:
+        if category:
+            return self._category_counts.get(category, 0)
         return len(self._papers)
 
     def get_stats(self) -> dict:
-        category_counts: dict[str, int] = {}
-        for paper in self._papers.values():
-            for cat in paper.categories:
-                category_counts[cat] = category_counts.get(cat, 0) + 1
-        
         return {
             "total_papers": len(self._papers),
             "db_size_bytes": 0,
             "db_size_mb": 0,
-            "categories": dict(sorted(category_counts.items(), key=lambda x: x[1], reverse=True)[:10]),
+            "categories": dict(heapq.nlargest(10, self._category_counts.items(), key=lambda x: x[1])),
         }
 
     def get_category_stats(self) -> dict[str, int]:
-        category_counts: dict[str, int] = {}
-        for paper in self._papers.values():
-            for cat in paper.categories:
-                category_counts[cat] = category_counts.get(cat, 0) + 1
-        return category_counts
+        return dict(self._category_counts)
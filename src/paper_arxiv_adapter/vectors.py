@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import threading
+from typing import Iterable, Sequence
+
+import numpy as np
+
+EMBEDDING_DTYPE = np.dtype("<f4")
+
+
+def encode_embedding(embedding: Sequence[float]) -> bytes:
+    return np.asarray(embedding, dtype=EMBEDDING_DTYPE).tobytes()
+
+
+def decode_embedding(blob: bytes) -> list[float]:
+    return np.frombuffer(blob, dtype=EMBEDDING_DTYPE).tolist()
+
+
+class VectorIndex:
+    def __init__(self, initial_capacity: int = 1024):
+        self._matrix: np.ndarray | None = None
+        self._keys: list[str] = []
+        self._rows: dict[str, int] = {}
+        self._initial_capacity = initial_capacity
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, unique_key: str) -> bool:
+        return unique_key in self._rows
+
+    @property
+    def dim(self) -> int | None:
+        return None if self._matrix is None else self._matrix.shape[1]
+
+    def add(self, unique_key: str, embedding: Sequence[float] | np.ndarray) -> None:
+        vector = self._normalize(np.asarray(embedding, dtype=np.float32))
+        with self._lock:
+            self._add(unique_key, vector)
+
+    def add_many(
+        self,
+        items: Iterable[tuple[str, Sequence[float] | np.ndarray]],
+        skip_mismatched: bool = False,
+    ) -> int:
+        # With skip_mismatched, vectors whose dimension differs from the
+        # index are left out instead of raising; returns how many were.
+        skipped = 0
+        with self._lock:
+            for unique_key, embedding in items:
+                vector = self._normalize(np.asarray(embedding, dtype=np.float32))
+                if skip_mismatched and self._keys and vector.shape[0] != self._matrix.shape[1]:
+                    skipped += 1
+                    continue
+                self._add(unique_key, vector)
+        return skipped
+
+    def remove(self, unique_key: str) -> None:
+        with self._lock:
+            row = self._rows.pop(unique_key, None)
+            if row is None:
+                return
+            last = len(self._keys) - 1
+            if row != last:
+                moved = self._keys[last]
+                self._matrix[row] = self._matrix[last]
+                self._keys[row] = moved
+                self._rows[moved] = row
+            self._keys.pop()
+
+    def get(self, unique_key: str) -> np.ndarray | None:
+        with self._lock:
+            row = self._rows.get(unique_key)
+            return None if row is None else self._matrix[row].copy()
+
+    def search(
+        self,
+        embedding: Sequence[float] | np.ndarray,
+        k: int = 10,
+        exclude: set[str] | None = None,
+    ) -> list[tuple[str, float]]:
+        return self.search_batch(np.asarray([embedding], dtype=np.float32), k, exclude)[0]
+
+    def search_batch(
+        self,
+        embeddings: np.ndarray,
+        k: int = 10,
+        exclude: set[str] | None = None,
+    ) -> list[list[tuple[str, float]]]:
+        queries = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+        with self._lock:
+            n = len(self._keys)
+            if n == 0 or k <= 0:
+                return [[] for _ in queries]
+            if queries.shape[1] != self._matrix.shape[1]:
+                raise ValueError(f"expected {self._matrix.shape[1]}-dim vectors, got {queries.shape[1]}")
+            
+            norms = np.linalg.norm(queries, axis=1, keepdims=True)
+            queries = queries / np.where(norms == 0, 1, norms)
+            scores = queries @ self._matrix[:n].T
+            
+            excluded_rows = [self._rows[key] for key in exclude or () if key in self._rows]
+            if excluded_rows:
+                scores[:, excluded_rows] = -np.inf
+            
+            top = min(k, n - len(excluded_rows))
+            if top <= 0:
+                return [[] for _ in queries]
+            candidates = np.argpartition(-scores, top - 1, axis=1)[:, :top]
+            results = []
+            for row_scores, row_candidates in zip(scores, candidates):
+                order = row_candidates[np.argsort(-row_scores[row_candidates], kind="stable")]
+                results.append([(self._keys[i], float(row_scores[i])) for i in order])
+            return results
+
+    def _add(self, unique_key: str, vector: np.ndarray) -> None:
+        if self._matrix is None or not self._keys:
+            self._matrix = np.empty((self._initial_capacity, vector.shape[0]), dtype=np.float32)
+        if vector.shape[0] != self._matrix.shape[1]:
+            raise ValueError(
+                f"expected {self._matrix.shape[1]}-dim vectors, got {vector.shape[0]} for {unique_key}"
+            )
+        
+        row = self._rows.get(unique_key)
+        if row is None:
+            row = len(self._keys)
+            if row == self._matrix.shape[0]:
+                grown = np.empty((row * 2, self._matrix.shape[1]), dtype=np.float32)
+                grown[:row] = self._matrix[:row]
+                self._matrix = grown
+            self._keys.append(unique_key)
+            self._rows[unique_key] = row
+        self._matrix[row] = vector
+
+    @staticmethod
+    def _normalize(vector: np.ndarray) -> np.ndarray:
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
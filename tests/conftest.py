@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from datetime import datetime
+from pathlib import Path
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+import pytest
+
+from paper_arxiv_adapter.models import Paper
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def _make_paper(arxiv_id: str, version: str = "v1", **kwargs) -> Paper:
+    fields = dict(
+        arxiv_id=arxiv_id,
+        version=version,
+        title=f"Paper {arxiv_id}",
+        authors=["Author"],
+        abstract="Abstract",
+        categories=["cs.AI"],
+        published=datetime(2023, 1, 17),
+        updated=datetime(2023, 1, 17),
+        pdf_url=f"https://arxiv.org/pdf/{arxiv_id}{version}",
+        source_url=f"https://arxiv.org/abs/{arxiv_id}{version}",
+    )
+    fields.update(kwargs)
+    return Paper(**fields)
+
+
+@pytest.fixture
+def make_paper():
+    return _make_paper
+
+
+@dataclass
+class FakeEntry:
+    arxiv_id: str
+    version: str = "v1"
+    title: str = ""
+    authors: list[str] = field(default_factory=lambda: ["Author"])
+    abstract: str = "Abstract"
+    categories: list[str] = field(default_factory=lambda: ["cs.AI"])
+    published: str = "2023-01-17T00:00:00Z"
+    updated: str = "2023-01-17T00:00:00Z"
+
+    def to_xml(self) -> str:
+        key = f"{self.arxiv_id}{self.version}"
+        authors = "".join(f"<author><name>{escape(a)}</name></author>" for a in self.authors)
+        cats = "".join(
+            f'<category term="{c}" scheme="http://arxiv.org/schemas/atom"/>' for c in self.categories
+        )
+        return f"""<entry>
+<id>http://arxiv.org/abs/{key}</id>
+<updated>{self.updated}</updated>
+<published>{self.published}</published>
+<title>{escape(self.title or f"Paper {self.arxiv_id}")}</title>
+<summary>{escape(self.abstract)}</summary>
+{authors}
+<link href="http://arxiv.org/abs/{key}" rel="alternate" type="text/html"/>
+<link title="pdf" href="http://arxiv.org/pdf/{key}" rel="related" type="application/pdf"/>
+<arxiv:primary_category xmlns:arxiv="http://arxiv.org/schemas/atom" term="{self.categories[0]}" scheme="http://arxiv.org/schemas/atom"/>
+{cats}
+</entry>"""
+
+
+def render_feed(entries: list[FakeEntry], total: int, start: int = 0) -> str:
+    body = "\n".join(e.to_xml() for e in entries)
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/" xmlns:arxiv="http://arxiv.org/schemas/atom">
+<title>ArXiv Query</title>
+<id>http://arxiv.org/api/fake</id>
+<updated>2023-01-20T00:00:00Z</updated>
+<opensearch:totalResults>{total}</opensearch:totalResults>
+<opensearch:startIndex>{start}</opensearch:startIndex>
+<opensearch:itemsPerPage>{len(entries)}</opensearch:itemsPerPage>
+{body}
+</feed>"""
+
+
+@pytest.fixture
+def atom_feed():
+    def build(*entries: dict) -> bytes:
+        return render_feed([FakeEntry(**entry) for entry in entries], total=len(entries)).encode()
+
+    return build
+
+
+class FakeArxivServer:
+    def __init__(self):
+        self.entries: list[FakeEntry] = []
+        self.requests: list[dict[str, str]] = []
+        self.raw_body: bytes | None = None
+        self.etags = False
+        self.not_modified = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/api/query"
+
+    def add(self, arxiv_id: str, **kwargs) -> FakeEntry:
+        entry = FakeEntry(arxiv_id=arxiv_id, **kwargs)
+        self.entries.append(entry)
+        return entry
+
+    def query(self, params: dict[str, str]) -> str:
+        entries = sorted(self.entries, key=lambda e: e.published, reverse=True)
+        if params.get("id_list"):
+            wanted = set(params["id_list"].split(","))
+            entries = [e for e in entries if e.arxiv_id in wanted or f"{e.arxiv_id}{e.version}" in wanted]
+        elif params.get("search_query", "").startswith("cat:"):
+            category = params["search_query"][4:]
+            entries = [e for e in entries if category in e.categories]
+        start = int(params.get("start", 0))
+        max_results = int(params.get("max_results", 10))
+        return render_feed(entries[start : start + max_results], len(entries), start)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+                server.requests.append(params)
+                body = server.raw_body if server.raw_body is not None else server.query(params).encode()
+                etag = f'"{hashlib.sha1(body).hexdigest()}"'
+                if server.etags and self.headers.get("If-None-Match") == etag:
+                    server.not_modified += 1
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/atom+xml")
+                if server.etags:
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def arxiv_server():
+    server = FakeArxivServer()
+    server.start()
+    yield server
+    server.stop()
+
+
+class FakeOAIServer:
+    def __init__(self):
+        self.pages: dict[str, bytes] = {}
+        self.failures: dict[str, int] = {}
+        self.requests: list[dict[str, str]] = []
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/oai"
+
+    def serve(self, key: str, fixture: str) -> None:
+        self.pages[key] = (FIXTURES / "oai" / fixture).read_bytes()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+                server.requests.append(params)
+                key = params.get("resumptionToken") or f"set:{params.get('set', '')}"
+                if server.failures.get(key):
+                    server.failures[key] -= 1
+                    self.send_response(500)
+                    self.end_headers()
+                    return
+                body = server.pages[key]
+                self.send_response(200)
+                self.send_header("Content-Type", "text/xml")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                for i in range(0, len(body), 256):
+                    self.wfile.write(body[i : i + 256])
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def oai_server():
+    server = FakeOAIServer()
+    server.start()
+    yield server
+    server.stop()
+
+
+class FakePdfServer:
+    def __init__(self):
+        self.files: dict[str, bytes] = {}
+        self.truncate: dict[str, int] = {}
+        self.requests: list[tuple[str, str | None]] = []
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def url(self, name: str) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/pdf/{name}"
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                name = urlparse(self.path).path.rsplit("/", 1)[-1]
+                range_header = self.headers.get("Range")
+                server.requests.append((name, range_header))
+                body = server.files[name]
+                start = int(range_header[6:].split("-")[0]) if range_header else 0
+                if start >= len(body):
+                    self.send_response(416)
+                    self.send_header("Content-Range", f"bytes */{len(body)}")
+                    self.end_headers()
+                    return
+                self.send_response(206 if range_header else 200)
+                if range_header:
+                    self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+                self.send_header("Content-Type", "application/pdf")
+                self.send_header("Content-Length", str(len(body) - start))
+                self.end_headers()
+                # A truncated response drops the connection half way through.
+                cut = server.truncate.pop(name, None)
+                self.wfile.write(body[start:cut])
+                if cut is not None:
+                    self.close_connection = True
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+@pytest.fixture
+def pdf_server():
+    server = FakePdfServer()
+    server.start()
+    yield server
+    server.stop()
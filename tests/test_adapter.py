@@ -1,5 +1,11 @@
+import asyncio
+import threading
+import time
+
 from paper_arxiv_adapter.adapter import ArxivAdapter
+from paper_arxiv_adapter.async_storage import AsyncStorage
 from paper_arxiv_adapter.storage import MemoryBackend
+from paper_arxiv_adapter.compliance import RateLimiter
 
 
 def test_adapter_fetch_by_id():
@@ -18,3 +24,175 @@ def test_adapter_search():
     assert len(papers) <= 5
     if papers:
         assert papers[0].title != ""
+
+
+def test_adapter_fetch_many_batches_ids(arxiv_server):
+    for i in range(5):
+        arxiv_server.add(f"2301.0000{i}", version="v2")
+    storage = MemoryBackend()
+    adapter = ArxivAdapter(
+        storage=storage,
+        rate_limiter=RateLimiter(min_interval=0),
+        api_url=arxiv_server.url,
+    )
+
+    result = adapter.fetch_many(
+        ["2301.00000", "2301.00001v2", "2301.00001v1", "2301.00002", "2301.00003", "2301.00004", "2399.99999"],
+        chunk_size=3,
+    )
+
+    assert len(arxiv_server.requests) == 2
+    assert sorted(p.unique_key for p in result.papers) == [
+        "2301.00000v1",
+        "2301.00001v1",
+        "2301.00001v2",
+        "2301.00002v1",
+        "2301.00003v1",
+        "2301.00004v1",
+    ]
+    assert result.missing == ["2399.99999"]
+    assert storage.count() == 6
+
+
+def test_adapter_asearch_and_afetch(arxiv_server):
+    arxiv_server.add("2301.00001", version="v3", categories=["cs.LG"])
+    arxiv_server.add("2301.00002", categories=["cs.AI"])
+    storage = MemoryBackend()
+    adapter = ArxivAdapter(
+        storage=storage,
+        rate_limiter=RateLimiter(min_interval=0),
+        api_url=arxiv_server.url,
+    )
+
+    async def run():
+        try:
+            papers = await adapter.asearch("cat:cs.LG", max_results=5)
+            paper = await adapter.afetch("2301.00002v2")
+            missing = await adapter.afetch("2399.99999")
+        finally:
+            await adapter.aclose()
+        return papers, paper, missing
+
+    papers, paper, missing = asyncio.run(run())
+
+    assert [p.unique_key for p in papers] == ["2301.00001v3"]
+    assert paper.unique_key == "2301.00002v2"
+    assert missing is None
+    assert storage.count() == 2
+
+
+def test_adapter_async_rate_limit_does_not_block_loop(arxiv_server):
+    arxiv_server.add("2301.00001")
+    adapter = ArxivAdapter(rate_limiter=RateLimiter(min_interval=0.2), api_url=arxiv_server.url)
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.05)
+
+    async def run():
+        start = time.monotonic()
+        await asyncio.gather(adapter.afetch("2301.00001"), adapter.afetch("2301.00001"), ticker())
+        await adapter.aclose()
+        return time.monotonic() - start
+
+    elapsed = asyncio.run(run())
+
+    assert elapsed >= 0.2
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.15
+
+
+def test_adapter_subscribe_pages_until_watermark(arxiv_server):
+    for day in range(1, 6):
+        arxiv_server.add(f"2301.0000{day}", published=f"2023-01-0{day}T00:00:00Z")
+    storage = MemoryBackend()
+    adapter = ArxivAdapter(storage=storage, rate_limiter=RateLimiter(min_interval=0), api_url=arxiv_server.url)
+
+    first = adapter.subscribe("cs.AI", on_new=lambda p: None, max_results=2)
+    assert [p.arxiv_id for p in first] == ["2301.00005", "2301.00004"]
+    assert adapter.get_watermark("cs.AI") == "2023-01-05T00:00:00Z"
+    assert len(arxiv_server.requests) == 1
+
+    for day in range(10, 15):
+        arxiv_server.add(f"2301.000{day}", published=f"2023-01-{day}T00:00:00Z")
+    arxiv_server.requests.clear()
+    seen = []
+
+    second = adapter.subscribe("cs.AI", on_new=seen.append, max_results=2)
+    assert [p.arxiv_id for p in second] == [f"2301.000{day}" for day in range(14, 9, -1)]
+    assert seen == second
+    assert [r["start"] for r in arxiv_server.requests] == ["0", "2", "4"]
+    assert adapter.get_watermark("cs.AI") == "2023-01-14T00:00:00Z"
+
+    arxiv_server.requests.clear()
+    assert adapter.subscribe("cs.AI", on_new=lambda p: None, max_results=2) == []
+    assert len(arxiv_server.requests) == 1
+
+
+def test_adapter_subscribe_resumes_backlog_beyond_max_pages(arxiv_server):
+    def add(day: int) -> None:
+        arxiv_server.add(f"2301.{day:05d}", published=f"2023-01-{day:02d}T00:00:00Z")
+
+    add(1)
+    storage = MemoryBackend()
+    adapter = ArxivAdapter(storage=storage, rate_limiter=RateLimiter(min_interval=0), api_url=arxiv_server.url)
+    adapter.subscribe("cs.AI", on_new=lambda p: None, max_results=2)
+    assert adapter.get_watermark("cs.AI") == "2023-01-01T00:00:00Z"
+
+    for day in range(2, 11):
+        add(day)
+    first = adapter.subscribe("cs.AI", on_new=lambda p: None, max_results=2, max_pages=2)
+    assert [int(p.arxiv_id[5:]) for p in first] == [10, 9, 8, 7]
+    assert adapter.get_watermark("cs.AI") == "2023-01-01T00:00:00Z"
+
+    add(11)
+    arxiv_server.requests.clear()
+    second = adapter.subscribe("cs.AI", on_new=lambda p: None, max_results=2, max_pages=2)
+    assert [int(p.arxiv_id[5:]) for p in second] == [11, 6, 5]
+    assert [r["start"] for r in arxiv_server.requests] == ["0", "5"]
+    assert adapter.get_watermark("cs.AI") == "2023-01-01T00:00:00Z"
+
+    arxiv_server.requests.clear()
+    third = adapter.subscribe("cs.AI", on_new=lambda p: None, max_results=2, max_pages=5)
+    assert [int(p.arxiv_id[5:]) for p in third] == [4, 3, 2]
+    assert [r["start"] for r in arxiv_server.requests] == ["0", "7", "9"]
+    assert adapter.get_watermark("cs.AI") == "2023-01-11T00:00:00Z"
+    assert storage.count() == 11
+
+    arxiv_server.requests.clear()
+    assert adapter.subscribe("cs.AI", on_new=lambda p: None, max_results=2) == []
+    assert len(arxiv_server.requests) == 1
+
+
+def test_adapter_async_storage_io_runs_off_the_event_loop(arxiv_server):
+    for day in range(1, 4):
+        arxiv_server.add(f"2301.0000{day}", published=f"2023-01-0{day}T00:00:00Z")
+
+    threads = set()
+    storage = MemoryBackend()
+    for name in ("save", "save_many", "exists_many", "get_state", "set_state"):
+        def record(*args, _method=getattr(storage, name), **kwargs):
+            threads.add(threading.current_thread().name)
+            return _method(*args, **kwargs)
+        setattr(storage, name, record)
+    store = AsyncStorage(storage)
+    adapter = ArxivAdapter(
+        storage=storage, async_storage=store,
+        rate_limiter=RateLimiter(min_interval=0), api_url=arxiv_server.url,
+    )
+
+    async def run():
+        seen = []
+        new = await adapter.asubscribe("cs.AI", on_new=seen.append, max_results=2)
+        await adapter.asearch("cs.AI", max_results=2)
+        await adapter.afetch("2301.00001")
+        await adapter.aclose()
+        await store.close()
+        return new, seen
+
+    new, seen = asyncio.run(run())
+    assert {name.split("_")[0] for name in threads} == {"storage-write"}
+    assert [p.arxiv_id for p in new] == ["2301.00003", "2301.00002"]
+    assert seen == new
+    assert adapter.get_watermark("cs.AI") == "2023-01-03T00:00:00Z"
@@ -0,0 +1,29 @@
+import feedparser
+
+from paper_arxiv_adapter.adapter import ArxivAdapter
+from paper_arxiv_adapter.atom import iter_papers, parse_papers
+
+
+def _feed(atom_feed) -> bytes:
+    return atom_feed(
+        dict(arxiv_id="2301.00001", version="v3", title="Sparse\n  Transformers & <b>friends</b>",
+             authors=["Ada Lovelace", "Alan Turing"], categories=["cs.LG", "stat.ML"]),
+        dict(arxiv_id="2301.00002", abstract="  Leading and trailing\n  whitespace.  "),
+        dict(arxiv_id="2301.00003", version="v12", categories=["hep-th"]),
+    )
+
+
+def test_atom_parser_matches_feedparser(atom_feed):
+    adapter = ArxivAdapter()
+    data = _feed(atom_feed)
+    expected = [adapter._entry_to_paper(e) for e in feedparser.parse(data).entries]
+
+    assert parse_papers(data) == expected
+    assert [p.unique_key for p in expected] == ["2301.00001v3", "2301.00002v1", "2301.00003v12"]
+
+
+def test_atom_parser_streams_chunks(atom_feed):
+    data = _feed(atom_feed)
+    chunks = [data[i : i + 64] for i in range(0, len(data), 64)]
+
+    assert list(iter_papers(chunks)) == parse_papers(data)
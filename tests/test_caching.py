@@ -0,0 +1,38 @@
+import os
+import tempfile
+
+from paper_arxiv_adapter.caching import CachedStorage
+from paper_arxiv_adapter.storage import MemoryBackend, SQLiteBackend
+
+
+def test_cached_storage_reuses_results_until_write(make_paper):
+    storage = CachedStorage(MemoryBackend())
+    storage.save(make_paper("2301.00001"))
+
+    assert storage.count() == 1
+    assert storage.count() == 1
+    assert storage.get_category_stats() == {"cs.AI": 1}
+    assert storage.hits == 1
+
+    storage.save_many([make_paper("2301.00002", categories=["cs.LG"])])
+    assert storage.count() == 2
+    assert storage.get_stats()["categories"] == {"cs.AI": 1, "cs.LG": 1}
+
+    storage.delete("2301.00001v1")
+    assert storage.count() == 1
+    assert storage.get("2301.00002v1").title == "Paper 2301.00002"
+
+
+def test_cached_storage_sees_writes_from_other_connections(make_paper):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = os.path.join(tmpdir, "test.db")
+        storage = CachedStorage(SQLiteBackend(db_path))
+        other = SQLiteBackend(db_path)
+
+        assert storage.count() == 0
+        counter = storage.get_change_state()[0]
+
+        other.save(make_paper("2301.00001"))
+        assert storage.get_change_state()[0] > counter
+        assert storage.count() == 1
+        assert storage.count(category="cs.AI") == 1
@@ -11,3 +11,111 @@ def test_rate_limiter_enforces_delay():
     elapsed = time.time() - start
     
     assert elapsed >= 0.5
+
+
+def test_rate_limiter_async_wait():
+    import asyncio
+
+    limiter = RateLimiter(min_interval=0.2)
+
+    async def run():
+        start = time.time()
+        await asyncio.gather(*(limiter.async_wait_if_needed() for _ in range(3)))
+        return time.time() - start
+
+    assert asyncio.run(run()) >= 0.4
+
+
+def test_rate_limiter_burst_and_stats():
+    limiter = RateLimiter(min_interval=0.2, burst=3)
+
+    start = time.time()
+    for _ in range(4):
+        limiter.wait_if_needed()
+    elapsed = time.time() - start
+
+    assert 0.15 <= elapsed < 0.5
+    assert limiter.total_requests == 4
+    assert limiter.total_wait_time >= 0.15
+    assert limiter.queue_depth == 0
+
+
+def test_rate_limiter_priority_jumps_queue():
+    import threading
+    from paper_arxiv_adapter.compliance import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
+
+    limiter = RateLimiter(min_interval=0.1)
+    limiter.wait_if_needed()
+    order = []
+
+    def worker(name, priority):
+        limiter.wait_if_needed(priority)
+        order.append(name)
+
+    threads = [
+        threading.Thread(target=worker, args=(f"poll-{i}", PRIORITY_BACKGROUND)) for i in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    while limiter.queue_depth < 3:
+        time.sleep(0.005)
+    interactive = threading.Thread(target=worker, args=("search", PRIORITY_INTERACTIVE))
+    interactive.start()
+    for thread in threads + [interactive]:
+        thread.join()
+
+    assert order[0] == "search"
+    assert order[1:] == ["poll-0", "poll-1", "poll-2"]
+
+
+def test_rate_limiter_shared_across_instances(tmp_path):
+    path = str(tmp_path / "ratelimit.db")
+    first = RateLimiter(min_interval=0.3, shared_path=path)
+    second = RateLimiter(min_interval=0.3, shared_path=path)
+
+    start = time.time()
+    first.wait_if_needed()
+    second.wait_if_needed()
+    elapsed = time.time() - start
+    first.close()
+    second.close()
+
+    assert elapsed >= 0.3
+
+
+def test_rate_limiter_shared_lock_wait_does_not_block_loop(tmp_path):
+    import asyncio
+    import sqlite3
+    import threading
+
+    path = str(tmp_path / "ratelimit.db")
+    limiter = RateLimiter(min_interval=0.1, shared_path=path)
+    limiter.wait_if_needed()
+
+    other = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    other.execute("BEGIN IMMEDIATE")
+    release = threading.Timer(0.4, lambda: other.execute("COMMIT"))
+
+    async def run():
+        ticks = []
+
+        async def tick():
+            while True:
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.02)
+
+        ticker = asyncio.create_task(tick())
+        release.start()
+        start = time.monotonic()
+        await limiter.async_wait_if_needed()
+        elapsed = time.monotonic() - start
+        ticker.cancel()
+        return elapsed, ticks
+
+    elapsed, ticks = asyncio.run(run())
+    release.join()
+    other.close()
+    limiter.close()
+
+    assert elapsed >= 0.35
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.15
@@ -0,0 +1,83 @@
+import os
+import tempfile
+
+import numpy as np
+
+from paper_arxiv_adapter import MemoryBackend, SQLiteBackend
+from paper_arxiv_adapter.enrichment import (
+    EnrichmentPipeline,
+    HashingEmbeddingEnricher,
+    LeadSummaryEnricher,
+    TfidfKeywordEnricher,
+)
+
+
+ABSTRACTS = [
+    "We study graph neural networks for molecule property prediction. Graph attention improves accuracy.",
+    "Diffusion models generate images. We propose faster diffusion sampling with fewer steps.",
+    "Quantum error correction with surface codes. Surface code decoders run in real time.",
+    "Reinforcement learning agents explore sparse reward environments using curiosity bonuses.",
+]
+
+
+def _corpus(make_paper, n=40):
+    return [
+        make_paper(f"2301.{i:05d}", title=f"Study {i}", abstract=ABSTRACTS[i % len(ABSTRACTS)])
+        for i in range(n)
+    ]
+
+
+def test_enrichers_are_batch_vectorized():
+    documents = [(f"k{i}", "", abstract) for i, abstract in enumerate(ABSTRACTS)]
+
+    keywords = TfidfKeywordEnricher(top_k=3)(documents)
+    assert keywords[0]["keywords"][0] == "graph"
+    assert "diffusion" in keywords[1]["keywords"]
+    assert all(len(k["keywords"]) == 3 for k in keywords)
+
+    vectors = np.array([e["embedding"] for e in HashingEmbeddingEnricher(dim=64)(documents + documents[:1])])
+    assert vectors.shape == (5, 64)
+    np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), 1.0, rtol=1e-5)
+    np.testing.assert_allclose(vectors[0], vectors[4])
+    assert vectors[0] @ vectors[1] < 0.5
+
+    summary = LeadSummaryEnricher(max_chars=70)(documents)[0]["summary"]
+    assert summary == "We study graph neural networks for molecule property prediction."
+
+
+def test_pipeline_is_resumable_and_idempotent(make_paper):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        storage = SQLiteBackend(os.path.join(tmpdir, "test.db"))
+        storage.save_many(_corpus(make_paper))
+
+        pipeline = EnrichmentPipeline(storage, batch_size=8, workers=0)
+        partial = pipeline.run(limit=16)
+        assert (partial.enriched, partial.batches, partial.completed) == (16, 2, False)
+        assert storage.get("2301.00015v1").keywords
+        assert not storage.get("2301.00016v1").keywords
+
+        rest = pipeline.run()
+        assert rest.resumed_from == "2301.00015v1"
+        assert (rest.scanned, rest.enriched, rest.completed) == (24, 24, True)
+        assert rest.papers_per_second > 0
+
+        paper = storage.get("2301.00017v1")
+        assert paper.summary and len(paper.embedding) == 256
+        assert storage.similar("2301.00001v1", k=1)[0].paper.abstract == ABSTRACTS[1]
+
+        again = pipeline.run()
+        assert (again.scanned, again.enriched) == (40, 0)
+
+
+def test_pipeline_process_pool_matches_inline(make_paper):
+    inline, pooled = MemoryBackend(), MemoryBackend()
+    inline.save_many(_corpus(make_paper, 20))
+    pooled.save_many(_corpus(make_paper, 20))
+
+    EnrichmentPipeline(inline, batch_size=20, workers=0).run()
+    report = EnrichmentPipeline(pooled, batch_size=5, workers=2).run()
+
+    assert report.enriched == 20
+    for a, b in zip(inline.iter_all(), pooled.iter_all()):
+        assert a.summary == b.summary
+        np.testing.assert_allclose(a.embedding, b.embedding)
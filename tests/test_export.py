@@ -0,0 +1,54 @@
+import io
+
+import pytest
+
+from paper_arxiv_adapter.export import export_ndjson, export_parquet, import_ndjson
+from paper_arxiv_adapter.models import Paper
+from paper_arxiv_adapter.storage import MemoryBackend, SQLiteBackend
+
+
+def _paper(make_paper, i: int) -> Paper:
+    return make_paper(
+        f"2301.{i:05d}",
+        title=f"论文 {i}",
+        published="2023-01-17T00:00:00Z",
+        updated="2023-01-17T00:00:00Z",
+        embedding=[1.0, 0.5] if i % 2 else None,
+        extra={"i": i},
+    )
+
+
+def test_iter_all_batches(tmp_path, make_paper):
+    for backend in (SQLiteBackend(str(tmp_path / "test.db")), MemoryBackend()):
+        backend.save_many(_paper(make_paper, i) for i in range(25))
+
+        keys = [p.unique_key for p in backend.iter_all(batch_size=10)]
+
+        assert keys == sorted(f"2301.{i:05d}v1" for i in range(25))
+
+
+def test_ndjson_round_trip(tmp_path, make_paper):
+    source = SQLiteBackend(str(tmp_path / "source.db"))
+    source.save_many(_paper(make_paper, i) for i in range(7))
+    buffer = io.BytesIO()
+
+    assert export_ndjson(source, buffer, batch_size=3) == 7
+
+    target = MemoryBackend()
+    buffer.seek(0)
+    assert import_ndjson(target, buffer, batch_size=4) == 7
+    assert target.count() == 7
+    paper = target.get("2301.00003v1")
+    assert paper.title == "论文 3"
+    assert paper.embedding == [1.0, 0.5]
+    assert paper.extra == {"i": 3}
+
+
+def test_parquet_export(tmp_path, make_paper):
+    pq = pytest.importorskip("pyarrow.parquet")
+    storage = MemoryBackend()
+    storage.save_many(_paper(make_paper, i) for i in range(5))
+    path = str(tmp_path / "papers.parquet")
+
+    assert export_parquet(storage, path, batch_size=2) == 5
+    assert pq.read_table(path).num_rows == 5
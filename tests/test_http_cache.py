@@ -0,0 +1,65 @@
+import asyncio
+
+from paper_arxiv_adapter.adapter import ArxivAdapter
+from paper_arxiv_adapter.compliance import RateLimiter
+from paper_arxiv_adapter.http_cache import ResponseCache
+
+
+def test_search_served_from_cache_skips_rate_limiter(arxiv_server, tmp_path):
+    arxiv_server.add("2301.00001", categories=["cs.LG"])
+    cache = ResponseCache(str(tmp_path / "cache.db"))
+    limiter = RateLimiter(min_interval=0)
+    adapter = ArxivAdapter(rate_limiter=limiter, api_url=arxiv_server.url, response_cache=cache)
+
+    first = adapter.search("deep  learning", max_results=5, categories=["cs.LG", "cs.AI"])
+    second = adapter.search("deep learning", max_results=5, categories=["cs.AI", "cs.LG"])
+
+    async def run():
+        try:
+            return await adapter.asearch("deep learning", max_results=5, categories=["cs.LG", "cs.AI"])
+        finally:
+            await adapter.aclose()
+
+    third = asyncio.run(run())
+
+    assert len(arxiv_server.requests) == 1
+    assert limiter.total_requests == 1
+    assert [p.unique_key for p in first] == ["2301.00001v1"]
+    assert [p.unique_key for p in second] == [p.unique_key for p in third] == ["2301.00001v1"]
+    assert (cache.hits, cache.misses) == (2, 1)
+    cache.close()
+
+
+def test_stale_entry_revalidates_with_etag(arxiv_server, tmp_path):
+    arxiv_server.add("2301.00001")
+    arxiv_server.etags = True
+    cache = ResponseCache(str(tmp_path / "cache.db"), ttls={"search": 0})
+    adapter = ArxivAdapter(
+        rate_limiter=RateLimiter(min_interval=0),
+        api_url=arxiv_server.url,
+        response_cache=cache,
+    )
+
+    adapter.search("all:test")
+    papers = adapter.search("all:test")
+    adapter.close()
+
+    assert len(arxiv_server.requests) == 2
+    assert arxiv_server.not_modified == 1
+    assert cache.revalidations == 1
+    assert [p.arxiv_id for p in papers] == ["2301.00001"]
+    cache.close()
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.db"), max_bytes=250)
+    for name in "abc":
+        cache.put(f"search?q={name}", "search", b"x" * 100)
+        if name == "b":
+            cache.get("search?q=a", "search")
+
+    assert len(cache) == 2
+    assert cache.size == 200
+    assert cache.get("search?q=b", "search") is None
+    assert cache.get("search?q=a", "search").body == b"x" * 100
+    cache.close()
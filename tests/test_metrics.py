@@ -0,0 +1,95 @@
+import pytest
+
+from paper_arxiv_adapter.adapter import ArxivAdapter
+from paper_arxiv_adapter.atom import AtomError
+from paper_arxiv_adapter.compliance import RateLimiter
+from paper_arxiv_adapter.metrics import (
+    AdapterMetrics,
+    InstrumentedStorage,
+    MetricsRegistry,
+    instrument_rate_limiter,
+)
+from paper_arxiv_adapter.storage import MemoryBackend
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry(prefix="")
+    counter = registry.counter("requests_total", "Requests", ("operation",))
+    histogram = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    counter.inc("search")
+    counter.inc("search", amount=2)
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+
+    text = registry.render()
+
+    assert "# TYPE requests_total counter" in text
+    assert 'requests_total{operation="search"} 3.0' in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 2' in text
+    assert "latency_seconds_count 2" in text
+
+
+def test_instrumented_storage_times_calls():
+    registry = MetricsRegistry()
+    storage = InstrumentedStorage(MemoryBackend(), registry)
+
+    storage.save_many([])
+    storage.get("missing")
+    storage.get("missing")
+    with pytest.raises(ValueError):
+        storage.list(cursor="not-a-cursor")
+
+    latency = storage._latency
+    assert latency.count("get") == 2
+    assert latency.count("save_many") == 1
+    assert storage._errors.value("list") == 1
+
+
+def test_adapter_metrics_track_requests_and_ingest(arxiv_server):
+    for i in range(3):
+        arxiv_server.add(f"2301.0000{i}", categories=["cs.LG"], published=f"2023-01-1{i}T00:00:00Z")
+    registry = MetricsRegistry()
+    metrics = AdapterMetrics(registry)
+    limiter = RateLimiter(min_interval=0)
+    instrument_rate_limiter(registry, limiter)
+    adapter = ArxivAdapter(
+        storage=MemoryBackend(),
+        rate_limiter=limiter,
+        api_url=arxiv_server.url,
+        metrics=metrics,
+    )
+
+    adapter.search("cat:cs.LG")
+    adapter.subscribe("cs.LG", lambda p: None)
+    adapter.close()
+
+    assert metrics.requests.value("search") == 1
+    assert metrics.requests.value("subscribe") == 1
+    assert metrics.ingested.value("search") == 3
+    assert metrics.deduplicated.value("subscribe") == 3
+    assert metrics.parse_latency.count("search") == 1
+    assert "paper_adapter_rate_limiter_grants_total 2.0" in registry.render()
+
+
+@pytest.mark.parametrize("body", [b"", b"<html><body>Service Unavailable</html>"])
+def test_adapter_rejects_non_atom_subscribe_body(arxiv_server, body):
+    arxiv_server.add("2301.00001")
+    metrics = AdapterMetrics(MetricsRegistry())
+    adapter = ArxivAdapter(
+        storage=MemoryBackend(),
+        rate_limiter=RateLimiter(min_interval=0),
+        api_url=arxiv_server.url,
+        metrics=metrics,
+    )
+    adapter.subscribe("cs.AI", lambda p: None)
+    watermark = adapter.get_watermark("cs.AI")
+
+    arxiv_server.raw_body = body
+    with pytest.raises(AtomError):
+        adapter.subscribe("cs.AI", lambda p: None)
+    adapter.close()
+
+    assert adapter.get_watermark("cs.AI") == watermark
+    assert metrics.errors.value("subscribe") == 1
@@ -0,0 +1,67 @@
+import httpx
+import pytest
+
+from paper_arxiv_adapter.adapter import ArxivAdapter
+from paper_arxiv_adapter.compliance import RateLimiter
+from paper_arxiv_adapter.storage import SQLiteBackend
+
+
+def _adapter(oai_server, storage):
+    return ArxivAdapter(
+        storage=storage,
+        rate_limiter=RateLimiter(min_interval=0),
+        oai_url=oai_server.url,
+    )
+
+
+def test_harvest_follows_resumption_tokens(oai_server, tmp_path):
+    oai_server.serve("set:cs", "listrecords-1.xml")
+    oai_server.serve("6960524|1001", "listrecords-2.xml")
+    storage = SQLiteBackend(str(tmp_path / "test.db"))
+    adapter = _adapter(oai_server, storage)
+    pages = []
+
+    total = adapter.harvest("cs", from_date="2023-01-01", on_page=pages.append)
+
+    assert total == 3
+    assert [len(page) for page in pages] == [2, 1]
+    assert oai_server.requests[0] == {
+        "verb": "ListRecords",
+        "metadataPrefix": "arXivRaw",
+        "set": "cs",
+        "from": "2023-01-01",
+    }
+    assert oai_server.requests[1] == {"verb": "ListRecords", "resumptionToken": "6960524|1001"}
+
+    paper = storage.get("2301.00001v2")
+    assert paper.title == "Scaling Laws for Sparse Transformers"
+    assert paper.authors == ["Alice Smith", "Bob Jones", "Carol White"]
+    assert paper.categories == ["cs.LG", "cs.AI"]
+    assert paper.abstract == "We study how sparse transformers scale."
+    assert storage.exists_many(["2301.00002v1", "2301.00003v1", "2301.00004v1"]) == {
+        "2301.00003v1",
+        "2301.00004v1",
+    }
+
+
+def test_harvest_resumes_from_persisted_token(oai_server, tmp_path):
+    oai_server.serve("set:cs", "listrecords-1.xml")
+    oai_server.serve("6960524|1001", "listrecords-2.xml")
+    oai_server.failures["6960524|1001"] = 1
+    storage = SQLiteBackend(str(tmp_path / "test.db"))
+    adapter = _adapter(oai_server, storage)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        adapter.harvest("cs")
+    assert storage.count() == 2
+
+    assert adapter.harvest("cs") == 1
+    assert [r.get("resumptionToken") for r in oai_server.requests] == [None, "6960524|1001", "6960524|1001"]
+    assert storage.count() == 3
+
+
+def test_harvest_no_records(oai_server):
+    oai_server.serve("set:q-bio", "no-records.xml")
+    adapter = _adapter(oai_server, None)
+
+    assert adapter.harvest("q-bio") == 0
@@ -0,0 +1,78 @@
+import hashlib
+import os
+import tempfile
+
+from paper_arxiv_adapter import ArxivAdapter, MemoryBackend, PdfStore, RateLimiter
+
+
+def _pdf(n: int, size: int = 200_000) -> bytes:
+    return b"%PDF-1.5\n" + bytes([n % 256]) * size
+
+
+def test_download_pdfs_concurrently_and_records_extra(pdf_server, make_paper):
+    papers = [make_paper(f"2301.{i:05d}", pdf_url=pdf_server.url(f"p{i}")) for i in range(6)]
+    for i in range(6):
+        pdf_server.files[f"p{i}"] = _pdf(i)
+    storage = MemoryBackend()
+    storage.save_many(papers)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = PdfStore(tmpdir, chunk_size=4096)
+        adapter = ArxivAdapter(storage=storage, rate_limiter=RateLimiter(min_interval=0), pdf_store=store)
+        results = adapter.download_pdfs(papers + papers[:2], concurrency=3)
+
+        assert [r.status for r in results] == ["downloaded"] * 6
+        assert len(pdf_server.requests) == 6
+        stored = storage.get("2301.00003v1").extra["pdf"]
+        assert stored["size"] == len(_pdf(3))
+        assert stored["sha256"] == hashlib.sha256(_pdf(3)).hexdigest()
+        with open(stored["path"], "rb") as f:
+            assert f.read() == _pdf(3)
+        assert os.listdir(os.path.join(tmpdir, "partial")) == []
+
+        again = adapter.download_pdfs(papers)
+        assert {r.status for r in again} == {"cached"}
+        assert len(pdf_server.requests) == 6
+        store.close()
+
+
+def test_interrupted_download_resumes_with_range(pdf_server, make_paper):
+    body = _pdf(7)
+    pdf_server.files["p7"] = body
+    pdf_server.truncate["p7"] = 50_000
+    paper = make_paper("2301.00007", pdf_url=pdf_server.url("p7"))
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = PdfStore(tmpdir, chunk_size=4096)
+        adapter = ArxivAdapter(rate_limiter=RateLimiter(min_interval=0))
+
+        [first] = adapter.download_pdfs([paper], store=store)
+        assert first.status == "failed"
+        assert os.path.getsize(store.partial_path(paper.unique_key)) == 50_000
+
+        [second] = adapter.download_pdfs([paper], store=store)
+        assert second.status == "downloaded"
+        assert second.resumed_from == 50_000
+        assert pdf_server.requests[-1] == ("p7", "bytes=50000-")
+        assert second.record.sha256 == hashlib.sha256(body).hexdigest()
+        assert paper.extra["pdf"]["size"] == len(body)
+        store.close()
+
+
+def test_identical_content_is_stored_once(pdf_server, make_paper):
+    pdf_server.files["a"] = pdf_server.files["b"] = _pdf(1)
+    papers = [
+        make_paper("2301.00001", pdf_url=pdf_server.url("a")),
+        make_paper("2301.00002", pdf_url=pdf_server.url("b")),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        store = PdfStore(tmpdir)
+        adapter = ArxivAdapter(rate_limiter=RateLimiter(min_interval=0), pdf_store=store)
+        results = adapter.download_pdfs(papers, concurrency=1)
+
+        assert [r.status for r in results] == ["downloaded", "duplicate"]
+        assert results[0].record.path == results[1].record.path
+        assert sum(len(files) for _, _, files in os.walk(os.path.join(tmpdir, "objects"))) == 1
+        assert "2301.00002v1" in store
+        store.close()
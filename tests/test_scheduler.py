@@ -0,0 +1,115 @@
+import asyncio
+import threading
+
+from paper_arxiv_adapter import ArxivAdapter, AsyncStorage, MemoryBackend, RateLimiter
+from paper_arxiv_adapter.scheduler import IngestionScheduler
+
+
+def _adapter(storage, url):
+    return ArxivAdapter(storage=storage, rate_limiter=RateLimiter(min_interval=0), api_url=url)
+
+
+async def _wait_for(job, timeout=5.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while job.status in ("queued", "running"):
+        assert loop.time() < deadline
+        await asyncio.sleep(0.01)
+
+
+def test_scheduler_runs_subscriptions_in_background(arxiv_server):
+    arxiv_server.add("2301.00001", categories=["cs.AI"])
+    arxiv_server.add("2301.00002", categories=["cs.AI"])
+    storage = MemoryBackend()
+    adapter = _adapter(storage, arxiv_server.url)
+
+    async def run():
+        scheduler = IngestionScheduler(adapter, default_interval=0.05, jitter=0.0)
+        await scheduler.start()
+        try:
+            job = await scheduler.subscribe("cs.AI")
+            assert job.status == "queued"
+            await _wait_for(job)
+            arxiv_server.add("2301.00003", categories=["cs.AI"], published="2099-01-01T00:00:00Z")
+            while len(scheduler.jobs()) < 2 or scheduler.jobs()[0].status != "succeeded":
+                await asyncio.sleep(0.01)
+        finally:
+            await scheduler.stop()
+            await adapter.aclose()
+        return job, scheduler.jobs()[0]
+
+    first, second = asyncio.run(run())
+
+    assert first.status == "succeeded"
+    assert first.new_papers == 2
+    assert second.new_papers == 1
+    assert storage.count() == 3
+
+
+def test_scheduler_persists_subscriptions_and_backs_off(arxiv_server):
+    storage = MemoryBackend()
+    adapter = _adapter(storage, "http://127.0.0.1:9/api/query")
+
+    async def run():
+        scheduler = IngestionScheduler(adapter, jitter=0.0, retry_delay=10.0)
+        await scheduler.start()
+        try:
+            job = await scheduler.subscribe("cs.LG", interval=600)
+            await _wait_for(job)
+        finally:
+            await scheduler.stop()
+            await adapter.aclose()
+        return scheduler, job
+
+    scheduler, job = asyncio.run(run())
+
+    assert job.status == "failed"
+    sub = scheduler.subscriptions["cs.LG"]
+    assert sub.failures == 1
+    assert 9.0 < sub.next_run - sub.last_run <= 10.0
+
+    async def restore():
+        restored = IngestionScheduler(_adapter(storage, arxiv_server.url))
+        await restored.start()
+        try:
+            assert restored.subscriptions["cs.LG"].interval == 600
+            assert await restored.unsubscribe("cs.LG")
+        finally:
+            await restored.stop()
+        again = IngestionScheduler(adapter)
+        await again._load()
+        return again
+
+    assert not asyncio.run(restore()).subscriptions
+
+
+def test_scheduler_state_goes_through_async_storage(arxiv_server):
+    storage = MemoryBackend()
+    store = AsyncStorage(storage)
+    threads = set()
+    set_state = storage.set_state
+
+    def record(*args):
+        threads.add(threading.current_thread().name)
+        return set_state(*args)
+
+    storage.set_state = record
+    adapter = ArxivAdapter(
+        storage=storage, async_storage=store,
+        rate_limiter=RateLimiter(min_interval=0), api_url=arxiv_server.url,
+    )
+
+    async def run():
+        scheduler = IngestionScheduler(adapter, jitter=0.0)
+        await scheduler.start()
+        try:
+            await _wait_for(await scheduler.subscribe("cs.AI"))
+            await scheduler.unsubscribe("cs.AI")
+        finally:
+            await scheduler.stop()
+            await adapter.aclose()
+            await store.close()
+
+    asyncio.run(run())
+    assert threads and all(name.startswith("storage-write") for name in threads)
+    assert storage.get_state("scheduler:subscriptions") == "[]"
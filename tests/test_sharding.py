@@ -0,0 +1,89 @@
+import os
+import tempfile
+
+import pytest
+
+from paper_arxiv_adapter import MemoryBackend, ShardedSQLiteBackend
+from paper_arxiv_adapter.sharding import shard_for
+
+
+def _corpus(make_paper):
+    papers = []
+    for month in ("2301", "2302", "2405"):
+        for i in range(4):
+            papers.append(make_paper(
+                f"{month}.{i:05d}",
+                title=f"Graph paper {month} {i}",
+                categories=["cs.LG" if i % 2 else "cs.AI"],
+                published=f"20{month[:2]}-{month[2:]}-{i + 1:02d}T00:00:00Z",
+            ))
+    papers.append(make_paper("2301.00001", version="v2", categories=["cs.LG"]))
+    return papers
+
+
+def test_shard_for():
+    assert shard_for("2301.00001") == "2301"
+    assert shard_for("2301.00001v2") == "2301"
+    assert shard_for("hep-th/9901001v1") == "9901"
+    assert shard_for("weird") == "misc"
+
+
+def test_sharded_backend_routes_and_merges_like_a_single_store(make_paper):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        sharded = ShardedSQLiteBackend(tmpdir, max_workers=3)
+        reference = MemoryBackend()
+        papers = _corpus(make_paper)
+        assert sharded.save_many(papers) == len(papers)
+        reference.save_many(papers)
+
+        assert sharded.shard_names == ["2301", "2302", "2405"]
+        assert {"papers-2301.db", "papers-2302.db", "papers-2405.db"} <= set(os.listdir(tmpdir))
+        assert sharded.get("2302.00003v1").title == "Graph paper 2302 3"
+        assert sharded.get("2399.00001v1") is None
+        assert [p.version for p in sharded.get_versions("2301.00001")] == ["v1", "v2"]
+        assert sharded.exists_many(["2301.00000v1", "2405.00003v1", "2999.00000v1"]) == {
+            "2301.00000v1", "2405.00003v1",
+        }
+        assert sharded.count() == reference.count() == 13
+        assert sharded.count(category="cs.LG") == reference.count(category="cs.LG")
+        stats = sharded.get_stats()
+        assert stats["total_papers"] == 13
+        assert stats["categories"] == reference.get_stats()["categories"]
+
+        for sort_by in ("arxiv_id", "published", "title"):
+            for order in ("asc", "desc"):
+                expected = [p.unique_key for p in reference.list(limit=50, sort_by=sort_by, order=order)]
+                assert [p.unique_key for p in sharded.list(limit=50, sort_by=sort_by, order=order)] == expected
+                assert [
+                    p.unique_key for p in sharded.list(limit=4, offset=3, sort_by=sort_by, order=order)
+                ] == expected[3:7]
+
+                seen = []
+                page = sharded.list(limit=5, sort_by=sort_by, order=order)
+                while True:
+                    seen.extend(p.unique_key for p in page)
+                    if not page.next_cursor:
+                        break
+                    page = sharded.list(limit=5, sort_by=sort_by, order=order, cursor=page.next_cursor)
+                assert seen == expected
+
+        expected = [p.unique_key for p in reference.query(categories=["cs.LG"], published_from="2023-01-02")]
+        assert [p.unique_key for p in sharded.query(categories=["cs.LG"], published_from="2023-01-02")] == expected
+        assert sharded.count_query(categories=["cs.LG"], published_from="2023-01-02") == len(expected)
+
+        hits = sharded.search_local("graph", limit=5)
+        assert len(hits) == 5
+        assert [h.score for h in hits] == sorted((h.score for h in hits), reverse=True)
+        assert sharded.count_local("graph") == reference.count_local("graph")
+
+        assert sharded.delete("2405.00000v1")
+        assert not sharded.delete("2405.00000v1")
+        sharded.set_state("watermark:cs.AI", "x")
+        sharded.close()
+
+        reopened = ShardedSQLiteBackend(tmpdir)
+        assert reopened.count() == 12
+        assert reopened.get_state("watermark:cs.AI") == "x"
+        with pytest.raises(ValueError):
+            reopened.list(fields=["nope"])
+        reopened.close()
@@ -1,6 +1,8 @@
 import tempfile
+import pytest
 import os
-from paper_arxiv_adapter.storage import SQLiteBackend
+import numpy as np
+from paper_arxiv_adapter.storage import SQLiteBackend, MemoryBackend
 from paper_arxiv_adapter.models import Paper
 from datetime import datetime
 
@@ -66,3 +68,564 @@ def test_sqlite_backend_list():
         
         papers = backend.list()
         assert len(papers) == 2
+
+
+def test_sqlite_backend_pooled_reuses_connection(make_paper):
+    import sqlite3
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = os.path.join(tmpdir, "test.db")
+        backend = SQLiteBackend(db_path, pooled=True)
+
+        backend.save(make_paper("2301.07041"))
+        for _ in range(20):
+            assert backend.exists("2301.07041v1")
+            assert backend.get("2301.07041v1").title == "Paper 2301.07041"
+        assert backend.open_connections == 1
+
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        conn.close()
+
+        backend.close()
+        assert backend.open_connections == 0
+        assert backend.count() == 1
+        backend.close()
+
+
+def test_sqlite_backend_pooled_connection_per_thread(make_paper):
+    import threading
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = os.path.join(tmpdir, "test.db")
+        backend = SQLiteBackend(db_path, pooled=True)
+        barrier = threading.Barrier(5)
+        during = []
+
+        def worker(i: int) -> None:
+            backend.save(make_paper(f"2301.0704{i}"))
+            barrier.wait()
+            if i == 0:
+                during.append(backend.open_connections)
+            barrier.wait()
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert during == [6]
+        # Connections of finished threads are closed when the thread exits
+        # rather than piling up until close().
+        assert backend.open_connections == 1
+        assert backend.count() == 5
+        backend.close()
+        assert backend.open_connections == 0
+
+
+def test_sqlite_backend_save_many(make_paper):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = os.path.join(tmpdir, "test.db")
+        backend = SQLiteBackend(db_path)
+
+        papers = (make_paper(f"2301.{i:05d}") for i in range(25))
+        assert backend.save_many(papers, chunk_size=10) == 25
+        assert backend.count() == 25
+        assert backend.get("2301.00024v1").title == "Paper 2301.00024"
+
+
+def test_memory_backend_save_many(make_paper):
+    backend = MemoryBackend()
+    papers = [make_paper(f"2301.{i:05d}") for i in range(25)]
+
+    assert backend.save_many(papers, chunk_size=10) == 25
+    assert backend.count() == 25
+    assert backend.exists("2301.00000v1")
+
+
+def test_sqlite_backend_category_index_tracks_writes(make_paper):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = os.path.join(tmpdir, "test.db")
+        backend = SQLiteBackend(db_path)
+
+        backend.save(make_paper("2301.00001", categories=["cs.AI", "cs.LG", "cs.AI"]))
+        backend.save(make_paper("2301.00002", categories=["cs.LG"]))
+        backend.save_many([make_paper("2301.00003", categories=["math.CO"])])
+        backend.save(make_paper("2301.00001", categories=["cs.LG"]))
+        assert backend.get_category_stats() == {"cs.LG": 2, "math.CO": 1}
+
+        backend.delete("2301.00002v1")
+        assert backend.get_category_stats() == {"cs.LG": 1, "math.CO": 1}
+        assert backend.get_stats()["categories"] == {"cs.LG": 1, "math.CO": 1}
+        assert backend.count(category="cs.LG") == 1
+        assert [p.arxiv_id for p in backend.list(category="math.CO")] == ["2301.00003"]
+
+
+def test_sqlite_backend_migrates_categories():
+    import sqlite3
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = os.path.join(tmpdir, "test.db")
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("""
+                CREATE TABLE papers (
+                    unique_key TEXT PRIMARY KEY, arxiv_id TEXT NOT NULL, version TEXT NOT NULL,
+                    title TEXT NOT NULL, authors TEXT NOT NULL, abstract TEXT, categories TEXT NOT NULL,
+                    published TEXT, updated TEXT, pdf_url TEXT, source_url TEXT, keywords TEXT,
+                    summary TEXT, embedding TEXT, extra TEXT, created_at TEXT DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            conn.execute(
+                "INSERT INTO papers (unique_key, arxiv_id, version, title, authors, categories) "
+                "VALUES ('2301.00001v1', '2301.00001', 'v1', 'Old', '[]', ?)",
+                ('["cs.AI", "cs.LG"]',),
+            )
+        conn.close()
+
+        backend = SQLiteBackend(db_path)
+        assert backend.get_category_stats() == {"cs.AI": 1, "cs.LG": 1}
+        assert backend.count(category="cs.AI") == 1
+
+
+def _search_corpus(make_paper) -> list[Paper]:
+    return [
+        make_paper("2301.00001", title="Graph neural networks", abstract="We study message passing on graphs.", categories=["cs.LG"]),
+        make_paper("2301.00002", title="Protein folding", abstract="Neural networks predict protein structure.", categories=["q-bio.BM"]),
+        make_paper("2301.00003", title="Sorting algorithms", abstract="Quicksort revisited.", authors=["Ada Neural"], categories=["cs.DS"]),
+    ]
+
+
+def test_sqlite_backend_search_local(make_paper):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        backend = SQLiteBackend(os.path.join(tmpdir, "test.db"))
+        backend.save_many(_search_corpus(make_paper))
+
+        hits = backend.search_local("neural networks")
+        assert [h.paper.arxiv_id for h in hits] == ["2301.00001", "2301.00002"]
+        assert hits[0].score > hits[1].score
+        assert "<mark>" in hits[1].snippet
+
+        hits = backend.search_local("neural", categories=["cs.DS"])
+        assert [h.paper.arxiv_id for h in hits] == ["2301.00003"]
+        assert backend.count_local("neural") == 3
+        assert backend.count_local("neural networks", categories=["cs.LG", "cs.DS"]) == 1
+        assert len(backend.search_local("neural", limit=1, offset=1)) == 1
+
+        backend.save(make_paper("2301.00001", title="Renamed", abstract="Nothing here."))
+        backend.delete("2301.00002v1")
+        assert backend.search_local("networks") == []
+        assert [h.paper.arxiv_id for h in backend.search_local("renamed")] == ["2301.00001"]
+
+
+def test_memory_backend_search_local(make_paper):
+    backend = MemoryBackend()
+    backend.save_many(_search_corpus(make_paper))
+
+    hits = backend.search_local("neural networks")
+    assert [h.paper.arxiv_id for h in hits] == ["2301.00001", "2301.00002"]
+    assert "<mark>networks</mark>" in hits[1].snippet
+
+    assert [h.paper.arxiv_id for h in backend.search_local("neural", categories=["cs.DS"])] == ["2301.00003"]
+    assert backend.count_local("neural") == 3
+    assert backend.count_local("neural networks", categories=["cs.LG", "cs.DS"]) == 1
+    assert backend.count_local("missing") == 0
+
+    backend.delete("2301.00002v1")
+    assert [h.paper.arxiv_id for h in backend.search_local("networks")] == ["2301.00001"]
+
+
+def test_sqlite_backend_embeddings_and_similar(make_paper):
+    import sqlite3
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = os.path.join(tmpdir, "test.db")
+        backend = SQLiteBackend(db_path)
+        backend.save_many([
+            make_paper("2301.00001", embedding=[1.0, 0.0]),
+            make_paper("2301.00002", embedding=[0.8, 0.2]),
+            make_paper("2301.00003", embedding=[0.0, 1.0]),
+        ])
+
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("SELECT typeof(embedding) FROM papers LIMIT 1").fetchone()[0] == "blob"
+        conn.close()
+        assert backend.get("2301.00003v1").embedding == [0.0, 1.0]
+
+        hits = backend.similar("2301.00001v1", k=2)
+        assert [h.paper.arxiv_id for h in hits] == ["2301.00002", "2301.00003"]
+
+        backend.save(make_paper("2301.00004", embedding=[1.0, 0.01]))
+        backend.delete("2301.00002v1")
+        assert [h.paper.arxiv_id for h in backend.search_by_vector([1.0, 0.0], k=2)] == ["2301.00001", "2301.00004"]
+
+
+@pytest.mark.parametrize("backend_name", ["sqlite", "memory"])
+def test_mismatched_embedding_is_rejected_before_write(backend_name, make_paper):
+    import sqlite3
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = os.path.join(tmpdir, "test.db")
+        backend = SQLiteBackend(db_path) if backend_name == "sqlite" else MemoryBackend()
+        backend.save_many([
+            make_paper("2301.00001", embedding=[1.0, 0.0]),
+            make_paper("2301.00002", embedding=[0.8, 0.2]),
+        ])
+
+        with pytest.raises(ValueError):
+            backend.save(make_paper("2301.00003", embedding=[1.0, 0.0, 0.0]))
+        with pytest.raises(ValueError):
+            backend.save_many([
+                make_paper("2301.00004", embedding=[0.0, 1.0]),
+                make_paper("2301.00005", embedding=[1.0]),
+            ])
+        with pytest.raises(ValueError):
+            backend.update_many([("2301.00001v1", {"embedding": [1.0, 0.0, 0.0]})])
+        assert backend.count() == 2
+        assert backend.get("2301.00001v1").embedding == [1.0, 0.0]
+        assert [h.paper.arxiv_id for h in backend.similar("2301.00001v1")] == ["2301.00002"]
+
+        if backend_name == "sqlite":
+            # A row written before the check existed must not break a fresh index.
+            with sqlite3.connect(db_path) as conn:
+                conn.execute(
+                    "UPDATE papers SET embedding = ? WHERE unique_key = '2301.00002v1'",
+                    (np.asarray([1.0, 0.0, 0.0], dtype="<f4").tobytes(),),
+                )
+            conn.close()
+            backend.save(make_paper("2301.00006", embedding=[0.9, 0.1]))
+            fresh = SQLiteBackend(db_path)
+            assert [h.paper.arxiv_id for h in fresh.similar("2301.00001v1")] == ["2301.00006"]
+
+
+def test_sqlite_backend_migrates_json_embeddings(make_paper):
+    import json
+    import sqlite3
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = os.path.join(tmpdir, "test.db")
+        SQLiteBackend(db_path).save(make_paper("2301.00001"))
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("UPDATE papers SET embedding = ?", (json.dumps([0.25, 0.5]),))
+            conn.execute("PRAGMA user_version = 2")
+        conn.close()
+
+        backend = SQLiteBackend(db_path)
+        assert backend.get("2301.00001v1").embedding == [0.25, 0.5]
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("SELECT typeof(embedding) FROM papers").fetchone()[0] == "blob"
+        conn.close()
+
+
+def test_memory_backend_similar(make_paper):
+    backend = MemoryBackend()
+    backend.save(make_paper("2301.00001", embedding=[1.0, 0.0]))
+    backend.save(make_paper("2301.00002", embedding=[0.0, 1.0]))
+    assert [h.paper.arxiv_id for h in backend.similar("2301.00001v1", k=5)] == ["2301.00002"]
+
+    backend.save(make_paper("2301.00003", embedding=[0.9, 0.1]))
+    assert [h.paper.arxiv_id for h in backend.similar("2301.00001v1", k=1)] == ["2301.00003"]
+
+
+def _walk_cursor(backend, **kwargs) -> list[str]:
+    keys = []
+    page = backend.list(limit=3, **kwargs)
+    keys.extend(p.unique_key for p in page)
+    while page.next_cursor:
+        page = backend.list(limit=3, cursor=page.next_cursor, **kwargs)
+        keys.extend(p.unique_key for p in page)
+    return keys
+
+
+def test_sqlite_backend_cursor_pagination(make_paper):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        backend = SQLiteBackend(os.path.join(tmpdir, "test.db"))
+        backend.save_many(
+            make_paper(f"2301.{i:05d}", published=datetime(2023, 1, 1 + i % 4), title=f"T{i % 3}")
+            for i in range(10)
+        )
+        backend.save(make_paper("2301.99999", published=None))
+
+        for sort_by in ("published", "title", "created_at"):
+            for order in ("asc", "desc"):
+                expected = [p.unique_key for p in backend.list(limit=100, sort_by=sort_by, order=order)]
+                assert len(expected) == 11
+                assert _walk_cursor(backend, sort_by=sort_by, order=order) == expected
+
+        page = backend.list(limit=3, sort_by="title")
+        with pytest.raises(ValueError):
+            backend.list(limit=3, sort_by="published", cursor=page.next_cursor)
+
+        with backend._connect() as conn:
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN SELECT * FROM papers ORDER BY IFNULL(published, '') DESC, unique_key DESC"
+            ).fetchall()
+        assert "idx_papers_sort_published" in str([tuple(r) for r in plan])
+
+
+def test_memory_backend_cursor_pagination(make_paper):
+    backend = MemoryBackend()
+    for i in range(10):
+        backend.save(make_paper(f"2301.{i:05d}", published=datetime(2023, 1, 1 + i % 4)))
+
+    assert [p.arxiv_id for p in backend.list(limit=2)] == ["2301.00009", "2301.00008"]
+    for sort_by in ("published", "created_at", "arxiv_id"):
+        expected = [p.unique_key for p in backend.list(limit=100, sort_by=sort_by, order="asc")]
+        assert _walk_cursor(backend, sort_by=sort_by, order="asc") == expected
+
+
+def test_sqlite_backend_state_roundtrip():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = os.path.join(tmpdir, "test.db")
+        backend = SQLiteBackend(db_path)
+        assert backend.get_state("subscribe:cs.AI") is None
+
+        backend.set_state("subscribe:cs.AI", "2023-01-01T00:00:00Z")
+        backend.set_state("subscribe:cs.AI", "2023-01-02T00:00:00Z")
+        assert SQLiteBackend(db_path).get_state("subscribe:cs.AI") == "2023-01-02T00:00:00Z"
+
+
+def test_sqlite_backend_exists_many_and_get_many(make_paper):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        backend = SQLiteBackend(os.path.join(tmpdir, "test.db"))
+        backend.save_many(make_paper(f"2301.{i:05d}") for i in range(12))
+
+        keys = [f"2301.{i:05d}v1" for i in range(0, 20, 2)]
+        assert backend.exists_many(keys, chunk_size=4) == {f"2301.{i:05d}v1" for i in range(0, 12, 2)}
+
+        papers = backend.get_many(keys + keys, chunk_size=4)
+        assert sorted(papers) == sorted(f"2301.{i:05d}v1" for i in range(0, 12, 2))
+        assert papers["2301.00004v1"].title == "Paper 2301.00004"
+
+
+def test_memory_backend_exists_many_and_get_many(make_paper):
+    backend = MemoryBackend()
+    backend.save_many(make_paper(f"2301.{i:05d}") for i in range(3))
+
+    assert backend.exists_many(["2301.00000v1", "2301.00002v1", "2399.00000v1"]) == {"2301.00000v1", "2301.00002v1"}
+    assert list(backend.get_many(["2301.00001v1", "2399.00000v1"])) == ["2301.00001v1"]
+
+
+def test_memory_backend_indexes_track_writes(make_paper):
+    backend = MemoryBackend()
+    for i in range(40):
+        categories = ["cs.AI"] if i % 20 else ["cs.AI", "math.CO"]
+        backend.save(make_paper(f"2301.{i:05d}", title=f"T{i % 7}", categories=categories))
+    backend.save(make_paper("2301.00001", version="v2", categories=["cs.LG"]))
+    backend.save(make_paper("2301.00003", title="Renamed", categories=["cs.LG"]))
+    backend.delete("2301.00005v1")
+
+    assert [p.version for p in backend.get_versions("2301.00001")] == ["v1", "v2"]
+    assert backend.get_category_stats() == {"cs.AI": 38, "math.CO": 2, "cs.LG": 2}
+    assert backend.get_stats()["categories"]["cs.AI"] == 38
+    assert backend.count(category="math.CO") == 2
+
+    assert [p.arxiv_id for p in backend.list(limit=2)] == ["2301.00003", "2301.00001"]
+    by_title = [p.unique_key for p in backend.list(limit=100, sort_by="title", order="asc")]
+    assert by_title == sorted(by_title, key=lambda k: (backend.get(k).title, k))
+    assert _walk_cursor(backend, sort_by="title", order="asc") == by_title
+
+    for category in ("math.CO", "cs.AI"):
+        expected = [p.unique_key for p in backend.list(limit=100, sort_by="title") if category in p.categories]
+        assert _walk_cursor(backend, sort_by="title", category=category) == expected
+
+
+@pytest.mark.parametrize("bulk", [False, True])
+def test_memory_backend_resave_of_mutated_paper_reindexes(make_paper, bulk):
+    backend = MemoryBackend()
+    papers = [
+        make_paper(f"2301.{i:05d}", title=f"T{i:03d}", categories=["cs.AI"], authors=["Ada Lovelace"])
+        for i in range(100)
+    ]
+    backend.save_many(papers)
+
+    changed = papers[2]
+    changed.title = "Z last"
+    changed.categories = ["cs.AI", "new.cat"]
+    changed.authors = ["Grace Hopper"]
+    changed.published = "2030-01-01T00:00:00Z"
+    if bulk:
+        backend.save_many(papers)
+    else:
+        backend.save(changed)
+
+    by_title = [p.unique_key for p in backend.list(limit=1000, sort_by="title")]
+    assert len(by_title) == len(set(by_title)) == 100
+    assert by_title[0] == changed.unique_key
+    assert backend.get_category_stats() == {"cs.AI": 100, "new.cat": 1}
+    assert [p.unique_key for p in backend.query(categories=["new.cat"])] == [changed.unique_key]
+    assert [p.unique_key for p in backend.query(author="Grace Hopper")] == [changed.unique_key]
+    assert backend.count_query(author="Ada Lovelace") == 99
+    assert [p.unique_key for p in backend.query(limit=1)] == [changed.unique_key]
+    assert backend.count_query(published_to="2029-12-31") == 99
+
+    changed.categories = []
+    assert backend.delete(changed.unique_key)
+    assert backend.get_category_stats() == {"cs.AI": 99}
+    assert backend.count_query(categories=["new.cat"]) == 0
+
+
+def test_memory_backend_bulk_resave_replaces_index_entries(make_paper):
+    import random
+
+    backend = MemoryBackend()
+    keys = [f"2301.{i:05d}" for i in range(300)]
+    backend.save_many(make_paper(k) for k in keys)
+    rng = random.Random(7)
+    backend.save_many(
+        make_paper(k, title=f"T{rng.random()}", published=datetime(2022, 1 + rng.randrange(12), 1))
+        for k in keys
+    )
+
+    for index in backend._sort_indexes.values():
+        assert len(index) == 300
+    by_title = [p.unique_key for p in backend.list(limit=1000, sort_by="title", order="asc")]
+    assert len(by_title) == len(set(by_title)) == 300
+    assert _walk_cursor(backend, sort_by="published") == [
+        p.unique_key for p in backend.list(limit=1000, sort_by="published")
+    ]
+    assert len(backend.query(published_to="2022-12-31", limit=1000)) == 300
+
+
+def test_sqlite_lazy_columns_and_projection(make_paper):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        storage = SQLiteBackend(os.path.join(tmpdir, "test.db"))
+        storage.save(make_paper("2301.00001", embedding=[0.5, 1.0], extra={"k": 1}, keywords=["x"]))
+
+        paper = storage.get("2301.00001v1")
+        assert set(paper._pending) == {"embedding", "extra", "keywords"}
+        assert paper.embedding == [0.5, 1.0]
+        assert set(paper._pending) == {"extra", "keywords"}
+        assert paper == make_paper(
+            "2301.00001",
+            embedding=[0.5, 1.0],
+            extra={"k": 1},
+            keywords=["x"],
+            published="2023-01-17T00:00:00",
+            updated="2023-01-17T00:00:00",
+        )
+
+        page = storage.list(fields=["title", "authors"])
+        assert page[0].unique_key == "2301.00001v1"
+        assert page[0].authors == ["Author"]
+        with pytest.raises(AttributeError):
+            page[0].abstract
+        with pytest.raises(ValueError):
+            storage.get("2301.00001v1", fields=["nope"])
+
+
+def test_async_sqlite_backend_reads_and_serialized_writes(make_paper):
+    import asyncio
+    import threading
+
+    from paper_arxiv_adapter.async_storage import AsyncSQLiteBackend
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        storage = AsyncSQLiteBackend(os.path.join(tmpdir, "test.db"), readers=2)
+        writers = set()
+        save_many = storage.backend.save_many
+
+        def record_writer(papers, **kwargs):
+            writers.add(threading.current_thread().name)
+            return save_many(papers, **kwargs)
+
+        storage.backend.save_many = record_writer
+
+        async def run():
+            await asyncio.gather(*(
+                storage.save_many([make_paper(f"2301.{i:05d}")]) for i in range(10)
+            ))
+            results = await asyncio.gather(
+                storage.count(),
+                storage.get("2301.00003v1", fields=["title"]),
+                storage.list(limit=3, sort_by="arxiv_id", order="asc"),
+                storage.get_stats(),
+            )
+            await storage.close()
+            return results
+
+        count, paper, page, stats = asyncio.run(run())
+
+        assert len(writers) == 1
+        assert count == 10
+        assert paper.title == "Paper 2301.00003"
+        assert [p.arxiv_id for p in page] == ["2301.00000", "2301.00001", "2301.00002"]
+        assert stats["total_papers"] == 10
+
+
+@pytest.mark.parametrize("backend_name", ["sqlite", "memory"])
+def test_query_filters_by_category_date_and_author(backend_name, make_paper):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        if backend_name == "sqlite":
+            storage = SQLiteBackend(os.path.join(tmpdir, "test.db"))
+        else:
+            storage = MemoryBackend()
+        storage.save_many([
+            make_paper("2301.00001", categories=["cs.LG"], published="2023-01-02T00:00:00Z", authors=["Ada Lovelace"]),
+            make_paper("2301.00002", categories=["cs.LG", "cs.AI"], published=datetime(2023, 1, 5), authors=["Alan Turing"]),
+            make_paper("2301.00003", categories=["cs.CV"], published="2023-01-06T12:00:00+00:00", authors=["Ada Byron"]),
+            make_paper("2301.00004", categories=["cs.LG"], published="", authors=["Grace Hopper"]),
+            make_paper("2301.00005", categories=["cs.AI"], published="2023-01-09T00:00:00Z", authors=["Ada Lovelace", "Alan Turing"]),
+        ])
+
+        def keys(**kwargs):
+            return [p.arxiv_id[-1] for p in storage.query(**kwargs)]
+
+        assert keys() == ["5", "3", "2", "1", "4"]
+        assert keys(order="asc") == ["4", "1", "2", "3", "5"]
+        assert keys(categories=["cs.LG"]) == ["2", "1", "4"]
+        assert keys(categories=["cs.LG", "cs.CV"], published_from="2023-01-03") == ["3", "2"]
+        assert keys(published_to=datetime(2023, 1, 5)) == ["2", "1"]
+        assert keys(author="ada lovelace") == ["5", "1"]
+        assert keys(author="Alan", categories=["cs.AI"], published_from="2023-01-06") == ["5"]
+        assert keys(author="lovelace ada") == []
+        assert keys(sort="updated", published_from="2023-01-05", published_to="2023-01-07") == ["3", "2"]
+
+        first = storage.query(limit=2)
+        second = storage.query(limit=2, cursor=first.next_cursor)
+        third = storage.query(limit=2, cursor=second.next_cursor)
+        assert [p.arxiv_id[-1] for p in first + second + third] == ["5", "3", "2", "1", "4"]
+        with pytest.raises(ValueError):
+            storage.query(sort="title")
+        with pytest.raises(ValueError):
+            storage.query(published_from="last week")
+
+        assert storage.count_query() == 5
+        assert storage.count_query(categories=["cs.LG", "cs.CV"], published_from="2023-01-03") == 2
+        assert storage.count_query(author="Alan", categories=["cs.AI"], published_from="2023-01-06") == 1
+
+
+@pytest.mark.parametrize("backend_name", ["sqlite", "memory"])
+def test_query_date_only_upper_bound_includes_whole_day(backend_name, make_paper):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        if backend_name == "sqlite":
+            storage = SQLiteBackend(os.path.join(tmpdir, "test.db"))
+        else:
+            storage = MemoryBackend()
+        storage.save_many([
+            make_paper("2301.00001", published="2023-01-17T10:00:00Z"),
+            make_paper("2301.00002", published="2023-01-18T00:00:00Z"),
+        ])
+
+        for sort in ("published", "updated"):
+            page = storage.query(published_from="2023-01-17", published_to="2023-01-17", sort=sort)
+            assert [p.arxiv_id for p in page] == ["2301.00001"]
+        assert storage.count_query(published_from="2023-01-17", published_to="2023-01-17") == 1
+        assert len(storage.query(published_to="2023-01-17T09:59:59Z")) == 0
+
+
+def test_sqlite_migrates_timestamp_columns(make_paper):
+    import sqlite3
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = os.path.join(tmpdir, "test.db")
+        storage = SQLiteBackend(db_path)
+        storage.save(make_paper("2301.00001", published="2023-01-02T00:00:00Z"))
+        storage.close()
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("UPDATE papers SET published_ts = NULL")
+            conn.execute("PRAGMA user_version = 3")
+        conn.close()
+
+        storage = SQLiteBackend(db_path)
+        assert len(storage.query(published_from="2023-01-01", published_to="2023-01-03")) == 1
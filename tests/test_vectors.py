@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from paper_arxiv_adapter.vectors import VectorIndex, decode_embedding, encode_embedding
+
+
+def test_embedding_roundtrip_is_float32():
+    blob = encode_embedding([0.5, -1.0, 2.0])
+    assert len(blob) == 12
+    assert decode_embedding(blob) == [0.5, -1.0, 2.0]
+
+
+def test_vector_index_top_k_cosine():
+    index = VectorIndex(initial_capacity=2)
+    index.add_many([("a", [1, 0, 0]), ("b", [0.9, 0.1, 0]), ("c", [0, 1, 0]), ("d", [-1, 0, 0])])
+
+    assert len(index) == 4
+    assert [key for key, _ in index.search([1, 0, 0], k=3)] == ["a", "b", "c"]
+    assert [key for key, _ in index.search([1, 0, 0], k=2, exclude={"a"})] == ["b", "c"]
+
+    index.remove("a")
+    index.add("c", [1, 0, 0])
+    results = index.search_batch(np.array([[1, 0, 0], [0, 1, 0]]), k=1)
+    assert results[0][0][0] == "c"
+    assert results[1][0][0] == "b"
+
+
+def test_vector_index_rejects_mismatched_dimensions():
+    index = VectorIndex()
+    index.add("a", [1, 0, 0])
+    with pytest.raises(ValueError):
+        index.add("b", [1, 0])
+    with pytest.raises(ValueError):
+        index.add_many([("c", [0, 1, 0]), ("d", [0, 1])])
+    assert "b" not in index and "c" in index
+
+    index.remove("a")
+    index.remove("c")
+    index.add("e", [1, 0])
+    assert index.dim == 2
+
+    assert index.add_many([("f", [0, 1]), ("g", [0, 1, 0])], skip_mismatched=True) == 1
+    assert "f" in index and "g" not in index
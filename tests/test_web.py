@@ -0,0 +1,62 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "web" / "backend"))
+import main  # noqa: E402
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with TestClient(main.app) as client:
+        yield client
+
+
+def _seed(client, count=7):
+    papers = [
+        {
+            "arxiv_id": f"2301.{i:05d}",
+            "title": f"Graph study {i}",
+            "authors": ["Ada Lovelace"] if i % 2 else ["Alan Turing"],
+            "abstract": "graph nets",
+            "categories": ["cs.LG"] if i % 3 else ["cs.AI"],
+            "published": f"2023-01-{i + 10:02d}T10:00:00Z",
+        }
+        for i in range(count)
+    ]
+    assert client.post("/api/papers/batch-save", json=papers).status_code == 200
+
+
+def test_filtered_list_pages_with_cursor(client):
+    _seed(client)
+    params = {"categories": "cs.LG", "limit": 2}
+    seen, cursor = [], None
+    while True:
+        body = client.get("/api/papers", params={**params, **({"cursor": cursor} if cursor else {})}).json()
+        assert body["total"] == 4
+        seen += [p["arxiv_id"] for p in body["papers"]]
+        cursor = body["next_cursor"]
+        if not cursor:
+            break
+    assert seen == ["2301.00005", "2301.00004", "2301.00002", "2301.00001"]
+
+    asc = client.get("/api/papers", params={**params, "sort_by": "updated", "order": "asc"})
+    assert asc.status_code == 200
+    assert client.get("/api/papers", params={**params, "sort_by": "title"}).status_code == 400
+
+
+def test_search_applies_categories_and_rejects_other_filters(client):
+    _seed(client)
+    body = client.get("/api/papers", params={"q": "graph", "categories": "cs.AI"}).json()
+    assert sorted(p["arxiv_id"] for p in body["papers"]) == ["2301.00000", "2301.00003", "2301.00006"]
+    assert body["total"] == 3
+    body = client.get("/api/papers", params={"q": "graph", "categories": "cs.AI", "category": "cs.LG"}).json()
+    assert body["total"] == 7
+
+    response = client.get("/api/papers", params={"q": "graph", "author": "Ada"})
+    assert response.status_code == 400
@@ -2,22 +2,62 @@ from __future__ import annotations
 
 import os
 from contextlib import asynccontextmanager
+from dataclasses import asdict
+from email.utils import formatdate
 from pathlib import Path
 from typing import List
 
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.openapi.docs import get_swagger_ui_html
-from fastapi.responses import FileResponse, HTMLResponse
-from pydantic import BaseModel
-
-from paper_arxiv_adapter import ArxivAdapter, SQLiteBackend
+from fastapi.responses import FileResponse, HTMLResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
+
+from paper_arxiv_adapter import (
+    ArxivAdapter,
+    CachedStorage,
+    RateLimiter,
+    ResponseCache,
+    SQLiteBackend,
+    ShardedSQLiteBackend,
+)
+from paper_arxiv_adapter.async_storage import AsyncStorage
+from paper_arxiv_adapter.export import iter_ndjson
+from paper_arxiv_adapter.metrics import (
+    AdapterMetrics,
+    InstrumentedStorage,
+    MetricsRegistry,
+    instrument_rate_limiter,
+    instrument_response_cache,
+)
 from paper_arxiv_adapter.models import Paper
+from paper_arxiv_adapter.scheduler import IngestionScheduler
+from paper_arxiv_adapter.storage import QUERY_SORT_FIELDS
 
 
 BASE_DIR = Path(__file__).resolve().parent
 
+METRICS_ENABLED = os.environ.get("PAPER_ADAPTER_METRICS", "1") != "0"
+SHARD_DIR = os.environ.get("PAPER_ADAPTER_SHARD_DIR")
+POLL_INTERVAL = float(os.environ.get("PAPER_ADAPTER_POLL_INTERVAL", "3600"))
+
+API_FIELDS = (
+    "title",
+    "authors",
+    "abstract",
+    "categories",
+    "published",
+    "updated",
+    "pdf_url",
+    "source_url",
+    "keywords",
+    "summary",
+)
+
 adapter: ArxivAdapter | None = None
+store: AsyncStorage | None = None
+scheduler: IngestionScheduler | None = None
+metrics_registry: MetricsRegistry | None = None
 
 
 class PaperData(BaseModel):
@@ -33,12 +73,48 @@ class PaperData(BaseModel):
     source_url: str = ""
 
 
+class SubscriptionRequest(BaseModel):
+    category: str
+    interval_seconds: float | None = Field(None, ge=60)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global adapter
-    adapter = ArxivAdapter(storage=SQLiteBackend("papers.db"))
+    global adapter, store, scheduler, metrics_registry
+    if SHARD_DIR:
+        backend = ShardedSQLiteBackend(SHARD_DIR)
+    else:
+        backend = SQLiteBackend("papers.db", pooled=True)
+    rate_limiter = RateLimiter(shared_path="ratelimit.db")
+    response_cache = ResponseCache("http_cache.db")
+    adapter_metrics = None
+    if METRICS_ENABLED:
+        metrics_registry = MetricsRegistry()
+        backend = InstrumentedStorage(backend, metrics_registry)
+        adapter_metrics = AdapterMetrics(metrics_registry)
+        instrument_rate_limiter(metrics_registry, rate_limiter)
+        instrument_response_cache(metrics_registry, response_cache)
+    storage = CachedStorage(backend)
+    store = AsyncStorage(storage)
+    adapter = ArxivAdapter(
+        storage=storage,
+        async_storage=store,
+        rate_limiter=rate_limiter,
+        response_cache=response_cache,
+        metrics=adapter_metrics,
+    )
+    scheduler = IngestionScheduler(adapter, default_interval=POLL_INTERVAL)
+    await scheduler.start()
     yield
+    await scheduler.stop()
+    scheduler = None
+    await adapter.aclose()
     adapter = None
+    metrics_registry = None
+    response_cache.close()
+    rate_limiter.close()
+    await store.close()
+    store = None
 
 
 app = FastAPI(
@@ -80,40 +156,158 @@ async def custom_redoc_html():
 """)
 
 
+async def not_modified(request: Request, response: Response) -> Response | None:
+    counter, last_modified = await store.get_change_state()
+    etag = f'W/"{counter}"'
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(last_modified, usegmt=True),
+        "Cache-Control": "no-cache",
+    }
+    response.headers.update(headers)
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if "*" in tags or etag.removeprefix("W/") in tags:
+            return Response(status_code=304, headers=headers)
+    return None
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    if metrics_registry is None:
+        raise HTTPException(status_code=404, detail="Metrics disabled")
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/api/stats")
-async def get_stats():
-    if not adapter or not adapter.storage:
+async def get_stats(request: Request, response: Response):
+    if not store:
         return {"total_papers": 0, "db_size_bytes": 0, "db_size_mb": 0, "categories": {}}
-    return adapter.storage.get_stats()
+    if cached := await not_modified(request, response):
+        return cached
+    return await store.get_stats()
+
+
+@app.get("/api/export")
+async def export_papers():
+    if not store:
+        raise HTTPException(status_code=503, detail="Storage not initialized")
+    return StreamingResponse(
+        iter_ndjson(store.backend),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="papers.ndjson"'},
+    )
 
 
 @app.get("/api/papers")
 async def list_papers(
+    request: Request,
+    response: Response,
     limit: int = 20, 
     offset: int = 0,
     sort_by: str = Query("created_at", pattern="^(created_at|title|published|updated|arxiv_id)$"),
     order: str = Query("desc", pattern="^(asc|desc)$"),
+    category: str | None = None,
+    q: str | None = None,
+    cursor: str | None = None,
+    fields: str | None = Query(None, description="Comma-separated paper fields to return"),
+    categories: str | None = Query(None, description="Comma-separated categories, matching any"),
+    published_from: str | None = Query(None, description="ISO date or datetime, inclusive"),
+    published_to: str | None = Query(None, description="ISO date or datetime, inclusive"),
+    author: str | None = None,
 ):
-    if not adapter or not adapter.storage:
+    if not store:
         return {"papers": [], "total": 0, "limit": limit, "offset": offset}
+    if cached := await not_modified(request, response):
+        return cached
+    
+    selected = parse_fields(fields)
+    wanted = [c.strip() for c in (categories or "").split(",") if c.strip()]
+    if category:
+        wanted.append(category)
+    if q:
+        if published_from or published_to or author:
+            raise HTTPException(
+                status_code=400,
+                detail="q cannot be combined with published_from, published_to or author",
+            )
+        hits = await store.search_local(q, limit=limit, categories=wanted or None, offset=offset)
+        return {
+            "papers": [
+                {**paper_to_dict(hit.paper, selected), "score": hit.score, "snippet": hit.snippet}
+                for hit in hits
+            ],
+            "total": await store.count_local(q, categories=wanted or None),
+            "limit": limit,
+            "offset": offset,
+        }
     
-    total = adapter.storage.count()
-    papers = adapter.storage.list(limit=limit, offset=offset, sort_by=sort_by, order=order)
+    if categories or published_from or published_to or author:
+        filters = dict(
+            categories=wanted, published_from=published_from, published_to=published_to, author=author
+        )
+        # Indexed queries sort by published unless asked otherwise; the
+        # created_at default of plain listing does not apply to them.
+        sort = sort_by if "sort_by" in request.query_params else "published"
+        if sort not in QUERY_SORT_FIELDS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"sort_by must be one of {', '.join(QUERY_SORT_FIELDS)} when filtering",
+            )
+        try:
+            papers = await store.query(
+                **filters,
+                sort=sort,
+                order=order,
+                limit=limit,
+                offset=offset,
+                cursor=cursor,
+                fields=selected,
+            )
+            total = await store.count_query(**filters)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return {
+            "papers": [paper_to_dict(p, selected) for p in papers],
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "next_cursor": papers.next_cursor,
+        }
+    
+    total = await store.count(category=category)
+    try:
+        papers = await store.list(
+            limit=limit,
+            offset=offset,
+            sort_by=sort_by,
+            order=order,
+            category=category,
+            cursor=cursor,
+            fields=selected,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     return {
-        "papers": [paper_to_dict(p) for p in papers],
+        "papers": [paper_to_dict(p, selected) for p in papers],
         "total": total,
         "limit": limit,
         "offset": offset,
+        "next_cursor": papers.next_cursor,
     }
 
 
 @app.get("/api/papers/{unique_key}")
-async def get_paper(unique_key: str):
-    if not adapter or not adapter.storage:
+async def get_paper(unique_key: str, request: Request, response: Response):
+    if not store:
         raise HTTPException(status_code=503, detail="Storage not initialized")
+    if cached := await not_modified(request, response):
+        return cached
     
-    paper = adapter.storage.get(unique_key)
+    paper = await store.get(unique_key, fields=API_FIELDS)
     if not paper:
         raise HTTPException(status_code=404, detail="Paper not found")
     return paper_to_dict(paper)
@@ -121,23 +315,31 @@ async def get_paper(unique_key: str):
 
 @app.delete("/api/papers/{unique_key}")
 async def delete_paper(unique_key: str):
-    if not adapter or not adapter.storage:
+    if not store:
         raise HTTPException(status_code=503, detail="Storage not initialized")
     
-    if not adapter.storage.exists(unique_key):
+    if await store.delete(unique_key):
+        return {"message": "Paper deleted successfully"}
+    raise HTTPException(status_code=404, detail="Paper not found")
+
+
+@app.get("/api/papers/{unique_key}/similar")
+async def get_similar_papers(unique_key: str, k: int = Query(10, ge=1, le=100)):
+    if not store:
+        raise HTTPException(status_code=503, detail="Storage not initialized")
+    
+    if not await store.exists(unique_key):
         raise HTTPException(status_code=404, detail="Paper not found")
     
-    success = adapter.storage.delete(unique_key)
-    if success:
-        return {"message": "Paper deleted successfully"}
-    raise HTTPException(status_code=500, detail="Failed to delete paper")
+    hits = await store.similar(unique_key, k=k)
+    return {"papers": [{**paper_to_dict(hit.paper), "score": hit.score} for hit in hits]}
 
 
 @app.get("/api/papers/{arxiv_id}/versions")
 async def get_versions(arxiv_id: str):
-    if not adapter:
+    if not store:
         return {"versions": []}
-    versions = adapter.get_versions(arxiv_id)
+    versions = await store.get_versions(arxiv_id)
     return {"versions": [paper_to_dict(v) for v in versions]}
 
 
@@ -145,18 +347,17 @@ async def get_versions(arxiv_id: str):
 async def search_papers(query: str, max_results: int = 10):
     if not adapter:
         return {"papers": []}
-    papers = adapter.search(query, max_results=max_results)
+    papers = await adapter.asearch(query, max_results=max_results)
     return {"papers": [paper_to_dict(p) for p in papers]}
 
 
 @app.post("/api/papers/batch-save")
 async def batch_save_papers(papers: List[PaperData]):
-    if not adapter or not adapter.storage:
+    if not store:
         raise HTTPException(status_code=503, detail="Storage not initialized")
     
-    saved_count = 0
-    for paper_data in papers:
-        paper = Paper(
+    saved_count = await store.save_many(
+        Paper(
             arxiv_id=paper_data.arxiv_id,
             version=paper_data.version,
             title=paper_data.title,
@@ -168,8 +369,8 @@ async def batch_save_papers(papers: List[PaperData]):
             pdf_url=paper_data.pdf_url,
             source_url=paper_data.source_url,
         )
-        adapter.storage.save(paper)
-        saved_count += 1
+        for paper_data in papers
+    )
     
     return {"message": f"Saved {saved_count} papers", "count": saved_count}
 
@@ -178,26 +379,76 @@ async def batch_save_papers(papers: List[PaperData]):
 async def create_subscription(category: str):
     if not adapter:
         return {"papers": []}
-    papers = adapter.subscribe(category=category, on_new=lambda p: None)
+    papers = await adapter.asubscribe(category=category, on_new=lambda p: None)
     return {"papers": [paper_to_dict(p) for p in papers], "count": len(papers)}
 
 
-def paper_to_dict(paper: Paper) -> dict:
+@app.get("/api/subscriptions")
+async def list_subscriptions():
+    if not scheduler:
+        raise HTTPException(status_code=503, detail="Scheduler not initialized")
+    return {"subscriptions": [asdict(s) for s in scheduler.subscriptions.values()]}
+
+
+@app.post("/api/subscriptions", status_code=202)
+async def add_subscription(body: SubscriptionRequest):
+    if not scheduler:
+        raise HTTPException(status_code=503, detail="Scheduler not initialized")
+    job = await scheduler.subscribe(body.category, body.interval_seconds)
     return {
+        "subscription": asdict(scheduler.subscriptions[body.category]),
+        "job": asdict(job),
+    }
+
+
+@app.delete("/api/subscriptions/{category}")
+async def remove_subscription(category: str):
+    if not scheduler:
+        raise HTTPException(status_code=503, detail="Scheduler not initialized")
+    if not await scheduler.unsubscribe(category):
+        raise HTTPException(status_code=404, detail="Subscription not found")
+    return {"message": "Subscription removed"}
+
+
+@app.get("/api/jobs")
+async def list_jobs():
+    if not scheduler:
+        raise HTTPException(status_code=503, detail="Scheduler not initialized")
+    return {"jobs": [asdict(job) for job in scheduler.jobs()]}
+
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    if not scheduler:
+        raise HTTPException(status_code=503, detail="Scheduler not initialized")
+    job = scheduler.job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return asdict(job)
+
+
+def parse_fields(fields: str | None) -> tuple[str, ...]:
+    if not fields:
+        return API_FIELDS
+    selected = tuple(f.strip() for f in fields.split(",") if f.strip())
+    unknown = set(selected) - set(API_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return selected
+
+
+def paper_to_dict(paper: Paper, fields: tuple[str, ...] | None = None) -> dict:
+    data = {
         "arxiv_id": paper.arxiv_id,
         "version": paper.version,
         "unique_key": paper.unique_key,
-        "title": paper.title,
-        "authors": paper.authors,
-        "abstract": paper.abstract,
-        "categories": paper.categories,
-        "published": str(paper.published) if paper.published else None,
-        "updated": str(paper.updated) if paper.updated else None,
-        "pdf_url": paper.pdf_url,
-        "source_url": paper.source_url,
-        "keywords": paper.keywords,
-        "summary": paper.summary,
     }
+    for name in fields or API_FIELDS:
+        value = getattr(paper, name)
+        if name in ("published", "updated"):
+            value = str(value) if value else None
+        data[name] = value
+    return data
 
 
 app.mount("/assets", StaticFiles(directory=BASE_DIR / "static" / "assets"), name="assets")